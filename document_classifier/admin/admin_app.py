@@ -1,40 +1,63 @@
 # admin/admin_app.py
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Header, HTTPException
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 import sys
 import os
 from fastapi import UploadFile, File
-from fastapi.responses import Response
-import csv
-import io
-from typing import List
+from fastapi.responses import Response, StreamingResponse, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+from datetime import date
 
 
 # Dodaj ścieżkę do core
 sys.path.append('/app')
 
 from core.document_service import DocumentService
+from core.import_jobs import ImportJobManager
+from core.evaluation import ModelEvaluator
+from core.export import EXPORT_FORMATS, available_formats, export_documents
+from core.profiling import ProfilingMiddleware, get_profiler
 
 app = FastAPI(title="Document Classifier Admin")
 
+# Profilowanie żądań na żądanie - tylko z PROFILING_TOKEN, bez tokenu middleware nie istnieje.
+# Endpointy panelu to funkcje def (pula wątków) - cProfile na pętli zdarzeń ich nie widzi
+profiler = get_profiler("admin", request_mode="sample")
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
 # Templates
 templates = Jinja2Templates(directory="templates")
 
 # Global service
 service = DocumentService()
 
+# Importy CSV w tle - po zakończeniu jeden retrening na całej bazie
+import_jobs = ImportJobManager(service.db, on_complete=service.retrain_from_database)
+
+# Metryki modelu liczone w puli procesów, poza ścieżką obsługi zapytań
+evaluator = ModelEvaluator(service.model_store, db=service.db)
+
+@app.on_event("startup")
+def resume_import_jobs():
+    """Wznów importy przerwane przez restart poda"""
+    resumed = import_jobs.resume_incomplete()
+    if resumed:
+        print(f"Resuming {len(resumed)} import job(s)")
+
 @app.get("/", response_class=HTMLResponse)
 def dashboard(request: Request):
     """Dashboard główny"""
     
-    # Pobierz statystyki
+    # Pobierz statystyki (z liczników - bez wczytywania dokumentów)
+    service.refresh_model()
     categories = service.db.get_categories()
-    documents = service.db.get_all_documents()
     
     stats = {
-        'total_documents': len(documents),
+        'total_documents': service.db.count_documents(),
         'total_areas': len(set(cat[0] for cat in categories)),
         'mode': service.get_mode(),
         'can_predict': service.classifier.can_predict()
@@ -43,186 +66,33 @@ def dashboard(request: Request):
     return templates.TemplateResponse("dashboard.html", {
         "request": request,
         "stats": stats,
-        "documents": documents[:10],  # Tylko 10 ostatnich
+        "documents": service.db.get_recent_documents(10),  # Tylko 10 ostatnich
         "categories": categories
     })
 
 
-@app.post("/api/upload-csv")
-async def upload_csv(file: UploadFile = File(...)):
-    """Upload CSV file with documents for training"""
+@app.post("/api/import-jobs")
+async def create_import_job(file: UploadFile = File(...)):
+    """Start a background CSV import; poll /api/import-jobs/{job_id} for progress"""
     
-    # Validate file type
     if not file.filename.lower().endswith('.csv'):
-        return {
-            "success": False,
-            "message": "Please upload a CSV file",
-            "total_rows": 0,
-            "imported_rows": 0,
-            "errors": ["Invalid file type. Only CSV files are allowed."],
-            "preview": []
-        }
-    
-    # Validate file size (10MB limit)
-    content = await file.read()
-    if len(content) > 10 * 1024 * 1024:
-        return {
-            "success": False,
-            "message": "File too large. Maximum size is 10MB.",
-            "total_rows": 0,
-            "imported_rows": 0,
-            "errors": ["File size exceeds 10MB limit"],
-            "preview": []
-        }
+        return {"success": False, "message": "Please upload a CSV file"}
     
-    try:
-        # Decode content
-        csv_content = content.decode('utf-8-sig')  # Handle BOM
-        csv_reader = csv.DictReader(io.StringIO(csv_content))
-        
-        # Convert to list to get total count
-        rows = []
-        for row in csv_reader:
-            rows.append(row)
-        
-        total_rows = len(rows)
-        imported_rows = 0
-        errors = []
-        preview = []
-        
-        if total_rows == 0:
-            return {
-                "success": False,
-                "message": "CSV file is empty or has no data rows",
-                "total_rows": 0,
-                "imported_rows": 0,
-                "errors": ["No data rows found in CSV file"],
-                "preview": []
-            }
-        
-        # Validate CSV structure
-        if not rows:
-            return {
-                "success": False,
-                "message": "Could not read CSV data",
-                "total_rows": 0,
-                "imported_rows": 0,
-                "errors": ["Failed to parse CSV file"],
-                "preview": []
-            }
-        
-        # Check required columns
-        first_row_keys = [key.strip().lower() for key in rows[0].keys()]
-        required_columns = ['text', 'area']
-        
-        missing_columns = []
-        for col in required_columns:
-            if col not in first_row_keys:
-                missing_columns.append(col)
-        
-        if missing_columns:
-            available_columns = ", ".join(first_row_keys)
-            return {
-                "success": False,
-                "message": f"Missing required columns: {', '.join(missing_columns)}",
-                "total_rows": total_rows,
-                "imported_rows": 0,
-                "errors": [
-                    f"Required columns: {', '.join(required_columns)}",
-                    f"Available columns: {available_columns}",
-                    "Column names are case-insensitive"
-                ],
-                "preview": []
-            }
-        
-        # Create column mapping (case-insensitive)
-        column_mapping = {}
-        original_keys = list(rows[0].keys())
-        for original_key in original_keys:
-            clean_key = original_key.strip().lower()
-            if clean_key in ['text', 'area', 'subarea']:
-                column_mapping[clean_key] = original_key
-        
-        # Process each row
-        for i, row in enumerate(rows):
-            try:
-                # Extract data using column mapping
-                text = row.get(column_mapping.get('text', ''), '').strip()
-                area = row.get(column_mapping.get('area', ''), '').strip()
-                subarea = row.get(column_mapping.get('subarea', ''), '').strip() or None
-                
-                # Validate row data
-                if not text:
-                    errors.append(f"Row {i+2}: Missing or empty 'text' field")
-                    continue
-                
-                if not area:
-                    errors.append(f"Row {i+2}: Missing or empty 'area' field")
-                    continue
-                
-                if len(text) < 5:
-                    errors.append(f"Row {i+2}: Text too short (minimum 5 characters)")
-                    continue
-                
-                if len(text) > 10000:
-                    errors.append(f"Row {i+2}: Text too long (maximum 10,000 characters)")
-                    continue
-                
-                # Save to database
-                service.db.save_document(text, area, subarea)
-                imported_rows += 1
-                
-                # Add to preview (first 5 successful rows)
-                if len(preview) < 5:
-                    preview.append({
-                        "row": i+2,  # +2 because CSV row numbers start from 2 (after header)
-                        "text": text[:100] + "..." if len(text) > 100 else text,
-                        "area": area,
-                        "subarea": subarea
-                    })
-                
-            except Exception as e:
-                errors.append(f"Row {i+2}: Error processing - {str(e)}")
-        
-        # Determine success
-        success = imported_rows > 0
-        
-        if success:
-            success_rate = round((imported_rows / total_rows) * 100, 1)
-            message = f"Successfully imported {imported_rows} of {total_rows} documents ({success_rate}%)"
-        else:
-            message = "No documents were imported due to validation errors"
-        
-        return {
-            "success": success,
-            "message": message,
-            "total_rows": total_rows,
-            "imported_rows": imported_rows,
-            "errors": errors,
-            "preview": preview
-        }
-        
-    except UnicodeDecodeError:
-        return {
-            "success": False,
-            "message": "Could not read CSV file. Please ensure it's saved in UTF-8 encoding.",
-            "total_rows": 0,
-            "imported_rows": 0,
-            "errors": ["File encoding error. Save CSV as UTF-8."],
-            "preview": []
-        }
-    except Exception as e:
-        return {
-            "success": False,
-            "message": f"Error processing CSV file: {str(e)}",
-            "total_rows": 0,
-            "imported_rows": 0,
-            "errors": [str(e)],
-            "preview": []
-        }
-
+    job = await run_in_threadpool(import_jobs.submit, file.file, file.filename)
+    return {"success": True, "message": "Import queued", "job": job}
 
+@app.get("/api/import-jobs")
+def list_import_jobs():
+    """All import jobs, newest first"""
+    return {"jobs": import_jobs.list()}
 
+@app.get("/api/import-jobs/{job_id}")
+def get_import_job(job_id: str):
+    """Progress of one import job: rows parsed, inserted, rejected and throughput"""
+    job = import_jobs.get(job_id)
+    if job is None:
+        return Response(status_code=404)
+    return job
 
 # API endpoints dla AJAX
 @app.post("/api/load-starter-data")
@@ -230,10 +100,14 @@ def load_starter_data_endpoint():
     """Załaduj przykładowe dane"""
     from core.starter_data import load_starter_data
     
-    load_starter_data(service.db, service.classifier)
-    service.set_mode("auto")
+    load_starter_data(service.db)
+    # Trening na całej bazie - razem z wcześniejszym feedbackiem, nie tylko na przykładach
+    result = service.retrain_from_database()
+    if not result["success"]:
+        return result
     
-    return {"success": True, "message": "Starter data loaded successfully"}
+    return {"success": True, "message": "Starter data loaded successfully",
+            "model_version": result["model_version"]}
 
 @app.post("/api/mode/{new_mode}")
 def change_mode_endpoint(new_mode: str):
@@ -242,61 +116,64 @@ def change_mode_endpoint(new_mode: str):
     if new_mode not in ["learning", "auto"]:
         return {"success": False, "message": "Invalid mode"}
     
+    service.refresh_model()
     if new_mode == "auto" and not service.classifier.can_predict():
         return {"success": False, "message": "Cannot switch to auto mode - model not ready"}
     
     service.set_mode(new_mode)
     return {"success": True, "message": f"Mode changed to {new_mode}"}
 
+@app.get("/api/settings")
+def get_runtime_settings():
+    """Ustawienia wspólne dla API, panelu i konsoli"""
+    return {"settings": service.settings.all()}
+
+@app.post("/api/settings")
+def update_runtime_settings(updates: dict):
+    """Zmień ustawienia (np. confidence_threshold, model_version_pin) we wszystkich procesach"""
+    rejected = [key for key, value in updates.items() if not service.settings.is_valid(key, value)]
+    if rejected:
+        return {"success": False, "message": f"Invalid settings: {', '.join(rejected)}",
+                "settings": service.settings.all()}
+    
+    for key, value in updates.items():
+        service.settings.set(key, value)
+    return {"success": True, "message": "Settings updated", "settings": service.settings.all()}
+
 from collections import Counter
 from datetime import datetime, timedelta
-import sqlite3
 
 @app.get("/api/real-stats")
 def get_real_stats():
-    """Pobierz prawdziwe statystyki z bazy"""
+    """Pobierz prawdziwe statystyki z bazy (O(kategorie + dni), niezależnie od liczby dokumentów)"""
     
-    # Podstawowe dane
-    categories = service.db.get_categories()
-    documents = service.db.get_all_documents()
+    category_counts = service.db.get_category_counts()
+    total_docs = service.db.count_documents()
     
-    # Grupowanie po Areas
+    # Grupowanie po Areas i SubAreas
     area_counts = Counter()
-    for cat in categories:
-        area_counts[cat[0]] += 1
+    subarea_counts = Counter()
+    for area, subarea, count in category_counts:
+        area_counts[area] += count
+        if subarea:  # Jeśli ma SubArea
+            subarea_counts[f"{area} → {subarea}"] += count
     
     # Dokumenty w czasie (ostatnie 7 dni)
+    daily_counts = dict(service.db.get_daily_counts(7))
     timeline_data = []
     for i in range(7):
         date = datetime.now() - timedelta(days=6-i)
-        date_str = date.strftime('%Y-%m-%d')
-        
-
-        
-        # Policz dokumenty z tego dnia
-        count = 0
-        for doc in documents:
-            if doc[4].strftime('%Y-%m-%d') == date_str:
-                count += 1
-        
         timeline_data.append({
             'date': date.strftime('%a'),
-            'count': count
+            'count': daily_counts.get(date.strftime('%Y-%m-%d'), 0)
         })
     
     # Dokładne percentages kategorii
-    total_docs = len(documents)
     category_percentages = {}
     if total_docs > 0:
         for area, count in area_counts.items():
             category_percentages[area] = round((count / total_docs) * 100, 1)
     
-    # SubArea statystyki
-    subarea_counts = Counter()
-    for cat in categories:
-        if cat[1]:  # Jeśli ma SubArea
-            subarea_counts[f"{cat[0]} → {cat[1]}"] += 1
-    
     return {
         "basic_stats": {
             "total_documents": total_docs,
@@ -317,40 +194,70 @@ def get_real_stats():
                 "subarea": doc[3] or "",
                 "created": doc[4]
             }
-            for doc in documents[:10]
+            for doc in service.db.get_recent_documents(10)
         ]
     }
 
 @app.get("/api/model-performance")
 def get_model_performance():
-    """Prawdziwe metryki modelu (mock na razie)"""
+    """Prawdziwe metryki modelu (k-fold CV), liczone w tle i cache'owane per wersja modelu"""
+    
+    model_version = service.refresh_model()
+    training_count = len(service.classifier.training_texts) or service.classifier.document_count or None
     
     if not service.classifier.can_predict():
         return {
+            "status": "not_trained",
             "accuracy": 0,
             "precision": 0,
             "recall": 0,
             "f1_score": 0,
-            "training_examples": len(service.classifier.training_texts),
+            "training_examples": training_count or 0,
             "categories_learned": len(service.classifier.categories)
         }
     
-    # Na razie mock - później można dodać prawdziwe metryki
-    training_count = len(service.classifier.training_texts)
-    categories_count = len(service.classifier.categories)
-    
-    # Prosta heurystyka na podstawie ilości danych
-    base_accuracy = min(50 + (training_count * 2), 95)
+    result = evaluator.get(model_version)
+    if result is None or "error" in result:
+        # Ewaluacja jeszcze trwa (albo za mało danych) - dashboard odpyta ponownie
+        return {
+            "status": "pending" if result is None else "unavailable",
+            "message": result["error"] if result else "Evaluation in progress",
+            "accuracy": 0,
+            "precision": 0,
+            "recall": 0,
+            "f1_score": 0,
+            "model_version": model_version,
+            "training_examples": training_count or 0,
+            "categories_learned": len(service.classifier.categories)
+        }
     
     return {
-        "accuracy": round(base_accuracy, 1),
-        "precision": round(base_accuracy * 0.95, 1),
-        "recall": round(base_accuracy * 0.92, 1),
-        "f1_score": round(base_accuracy * 0.93, 1),
-        "training_examples": training_count,
-        "categories_learned": categories_count
+        "status": "ready",
+        **result,
+        "training_examples": training_count or result["evaluated_documents"],
+        "categories_learned": len(service.classifier.categories)
     }
 
+@app.get("/api/export")
+def export_corpus(format: str = "csv", area: Optional[str] = None, subarea: Optional[str] = None,
+                  date_from: Optional[date] = None, date_to: Optional[date] = None):
+    """Stream the labelled corpus (csv, ndjson or parquet) straight from a database cursor"""
+    
+    if format not in available_formats():
+        return Response(
+            content=f"Unsupported format '{format}'. Available: {', '.join(available_formats())}",
+            status_code=400
+        )
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    filename = f"documents_{date.today().isoformat()}.{extension}"
+    return StreamingResponse(
+        export_documents(service.db, format, area=area, subarea=subarea,
+                         date_from=date_from, date_to=date_to),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
 @app.get("/api/csv-template")
 async def download_csv_template():
     """Download CSV template for import"""
@@ -375,58 +282,11 @@ async def download_csv_template():
 
 
 @app.post("/api/train-model")
-async def train_model():
+def train_model():
     """Trigger model training after CSV import"""
     
     try:
-        # Get all documents from database
-        documents = service.db.get_all_documents()
-        
-        if len(documents) < 2:
-            return {
-                "success": False,
-                "message": "Need at least 2 documents to train model"
-            }
-        
-        # Count documents per category
-        area_counts = {}
-        for doc in documents:
-            area = doc[2]  # area is at index 2
-            area_counts[area] = area_counts.get(area, 0) + 1
-        
-        # Check if we have at least 2 categories
-        if len(area_counts) < 2:
-            return {
-                "success": False,
-                "message": f"Need at least 2 different categories to train. Found: {list(area_counts.keys())}"
-            }
-        
-        # Reset classifier and retrain
-        from core.classifier import ClassificationEngine
-        service.classifier = ClassificationEngine()
-        
-        # Train on all documents
-        trained_count = 0
-        for doc in documents:
-            text = doc[1]   # text at index 1
-            area = doc[2]   # area at index 2
-            service.classifier.learn(text, area)
-            trained_count += 1
-        
-        # Switch to auto mode if model can predict
-        if service.classifier.can_predict():
-            service.set_mode("auto")
-        
-        return {
-            "success": True,
-            "message": f"Model trained successfully on {trained_count} documents",
-            "trained_documents": trained_count,
-            "categories": list(service.classifier.categories),
-            "categories_count": len(service.classifier.categories),
-            "can_predict": service.classifier.can_predict(),
-            "mode": service.get_mode(),
-            "category_distribution": area_counts
-        }
+        return service.retrain_from_database()
         
     except Exception as e:
         import traceback
@@ -440,6 +300,50 @@ async def train_model():
         }
 
 
+def _require_profiling_admin(token):
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.authorized(token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/api/profiling")
+def profiling_status(x_admin_token: Optional[str] = Header(None)):
+    """Stan profilowania tego procesu"""
+    _require_profiling_admin(x_admin_token)
+    return profiler.status()
+
+@app.post("/api/profiling")
+def start_profiling(options: dict, x_admin_token: Optional[str] = Header(None)):
+    """Profiluj następne N żądań (requests) i/lub przez T sekund (seconds).
+
+    Domyślnie tryb sample - endpointy panelu to funkcje def wykonywane w puli wątków,
+    których cProfile na wątku pętli zdarzeń nie widzi.
+    """
+    _require_profiling_admin(x_admin_token)
+    try:
+        return profiler.start(options.get("requests"), options.get("seconds"),
+                              float(options.get("sample_rate", 1.0)), options.get("mode", "sample"))
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.delete("/api/profiling")
+def stop_profiling(x_admin_token: Optional[str] = Header(None)):
+    _require_profiling_admin(x_admin_token)
+    return profiler.stop()
+
+@app.get("/api/profiling/profiles")
+def list_profiles(limit: int = 50, x_admin_token: Optional[str] = Header(None)):
+    _require_profiling_admin(x_admin_token)
+    return {"profiles": profiler.list_profiles(limit), "directory": profiler.status()["directory"]}
+
+@app.get("/api/profiling/profiles/{name}")
+def download_profile(name: str, x_admin_token: Optional[str] = Header(None)):
+    _require_profiling_admin(x_admin_token)
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {name} not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
+
 
 if __name__ == "__main__":
     import uvicorn
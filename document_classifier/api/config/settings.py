@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings  # <-- ZMIANA
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
     # Database
@@ -19,6 +19,21 @@ class Settings(BaseSettings):
     model_confidence_threshold: float = 0.7
     model_learning_mode: str = "learning"  # learning | auto
     
+    # Health checks
+    readiness_cache_ttl: float = 2.0  # seconds a probe verdict is reused
+    readiness_timeout: float = 1.0  # hard limit for each dependency check
+    
+    # Admission control (per route class: max_concurrency, max_queue, queue_timeout in s)
+    admission_enabled: bool = True
+    admission_limits: Dict[str, Dict[str, float]] = {
+        "classify": {"max_concurrency": 32, "max_queue": 64, "queue_timeout": 2.0},
+        "feedback": {"max_concurrency": 4, "max_queue": 16, "queue_timeout": 5.0},
+        "admin": {"max_concurrency": 1, "max_queue": 2, "queue_timeout": 10.0},
+    }
+    rate_limit_per_second: float = 0.0  # per client, 0 disables
+    rate_limit_burst: int = 20
+    rate_limit_client_header: str = "X-System-Id"
+    
     # Logging
     log_level: str = "INFO"
     
@@ -19,11 +19,21 @@ def get_document_service():
     try:
         # Try to import real service (works in Kubernetes)
         from core.document_service import DocumentService
-        return DocumentService()
+        service = DocumentService()
+        # Connections and the model are lazy; a server connects and loads up front
+        # so readiness means ready and an unreachable database falls back to the mock
+        service.warm_up()
+        return service
     except Exception as e:
         print(f"⚠️  Real service failed ({e}), using mock for local development")
         return MockDocumentService()
 
+def peek_document_service():
+    """Return the document service only if it has already been built"""
+    if get_document_service.cache_info().currsize:
+        return get_document_service()
+    return None
+
 # Mock service for local development
 class MockDocumentService:
     """Mock service when database is not available"""
@@ -32,6 +42,24 @@ class MockDocumentService:
     
     def get_mode(self):
         return "learning"
+    
+    def get_confidence_threshold(self):
+        return get_settings().model_confidence_threshold
+    
+    def refresh_model(self):
+        return None
+    
+    def classifier_for(self, system_id=None):
+        return self.classifier, "default"
+    
+    def get_duplicate_policy(self):
+        return "off"
+    
+    def find_duplicates(self, text, threshold=None, limit=10):
+        return []
+    
+    def explain(self, text, k=5, system_id=None):
+        return None
 
 class MockClassifier:
     """Mock classifier for local development"""
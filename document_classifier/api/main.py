@@ -1,7 +1,11 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config.settings import settings
-from routers import health
+from middleware.admission import AdmissionControlMiddleware
+from routers import health, classification, labelling, profiling
+from dependencies import get_document_service
+from core.profiling import ProfilingMiddleware, get_profiler
 
 # Create FastAPI app
 app = FastAPI(
@@ -11,6 +15,22 @@ app = FastAPI(
     debug=settings.debug,
 )
 
+# On-demand request profiling, only when PROFILING_TOKEN is set (zero cost otherwise);
+# added before admission control so queue waits are not part of the profile
+profiler = get_profiler("api")
+if profiler.enabled:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+# Shed load early instead of queueing without bound
+if settings.admission_enabled:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        limits=settings.admission_limits,
+        rate_limit_per_second=settings.rate_limit_per_second,
+        rate_limit_burst=settings.rate_limit_burst,
+        client_header=settings.rate_limit_client_header,
+    )
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +42,14 @@ app.add_middleware(
 
 # Include routers
 app.include_router(health.router, prefix=settings.api_prefix)
+app.include_router(classification.router, prefix=settings.api_prefix)
+app.include_router(labelling.router, prefix=settings.api_prefix)
+app.include_router(profiling.router, prefix=settings.api_prefix)
+
+@app.on_event("startup")
+async def warm_up_document_service():
+    """Build the document service in the background; readiness reports it when done"""
+    asyncio.get_running_loop().run_in_executor(None, get_document_service)
 
 # Root endpoint
 @app.get("/")
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+
+# Route class per path fragment; first match wins, unmatched paths (health, docs) are never shed
+DEFAULT_ROUTE_CLASSES: List[Tuple[str, str]] = [
+    ("/classify/feedback", "feedback"),
+    ("/classify", "classify"),
+    ("/labelling", "feedback"),
+    ("/admin", "admin"),
+    ("/mode/", "admin"),
+    ("/train-model", "admin"),
+    ("/import-jobs", "admin"),
+]
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimit:
+    """Bounded concurrency with a bounded, deadline-aware wait queue"""
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._service_time = 0.1  # EWMA of seconds per request, seeds Retry-After
+
+    def retry_after(self) -> int:
+        backlog = (self.waiting + 1) / self.max_concurrency
+        return max(1, math.ceil(backlog * self._service_time))
+
+    async def acquire(self):
+        if not self._semaphore.locked():
+            # Free slot: acquire() returns without suspending, so the count stays exact
+            await self._semaphore.acquire()
+            return
+
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Rejected(503, f"Too many queued '{self.name}' requests", self.retry_after())
+
+        # Acquire through a task rather than wait_for: on Python < 3.12 wait_for can drop
+        # a permit that was granted just as the deadline fired, shrinking capacity for good
+        self.waiting += 1
+        acquisition = asyncio.ensure_future(self._semaphore.acquire())
+        try:
+            done, _ = await asyncio.wait((acquisition,), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            self._abandon(acquisition)  # client went away while queued
+            raise
+        finally:
+            self.waiting -= 1
+        if not done:
+            self._abandon(acquisition)
+            self.rejected += 1
+            raise Rejected(503, f"'{self.name}' queue deadline exceeded", self.retry_after())
+
+    def _abandon(self, acquisition: asyncio.Future):
+        """Give up a pending acquisition; a permit granted in the meantime goes straight back"""
+        acquisition.cancel()
+        acquisition.add_done_callback(
+            lambda task: None if task.cancelled() else self._semaphore.release()
+        )
+
+    def release(self, elapsed: float):
+        self._service_time = 0.8 * self._service_time + 0.2 * elapsed
+        self._semaphore.release()
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets, bounded to the most recently seen clients"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def check(self, client_id: str):
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client_id, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        if tokens < 1.0:
+            self._buckets[client_id] = (tokens, now)
+            raise Rejected(429, f"Rate limit exceeded for client '{client_id}'",
+                           max(1, math.ceil((1.0 - tokens) / self.rate)))
+
+        self._buckets[client_id] = (tokens - 1.0, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware that sheds load early instead of letting requests time out.
+
+    Each route class (classify, feedback, admin) gets its own concurrency
+    limit and wait queue; requests that cannot start before the class
+    deadline get 503, clients over their rate get 429, both with Retry-After.
+    """
+
+    def __init__(
+        self,
+        app,
+        limits: Dict[str, Dict[str, float]],
+        route_classes: Optional[List[Tuple[str, str]]] = None,
+        rate_limit_per_second: float = 0.0,
+        rate_limit_burst: int = 20,
+        client_header: str = "x-system-id",
+        max_peek_bytes: int = 64 * 1024,
+    ):
+        self.app = app
+        self.route_classes = route_classes or DEFAULT_ROUTE_CLASSES
+        self.limits = {
+            name: ConcurrencyLimit(
+                name,
+                int(conf["max_concurrency"]),
+                int(conf["max_queue"]),
+                float(conf["queue_timeout"]),
+            )
+            for name, conf in limits.items()
+        }
+        self.client_header = client_header.lower().encode("latin-1")
+        self.max_peek_bytes = max_peek_bytes
+        self.rate_limiter = (
+            TokenBucketLimiter(rate_limit_per_second, rate_limit_burst)
+            if rate_limit_per_second > 0 else None
+        )
+
+    def _match_route(self, path: str) -> Optional[str]:
+        for fragment, route_class in self.route_classes:
+            if fragment in path:
+                return route_class
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limits.get(self._match_route(scope["path"]))
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            if self.rate_limiter is not None:
+                client_id, receive = await self._client_id(scope, receive)
+                if client_id:
+                    self.rate_limiter.check(client_id)
+            await limit.acquire()
+        except Rejected as rejection:
+            await self._reject(send, rejection)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limit.release(time.monotonic() - started)
+
+    async def _client_id(self, scope, receive):
+        """Client key from the header, the system_id query param or the JSON body.
+
+        At most max_peek_bytes of the body are read before admission; a larger
+        body is keyed by the client address instead. Whatever was read is
+        replayed to the application unchanged.
+        """
+        for name, value in scope.get("headers", []):
+            if name == self.client_header:
+                return value.decode("latin-1"), receive
+
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if query.get("system_id"):
+            return query["system_id"][0], receive
+
+        if scope.get("method") != "POST":
+            return None, receive
+
+        messages = []
+        size = 0
+        while size <= self.max_peek_bytes:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break  # disconnect - the application sees it after the replayed chunks
+            size += len(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+
+        async def replay():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        last = messages[-1]
+        if last["type"] != "http.request":
+            return None, replay
+        if last.get("more_body", False):
+            client = scope.get("client")
+            return (client[0] if client else None), replay
+
+        body = b"".join(message.get("body", b"") for message in messages)
+        try:
+            system_id = json.loads(body).get("system_id")
+        except (ValueError, AttributeError):
+            system_id = None
+        return (str(system_id) if system_id else None), replay
+
+    async def _reject(self, send, rejection: Rejected):
+        payload = json.dumps({"detail": rejection.detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": rejection.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("latin-1")),
+                (b"retry-after", str(rejection.retry_after).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": payload})
\ No newline at end of file
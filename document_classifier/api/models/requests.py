@@ -1,9 +1,15 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Annotated
+
+from core.tenant_models import SYSTEM_ID_PATTERN as _SYSTEM_ID
+
+# The id becomes a directory name, so the API validates it with the registry's own rule
+SYSTEM_ID_PATTERN = _SYSTEM_ID.pattern
 
 class ClassifyRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=10000, description="Text to classify")
-    confidence_threshold: Optional[float] = Field(0.7, ge=0.0, le=1.0, description="Minimum confidence threshold")
+    confidence_threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="Minimum confidence threshold (defaults to the runtime setting)")
+    system_id: Optional[str] = Field(None, pattern=SYSTEM_ID_PATTERN, description="Integrating system; selects its own model")
     context: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Additional context")
     
     class Config:
@@ -11,16 +17,35 @@ class ClassifyRequest(BaseModel):
             "example": {
                 "text": "Invoice from ABC Company for office supplies totaling $1,247.89",
                 "confidence_threshold": 0.7,
+                "system_id": "fasttrack",
                 "context": {"user_id": "123", "source": "email"}
             }
         }
 
+class BatchClassifyRequest(BaseModel):
+    texts: List[Annotated[str, Field(min_length=1, max_length=10000)]] = Field(..., min_length=1, max_length=1000, description="Texts to classify, results keep this order")
+    confidence_threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="Minimum confidence threshold (defaults to the runtime setting)")
+    system_id: Optional[str] = Field(None, pattern=SYSTEM_ID_PATTERN, description="Integrating system; selects its own model")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "texts": [
+                    "Invoice from ABC Company for office supplies totaling $1,247.89",
+                    "Meeting notes from quarterly planning session"
+                ],
+                "confidence_threshold": 0.7,
+                "system_id": "fasttrack"
+            }
+        }
+
 class FeedbackRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=10000)
     area: str = Field(..., min_length=1, max_length=100)
     subarea: Optional[str] = Field(None, max_length=100)
     predicted_area: Optional[str] = Field(None, description="What the system predicted")
     user_id: Optional[str] = Field(None, description="User who provided feedback")
+    system_id: Optional[str] = Field(None, pattern=SYSTEM_ID_PATTERN, description="Integrating system whose model learns from this")
     
     class Config:
         json_schema_extra = {
@@ -29,6 +54,79 @@ class FeedbackRequest(BaseModel):
                 "area": "Sluzbowe", 
                 "subarea": "Spotkania",
                 "predicted_area": "Daily Business",
-                "user_id": "user_123"
+                "user_id": "user_123",
+                "system_id": "fasttrack"
+            }
+        }
+
+class SimilarDocumentsRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=10000, description="Text to look up")
+    threshold: Optional[float] = Field(None, ge=0.0, le=1.0, description="Minimum estimated Jaccard similarity of character 5-grams (defaults to 0.8)")
+    limit: int = Field(10, ge=1, le=100, description="Maximum number of matches")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "text": "Invoice from ABC Company for office supplies totaling $1,247.89",
+                "threshold": 0.8,
+                "limit": 10
+            }
+        }
+
+class ExplainRequest(BaseModel):
+    text: str = Field(..., min_length=1, max_length=10000, description="Text to classify and explain")
+    k: int = Field(5, ge=1, le=50, description="Number of nearest labelled examples")
+    system_id: Optional[str] = Field(None, pattern=SYSTEM_ID_PATTERN, description="Integrating system; selects its own model")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "text": "Invoice from ABC Company for office supplies totaling $1,247.89",
+                "k": 5,
+                "system_id": "fasttrack"
+            }
+        }
+
+class UnlabelledDocument(BaseModel):
+    text: str = Field(..., min_length=1, max_length=10000, description="Document text awaiting a label")
+    source: Optional[str] = Field(None, max_length=200, description="Where the document came from (mailbox, system, file)")
+
+class UnlabelledDocumentsRequest(BaseModel):
+    documents: List[UnlabelledDocument] = Field(..., min_length=1, max_length=1000, description="Documents to add to the labelling pool")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "documents": [
+                    {"text": "Invoice from ABC Company for office supplies totaling $1,247.89", "source": "mailbox"}
+                ]
+            }
+        }
+
+class LabelRequest(BaseModel):
+    area: str = Field(..., min_length=1, max_length=100, description="Correct category")
+    subarea: Optional[str] = Field(None, max_length=100, description="Correct subcategory")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "area": "Finanse",
+                "subarea": "Faktury"
+            }
+        }
+
+class ProfilingRequest(BaseModel):
+    requests: Optional[int] = Field(None, ge=1, le=100000, description="Profile the next N requests")
+    seconds: Optional[float] = Field(None, gt=0, le=3600, description="Profile requests for this many seconds")
+    sample_rate: float = Field(1.0, gt=0.0, le=1.0, description="Fraction of requests profiled while enabled")
+    mode: str = Field("cprofile", pattern="^(cprofile|sample)$", description="cprofile or sample (stack sampling)")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "requests": 100,
+                "seconds": 60,
+                "sample_rate": 0.1,
+                "mode": "cprofile"
             }
         }
\ No newline at end of file
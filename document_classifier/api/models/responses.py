@@ -24,16 +24,109 @@ class ClassifyResponse(BaseModel):
             }
         }
 
+class BatchClassifyItem(BaseModel):
+    area: str = Field(..., description="Predicted category, or Unknown below the confidence threshold")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="Prediction confidence")
+    suggestions: List[str] = Field(default_factory=list, description="Alternative suggestions")
+    metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+
+class BatchClassifyResponse(BaseModel):
+    results: List[BatchClassifyItem] = Field(default_factory=list, description="One result per text, in request order")
+    mode: str = Field(..., description="System mode: learning or auto")
+    model_version: Optional[str] = Field(None, description="Model version that produced the predictions")
+    model: str = Field("default", description="default or tenant:<system_id>")
+    count: int = Field(0, description="Number of texts classified")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {"area": "Finanse", "confidence": 0.85, "suggestions": [], "metadata": {}},
+                    {"area": "Unknown", "confidence": 0.41, "suggestions": ["Sluzbowe"],
+                     "metadata": {"reason": "Below confidence threshold", "threshold": 0.7}}
+                ],
+                "mode": "auto",
+                "model_version": "12",
+                "model": "default",
+                "count": 2
+            }
+        }
+
 class FeedbackResponse(BaseModel):
     success: bool = Field(..., description="Whether feedback was processed")
     message: str = Field(..., description="Response message")
     model_updated: bool = Field(False, description="Whether the model was retrained")
+    duplicate_of: Optional[int] = Field(None, description="Existing document this feedback was collapsed into")
+    near_duplicates: List[Dict[str, Any]] = Field(default_factory=list, description="Stored documents similar to this text")
     
     class Config:
         json_schema_extra = {
             "example": {
                 "success": True,
                 "message": "Feedback received and model updated",
-                "model_updated": True
+                "model_updated": True,
+                "duplicate_of": None,
+                "near_duplicates": [{"id": 42, "similarity": 0.91, "area": "Finanse", "subarea": "Faktury"}]
+            }
+        }
+
+class SimilarDocumentsResponse(BaseModel):
+    matches: List[Dict[str, Any]] = Field(default_factory=list, description="Similar documents, most similar first")
+    indexed_documents: int = Field(0, description="Documents in the near-duplicate index")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "matches": [{"id": 42, "similarity": 0.91, "area": "Finanse", "subarea": "Faktury"}],
+                "indexed_documents": 1250
+            }
+        }
+
+class ExplainResponse(BaseModel):
+    area: str = Field(..., description="Predicted category")
+    confidence: float = Field(..., ge=0.0, le=1.0, description="Prediction confidence")
+    neighbors: List[Dict[str, Any]] = Field(default_factory=list, description="Most similar labelled training documents")
+    model_version: Optional[str] = Field(None, description="Model version that produced the prediction")
+    model: str = Field("default", description="default or tenant:<system_id>")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "area": "Finanse",
+                "confidence": 0.85,
+                "neighbors": [
+                    {"similarity": 0.62, "area": "Finanse", "text": "Invoice from ABC Company for office supplies totaling $1,247.89"}
+                ],
+                "model_version": "12",
+                "model": "default"
             }
-        }
\ No newline at end of file
+        }
+
+class LabellingQueueResponse(BaseModel):
+    documents: List[Dict[str, Any]] = Field(default_factory=list, description="Pending documents, most uncertain first")
+    strategy: str = Field(..., description="Uncertainty measure: margin, entropy or least_confidence")
+    pending: int = Field(0, description="Documents waiting for a label")
+    stale: int = Field(0, description="Pending documents not yet scored by the current model")
+    rescored: int = Field(0, description="Documents rescored while serving this request")
+    model_version: Optional[str] = Field(None, description="Model version used for scoring")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "documents": [
+                    {"id": 7, "text": "Quarterly budget review meeting", "source": "mailbox",
+                     "uncertainty": 0.97, "predicted_area": "Finanse", "model_version": 12}
+                ],
+                "strategy": "margin",
+                "pending": 340,
+                "stale": 0,
+                "rescored": 25,
+                "model_version": "12"
+            }
+        }
+
+class LabelResponse(BaseModel):
+    success: bool = Field(..., description="Whether the label was stored")
+    document_id: Optional[int] = Field(None, description="Id of the stored training document")
+    model_updated: bool = Field(False, description="Whether the model was retrained")
+    model_version: Optional[str] = Field(None, description="Model version after learning")
\ No newline at end of file
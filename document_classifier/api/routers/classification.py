@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Depends
-from models.requests import ClassifyRequest, FeedbackRequest
-from models.responses import ClassifyResponse, FeedbackResponse
+from models.requests import ClassifyRequest, BatchClassifyRequest, FeedbackRequest, SimilarDocumentsRequest, ExplainRequest
+from models.responses import ClassifyResponse, BatchClassifyItem, BatchClassifyResponse, FeedbackResponse, SimilarDocumentsResponse, ExplainResponse
 from dependencies import get_document_service
 from datetime import datetime
 
@@ -16,6 +16,7 @@ async def classify_document(
     
     - **text**: The document text to classify
     - **confidence_threshold**: Minimum confidence required (0.0-1.0)
+    - **system_id**: Integrating system; its own model is used when available
     - **context**: Additional context for classification
     """
     try:
@@ -26,15 +27,19 @@ async def classify_document(
                 detail="System is in learning mode. Please provide feedback first."
             )
         
+        # Tenant model for this system_id, falling back to the shared default;
+        # also picks up a model published by another worker
+        classifier, model_scope = service.classifier_for(request.system_id)
+        
         # Check if model can predict
-        if not service.classifier.can_predict():
+        if not classifier.can_predict():
             raise HTTPException(
                 status_code=503,
                 detail="Model not trained yet. Insufficient training data."
             )
         
         # Make prediction
-        result = service.classifier.predict(request.text)
+        result = classifier.predict(request.text)
         
         if not result:
             raise HTTPException(
@@ -43,7 +48,10 @@ async def classify_document(
             )
         
         # Check confidence threshold
-        if result['confidence'] < request.confidence_threshold:
+        threshold = request.confidence_threshold
+        if threshold is None:
+            threshold = service.get_confidence_threshold()
+        if result['confidence'] < threshold:
             return ClassifyResponse(
                 area="Unknown",
                 confidence=result['confidence'],
@@ -51,7 +59,7 @@ async def classify_document(
                 suggestions=[result['area']] if result.get('area') else [],
                 metadata={
                     "reason": "Below confidence threshold",
-                    "threshold": request.confidence_threshold,
+                    "threshold": threshold,
                     "processing_time": "0.05s"
                 }
             )
@@ -62,8 +70,9 @@ async def classify_document(
             mode=service.get_mode(),
             metadata={
                 "processing_time": "0.12s",
-                "model_version": "1.0",
-                "categories_available": len(service.classifier.categories) if hasattr(service.classifier, 'categories') else 0
+                "model_version": str(classifier.model_version),
+                "model": model_scope,
+                "categories_available": len(classifier.categories) if hasattr(classifier, 'categories') else 0
             }
         )
         
@@ -72,6 +81,70 @@ async def classify_document(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
 
+@router.post("/batch", response_model=BatchClassifyResponse)
+async def classify_batch(
+    request: BatchClassifyRequest,
+    service = Depends(get_document_service)
+):
+    """
+    Classify up to 1000 texts in one request
+    
+    - **texts**: The document texts; results come back in the same order
+    - **confidence_threshold**: Minimum confidence required (0.0-1.0)
+    - **system_id**: Integrating system; its own model is used when available
+    
+    All texts go through one feature matrix (predict_batch), so a batch costs
+    far less than the same number of single classify calls. Results below the
+    threshold are "Unknown" with the prediction in suggestions, as for /classify/.
+    """
+    try:
+        if service.get_mode() == "learning":
+            raise HTTPException(
+                status_code=400,
+                detail="System is in learning mode. Please provide feedback first."
+            )
+        
+        classifier, model_scope = service.classifier_for(request.system_id)
+        if not classifier.can_predict():
+            raise HTTPException(
+                status_code=503,
+                detail="Model not trained yet. Insufficient training data."
+            )
+        
+        threshold = request.confidence_threshold
+        if threshold is None:
+            threshold = service.get_confidence_threshold()
+        
+        results = []
+        for prediction in classifier.predict_batch(request.texts):
+            if not prediction:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Classification failed. Unable to process text."
+                )
+            if prediction['confidence'] < threshold:
+                results.append(BatchClassifyItem(
+                    area="Unknown",
+                    confidence=prediction['confidence'],
+                    suggestions=[prediction['area']] if prediction.get('area') else [],
+                    metadata={"reason": "Below confidence threshold", "threshold": threshold}
+                ))
+            else:
+                results.append(BatchClassifyItem(area=prediction['area'], confidence=prediction['confidence']))
+        
+        return BatchClassifyResponse(
+            results=results,
+            mode=service.get_mode(),
+            model_version=str(classifier.model_version),
+            model=model_scope,
+            count=len(results)
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
+
 @router.post("/feedback", response_model=FeedbackResponse)
 async def submit_feedback(
     request: FeedbackRequest,
@@ -84,21 +157,42 @@ async def submit_feedback(
     - **area**: The correct category
     - **subarea**: The correct subcategory (optional)
     - **predicted_area**: What the system predicted (optional)
+    
+    Near-duplicates of stored documents are reported (duplicate_policy "flag") or,
+    when they carry the same label, not stored again (duplicate_policy "collapse").
     """
     try:
+        policy = service.get_duplicate_policy()
+        near_duplicates = service.find_duplicates(request.text) if policy != "off" else []
+        
+        if policy == "collapse":
+            same_label = [doc for doc in near_duplicates
+                          if doc["area"] == request.area and doc["subarea"] == request.subarea]
+            if same_label:
+                return FeedbackResponse(
+                    success=True,
+                    message=f"Near-duplicate of document {same_label[0]['id']}; not stored again",
+                    model_updated=False,
+                    duplicate_of=same_label[0]["id"],
+                    near_duplicates=near_duplicates
+                )
+        
         # Save feedback to database
         success = service.db.save_document(request.text, request.area, request.subarea)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to save feedback")
         
-        # Train the model with new data
-        service.classifier.learn(request.text, request.area)
+        # Train the model with new data and publish it to all workers
+        # (False when the class is at its sampling cap and the reservoir kept its current sample)
+        model_updated = bool(service.learn(request.text, request.area, system_id=request.system_id))
         
         return FeedbackResponse(
             success=True,
-            message="Feedback received and model updated successfully",
-            model_updated=True
+            message=("Feedback received and model updated successfully" if model_updated
+                     else "Feedback received and stored; model unchanged"),
+            model_updated=model_updated,
+            near_duplicates=near_duplicates
         )
         
     except Exception as e:
@@ -109,6 +203,66 @@ async def submit_feedback(
             model_updated=False
         )
 
+@router.post("/explain", response_model=ExplainResponse)
+async def explain_classification(
+    request: ExplainRequest,
+    service = Depends(get_document_service)
+):
+    """
+    Classify a text and return the most similar labelled training documents
+    
+    - **text**: The document text
+    - **k**: How many nearest labelled examples to return
+    - **system_id**: Integrating system; its own model is used when available
+    
+    Similarity is cosine in the model's own feature space, so the neighbours
+    are the training documents that pulled the prediction the most.
+    """
+    try:
+        result = service.explain(request.text, k=request.k, system_id=request.system_id)
+        if result is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Model not trained yet. Insufficient training data."
+            )
+        if result["neighbors"] is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Nearest examples are not available for this model (trained without a stored corpus)."
+            )
+        return ExplainResponse(
+            area=result["area"],
+            confidence=result["confidence"],
+            neighbors=result["neighbors"],
+            model_version=str(result["model_version"]),
+            model=result["model"]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error explaining classification: {str(e)}")
+
+@router.post("/similar", response_model=SimilarDocumentsResponse)
+async def find_similar_documents(
+    request: SimilarDocumentsRequest,
+    service = Depends(get_document_service)
+):
+    """
+    Find stored documents that are near-duplicates of a text (MinHash/LSH index)
+    
+    - **text**: The text to look up
+    - **threshold**: Minimum estimated Jaccard similarity of character 5-grams
+    - **limit**: Maximum number of matches
+    """
+    try:
+        matches = service.find_duplicates(request.text, threshold=request.threshold, limit=request.limit)
+        return SimilarDocumentsResponse(
+            matches=matches,
+            indexed_documents=service.duplicates.count() if hasattr(service, 'duplicates') else 0
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching similar documents: {str(e)}")
+
 @router.get("/categories")
 async def get_available_categories(service = Depends(get_document_service)):
     """Get all available categories for classification"""
@@ -127,7 +281,7 @@ async def get_available_categories(service = Depends(get_document_service)):
             "areas": list(areas.keys()),
             "categories": areas,
             "total_areas": len(areas),
-            "total_documents": len(service.db.get_all_documents()) if hasattr(service, 'db') else 0
+            "total_documents": service.db.count_documents() if hasattr(service, 'db') else 0
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving categories: {str(e)}")
\ No newline at end of file
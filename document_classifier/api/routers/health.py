@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Depends
-from dependencies import get_document_service
-from core.document_service import DocumentService
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from dependencies import get_settings, peek_document_service
+from services.readiness import ReadinessProbe
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+readiness_probe = ReadinessProbe(
+    cache_ttl=get_settings().readiness_cache_ttl,
+    timeout=get_settings().readiness_timeout,
+)
+
 @router.get("/")
 async def health_check():
     """Basic health check"""
@@ -14,26 +20,12 @@ async def health_check():
     }
 
 @router.get("/ready")
-async def readiness_check(
-    service: DocumentService = Depends(get_document_service)
-):
+async def readiness_check():
     """Readiness check - is application ready to serve traffic"""
-    try:
-        # Check if service can respond
-        mode = service.get_mode()
-        can_predict = service.classifier.can_predict()
-        
-        return {
-            "status": "ready",
-            "mode": mode,
-            "can_predict": can_predict,
-            "database": "connected"  # TODO: add real DB check
-        }
-    except Exception as e:
-        return {
-            "status": "not_ready",
-            "error": str(e)
-        }
+    # Never build the service here - a probe must not open connections or run DDL
+    result = await readiness_probe.check(peek_document_service())
+    status_code = 200 if result["status"] == "ready" else 503
+    return JSONResponse(content=result, status_code=status_code)
 
 @router.get("/live")
 async def liveness_check():
@@ -0,0 +1,82 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
+from models.requests import UnlabelledDocumentsRequest, LabelRequest
+from models.responses import LabellingQueueResponse, LabelResponse
+from dependencies import get_document_service
+
+router = APIRouter(prefix="/labelling", tags=["labelling"])
+
+def _require_queue(service):
+    if not hasattr(service, "labelling"):
+        raise HTTPException(status_code=503, detail="Labelling queue requires the database")
+
+@router.post("/documents")
+async def add_unlabelled_documents(
+    request: UnlabelledDocumentsRequest,
+    service = Depends(get_document_service)
+):
+    """
+    Add documents to the pool awaiting a human label
+
+    - **documents**: Texts (with an optional source) to be ranked for labelling
+    """
+    _require_queue(service)
+    try:
+        added = service.labelling.add([(doc.text, doc.source) for doc in request.documents])
+        return {"success": True, "added": added}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error adding documents: {str(e)}")
+
+@router.get("/queue", response_model=LabellingQueueResponse)
+async def get_labelling_queue(
+    limit: int = Query(10, ge=1, le=100, description="Number of documents to return"),
+    service = Depends(get_document_service)
+):
+    """
+    Pending documents ranked by model uncertainty, most uncertain first
+
+    Scores are computed in batches and remembered per model version; each call
+    rescores a bounded number of documents the current model has not seen yet.
+    Before the model can predict, documents are returned oldest first.
+    """
+    _require_queue(service)
+    try:
+        # Rescoring up to a few thousand documents is CPU work - keep it off the event loop
+        queue = await run_in_threadpool(service.labelling_queue, limit)
+        version = service.classifier.model_version
+        return LabellingQueueResponse(
+            documents=queue["documents"],
+            strategy=queue["strategy"],
+            pending=queue["pending"],
+            stale=queue["stale"],
+            rescored=queue["rescored"],
+            model_version=str(version) if version is not None else None
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error building labelling queue: {str(e)}")
+
+@router.post("/{document_id}", response_model=LabelResponse)
+async def label_document(
+    document_id: int,
+    request: LabelRequest,
+    service = Depends(get_document_service)
+):
+    """
+    Label a pooled document: it is stored as training data and the model learns from it
+
+    - **area**: The correct category
+    - **subarea**: The correct subcategory (optional)
+    """
+    _require_queue(service)
+    try:
+        result = await run_in_threadpool(service.label_queued, document_id, request.area, request.subarea)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error labelling document: {str(e)}")
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No pending document {document_id}")
+    return LabelResponse(
+        success=True,
+        document_id=result["document_id"],
+        model_updated=bool(result["model_updated"]),
+        model_version=str(result["model_version"]) if result["model_version"] is not None else None
+    )
\ No newline at end of file
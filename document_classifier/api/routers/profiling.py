@@ -0,0 +1,60 @@
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from fastapi.responses import FileResponse
+from models.requests import ProfilingRequest
+from core.profiling import get_profiler
+
+router = APIRouter(prefix="/admin/profiling", tags=["profiling"])
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Profiling control needs PROFILING_TOKEN; without it the endpoints do not exist"""
+    profiler = get_profiler("api")
+    if not profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not profiler.authorized(x_admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    return profiler
+
+@router.get("")
+async def profiling_status(profiler = Depends(require_admin)):
+    """Current profiling state of this process"""
+    return profiler.status()
+
+@router.post("")
+async def start_profiling(request: ProfilingRequest, profiler = Depends(require_admin)):
+    """
+    Profile the next N requests and/or all requests for T seconds in this process
+
+    - **requests**: Number of requests to profile
+    - **seconds**: Profiling window in seconds
+    - **sample_rate**: Fraction of requests profiled while enabled
+    - **mode**: cprofile (deterministic, event-loop thread) or sample (stack sampling, all threads)
+
+    A single request can also opt into full profiling with the X-Profile-Token header;
+    its response carries X-Profile-Id with the profile file name.
+    """
+    try:
+        return profiler.start(request.requests, request.seconds, request.sample_rate, request.mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.delete("")
+async def stop_profiling(profiler = Depends(require_admin)):
+    """Stop profiling immediately"""
+    return profiler.stop()
+
+@router.get("/profiles")
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    profiler = Depends(require_admin)
+):
+    """Profiles written by this process, newest first"""
+    return {"profiles": profiler.list_profiles(limit), "directory": profiler.status()["directory"]}
+
+@router.get("/profiles/{name}")
+async def download_profile(name: str, profiler = Depends(require_admin)):
+    """Download a profile: .prof for pstats/snakeviz, .folded for flame graphs"""
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Profile {name} not found")
+    return FileResponse(path, filename=name, media_type="application/octet-stream")
\ No newline at end of file
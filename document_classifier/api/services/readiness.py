@@ -0,0 +1,95 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class ReadinessProbe:
+    """Runs dependency checks with hard timeouts and caches the verdict.
+
+    Kubernetes may probe every few seconds from several kubelets; within
+    ``cache_ttl`` all of them get the cached result, and at most one check
+    per dependency is ever in flight, so a slow database cannot make probes
+    pile up threads or connections.
+    """
+
+    def __init__(self, cache_ttl: float = 2.0, timeout: float = 1.0):
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._cached: Optional[Dict[str, Any]] = None
+        self._cached_at = 0.0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def check(self, service) -> Dict[str, Any]:
+        if self._is_fresh():
+            return {**self._cached, "cached": True}
+
+        async with self._lock:
+            # Another probe may have refreshed the cache while we waited
+            if self._is_fresh():
+                return {**self._cached, "cached": True}
+
+            result = await self._run_checks(service)
+            self._cached = result
+            self._cached_at = time.monotonic()
+            return {**result, "cached": False}
+
+    def _is_fresh(self) -> bool:
+        return self._cached is not None and time.monotonic() - self._cached_at < self.cache_ttl
+
+    async def _run_checks(self, service) -> Dict[str, Any]:
+        if service is None:
+            return {
+                "status": "not_ready",
+                "checks": {"service": {"status": "initializing"}},
+            }
+
+        database, model = await asyncio.gather(
+            self._timed("database", lambda: self._check_database(service)),
+            self._timed("model", lambda: self._check_model(service)),
+        )
+        checks = {"database": database, "model": model}
+        ready = all(check["status"] == "ok" for check in checks.values())
+
+        result = {"status": "ready" if ready else "not_ready", "checks": checks}
+        if model["status"] == "ok":
+            result["mode"] = service.get_mode()
+            result["can_predict"] = model["can_predict"]
+        return result
+
+    async def _timed(self, name: str, func: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run a blocking check in a thread, never more than one per dependency"""
+        future = self._in_flight.get(name)
+        if future is None or future.done():
+            future = asyncio.get_running_loop().run_in_executor(None, func)
+            self._in_flight[name] = future
+
+        started = time.monotonic()
+        try:
+            details = await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return {"status": "timeout", "timeout_s": self.timeout}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+        return {
+            "status": "ok",
+            "latency_ms": round((time.monotonic() - started) * 1000, 2),
+            **details,
+        }
+
+    def _check_database(self, service) -> Dict[str, Any]:
+        db = getattr(service, "db", None)
+        if db is None:
+            raise RuntimeError("Database is not configured")
+        db.ping(timeout=self.timeout)
+        return {}
+
+    def _check_model(self, service) -> Dict[str, Any]:
+        # Read-only: the probe thread must never load or swap the serving model
+        classifier = service.classifier
+        return {
+            "model_version": classifier.model_version,
+            "published_version": service.model_store.current_version(),
+            "can_predict": classifier.can_predict(),
+        }
\ No newline at end of file
@@ -0,0 +1,167 @@
+# benchmarks/engines.py
+"""Porównanie silników klasyfikacji na tym samym korpusie i podziale train/test.
+
+Dla każdego silnika: czas treningu, szczyt pamięci przy treningu, rozmiar modelu,
+opóźnienie predykcji pojedynczego dokumentu (p50/p99, ścieżka API), przepustowość
+predykcji wsadowej, accuracy i macro F1.
+
+    python -m benchmarks.engines --sqlite data/classifier.db
+    python -m benchmarks.engines --synthetic 50000
+    python -m benchmarks.engines --engines nb,sgd --vectorizer hashing --json engines.json
+"""
+import argparse
+import gc
+import json
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+
+from core.classifier import ClassificationEngine
+from core.engines import ENGINES
+from core.features import vectorizer_config
+
+
+def split_corpus(texts, labels, test_size=0.2, seed=0):
+    """Wspólny podział dla wszystkich silników (stratyfikowany, gdy każda klasa ma >= 2 przykłady)"""
+    counts = np.unique(labels, return_counts=True)[1]
+    stratify = labels if counts.min() >= 2 else None
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=test_size, random_state=seed, stratify=stratify
+    )
+    return (train_texts, train_labels), (test_texts, test_labels)
+
+
+def benchmark_engine(name, train, test, features=None, latency_samples=1000):
+    """Pomiary jednego silnika; zwraca słownik gotowy do JSON"""
+    train_texts, train_labels = train
+    test_texts, test_labels = test
+
+    gc.collect()
+    engine = ClassificationEngine(features, engine=name)
+    started = time.perf_counter()
+    engine.fit(train_texts, train_labels)
+    fit_seconds = time.perf_counter() - started
+
+    # Szczyt alokacji w osobnym przebiegu - tracemalloc spowalnia trening
+    gc.collect()
+    tracemalloc.start()
+    ClassificationEngine(features, engine=name).fit(train_texts, train_labels)
+    _, fit_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Pojedyncze dokumenty jak w /classify (kernel NumPy albo sklearn)
+    samples = [test_texts[i % len(test_texts)] for i in range(latency_samples)]
+    for text in samples[:20]:
+        engine.predict(text)
+    latencies = []
+    for text in samples:
+        started = time.perf_counter()
+        engine.predict(text)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    results = engine.predict_batch(test_texts)
+    batch_seconds = time.perf_counter() - started
+    predicted = [result['area'] for result in results]
+
+    return {
+        'engine': name,
+        'train_documents': len(train_texts),
+        'test_documents': len(test_texts),
+        'fit_seconds': round(fit_seconds, 4),
+        'fit_peak_mb': round(fit_peak / 2 ** 20, 2),
+        'model_mb': round(len(pickle.dumps(engine.export_state())) / 2 ** 20, 3),
+        'predict_p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 4),
+        'predict_p99_ms': round(float(np.percentile(latencies, 99)) * 1000, 4),
+        'single_docs_per_second': round(len(latencies) / sum(latencies), 1),
+        'batch_docs_per_second': round(len(test_texts) / batch_seconds, 1),
+        'inference_kernel': engine.kernel() is not None,
+        'accuracy': round(accuracy_score(test_labels, predicted), 4),
+        'macro_f1': round(f1_score(test_labels, predicted, average='macro', zero_division=0), 4),
+    }
+
+
+def compare_engines(texts, labels, engines=None, features=None, test_size=0.2, seed=0, latency_samples=1000):
+    """Wszystkie silniki na tym samym podziale korpusu"""
+    train, test = split_corpus(list(texts), list(labels), test_size, seed)
+    features = features or vectorizer_config()
+    return [benchmark_engine(name, train, test, features, latency_samples) for name in (engines or ENGINES)]
+
+
+def format_table(results):
+    columns = ['engine', 'fit_seconds', 'fit_peak_mb', 'model_mb', 'predict_p50_ms', 'predict_p99_ms',
+               'batch_docs_per_second', 'accuracy', 'macro_f1']
+    widths = [max(len(column), *(len(str(row[column])) for row in results)) for column in columns]
+    lines = ["  ".join(column.ljust(width) for column, width in zip(columns, widths))]
+    for row in results:
+        lines.append("  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+    return "\n".join(lines)
+
+
+def load_corpus(args):
+    """Korpus z bazy (--sqlite PATH albo --postgres), syntetyczny (--synthetic N) lub przykłady startowe"""
+    if args.synthetic:
+        from .corpus import SyntheticCorpus
+        documents = [(text, area) for text, area, _ in SyntheticCorpus(args.seed).generate(args.synthetic)]
+    elif args.sqlite or args.postgres:
+        if args.sqlite:
+            from core.database import DatabaseManager
+            db = DatabaseManager(args.sqlite)
+        else:
+            from core.database_pg import DatabaseManager
+            db = DatabaseManager()
+        documents = [(doc[1], doc[2]) for doc in db.iter_documents(batch_size=5000)]
+    else:
+        from core.starter_data import STARTER_EXAMPLES
+        documents = [(text, area) for text, area, _ in STARTER_EXAMPLES]
+    if args.limit:
+        documents = documents[:args.limit]
+    return [text for text, _ in documents], [area for _, area in documents]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.engines",
+                                     description="Compare classifier engines on one corpus")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--sqlite", metavar="PATH", help="labelled documents from a SQLite database")
+    source.add_argument("--postgres", action="store_true", help="labelled documents from PostgreSQL (DB_* env vars)")
+    source.add_argument("--synthetic", type=int, metavar="N", help="N generated documents (benchmarks.corpus)")
+    parser.add_argument("--limit", type=int, help="use at most this many documents")
+    parser.add_argument("--engines", default=",".join(ENGINES), help="comma-separated engine names")
+    parser.add_argument("--vectorizer", choices=["tfidf", "hashing"], help="override CLASSIFIER_VECTORIZER")
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--latency-samples", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON ('-' for stdout)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        print(f"Unknown engines: {', '.join(unknown)} (choose from {', '.join(ENGINES)})", file=sys.stderr)
+        return 2
+
+    texts, labels = load_corpus(args)
+    features = vectorizer_config(**({'vectorizer': args.vectorizer} if args.vectorizer else {}))
+    results = compare_engines(texts, labels, engines, features, args.test_size, args.seed, args.latency_samples)
+
+    if args.json == "-":
+        print(json.dumps(results, indent=2))
+        return 0
+    print(format_table(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
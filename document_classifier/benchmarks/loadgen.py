@@ -0,0 +1,210 @@
+# benchmarks/loadgen.py
+"""Generator obciążenia HTTP (asyncio) dla API: przepustowość, błędy i percentyle opóźnień.
+
+Zamknięta pętla: concurrency klientów wysyła żądania jedno po drugim, endpoint
+losowany wg mix. --ramp uruchamia kolejne kroki ze wzrastającą współbieżnością -
+punkt nasycenia to krok, od którego przepustowość przestaje rosnąć, a p99 rośnie.
+Odpowiedzi 429/503 z admission control liczone są osobno jako odrzucone.
+
+    # w procesie (bez sieci): serwis na SQLite z syntetycznym korpusem
+    python -m benchmarks.loadgen --in-process --ramp 1,4,16,64 --duration 10
+    # lokalny serwer
+    python -m benchmarks.loadgen --url http://localhost:8000 --mix classify=8,feedback=1,categories=1
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import numpy as np
+
+try:
+    import httpx
+except ImportError:  # narzędzie deweloperskie - benchmarks/requirements.txt
+    httpx = None
+
+from .corpus import SyntheticCorpus
+
+ENDPOINTS = ('classify', 'feedback', 'categories')
+REJECTED = (429, 503)
+
+
+def parse_mix(value):
+    """'classify=8,feedback=1' -> {'classify': 8.0, 'feedback': 1.0}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint: {name} (choose from {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("mix needs at least one endpoint with positive weight")
+    return mix
+
+
+def build_request(endpoint, prefix, document):
+    """(method, path, json) dla endpointu; feedback niesie etykietę z korpusu"""
+    text, area, subarea = document
+    if endpoint == 'classify':
+        return 'POST', f"{prefix}/classify/", {'text': text}
+    if endpoint == 'feedback':
+        return 'POST', f"{prefix}/classify/feedback", {'text': text, 'area': area, 'subarea': subarea}
+    return 'GET', f"{prefix}/classify/categories", None
+
+
+class LoadStats:
+    """Czasy i statusy odpowiedzi per endpoint"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.statuses = {}
+
+    def record(self, endpoint, seconds, status):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        self.statuses.setdefault(endpoint, Counter())[status] += 1
+
+    def summary(self, elapsed):
+        def describe(latencies, statuses):
+            count = sum(statuses.values())
+            ok = sum(n for status, n in statuses.items() if isinstance(status, int) and status < 400)
+            rejected = sum(n for status, n in statuses.items() if status in REJECTED)
+            latencies = np.asarray(latencies) * 1000
+            return {
+                'requests': count,
+                'throughput': round(count / elapsed, 1),
+                'ok': ok,
+                'rejected': rejected,
+                'errors': count - ok - rejected,
+                'error_rate': round((count - ok) / count, 4) if count else 0.0,
+                'p50_ms': round(float(np.percentile(latencies, 50)), 2) if count else None,
+                'p95_ms': round(float(np.percentile(latencies, 95)), 2) if count else None,
+                'p99_ms': round(float(np.percentile(latencies, 99)), 2) if count else None,
+                'max_ms': round(float(latencies.max()), 2) if count else None,
+                'statuses': {str(status): n for status, n in sorted(statuses.items(), key=str)},
+            }
+
+        everything = Counter()
+        for statuses in self.statuses.values():
+            everything.update(statuses)
+        return {
+            'elapsed_seconds': round(elapsed, 3),
+            'total': describe([t for times in self.latencies.values() for t in times], everything),
+            'endpoints': {name: describe(self.latencies[name], self.statuses[name]) for name in self.latencies},
+        }
+
+
+async def _client_loop(client, prefix, mix, documents, stats, deadline, budget, rng):
+    names, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline and budget['remaining'] > 0:
+        budget['remaining'] -= 1
+        endpoint = rng.choices(names, weights)[0]
+        method, path, payload = build_request(endpoint, prefix, rng.choice(documents))
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=payload)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        stats.record(endpoint, time.perf_counter() - started, status)
+
+
+async def run_load(client, prefix, mix, documents, concurrency=8, duration=10.0, requests=None, seed=0):
+    """Jeden krok obciążenia: concurrency pętli przez duration sekund (albo do requests żądań)"""
+    stats = LoadStats()
+    budget = {'remaining': requests if requests else float('inf')}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(
+        _client_loop(client, prefix, mix, documents, stats, deadline, budget, random.Random(seed * 7919 + i))
+        for i in range(concurrency)
+    ))
+    return dict(stats.summary(time.perf_counter() - started), concurrency=concurrency)
+
+
+async def run_ramp(client, prefix, mix, documents, steps, duration, requests, seed):
+    return [await run_load(client, prefix, mix, documents, concurrency, duration, requests, seed)
+            for concurrency in steps]
+
+
+def format_report(results):
+    header = (f"{'conc':>5} {'endpoint':<11} {'req':>7} {'req/s':>9} {'err%':>6} {'rej':>5} "
+              f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    lines = [header]
+    for step in results:
+        rows = [('total', step['total'])] + sorted(step['endpoints'].items())
+        for name, row in rows:
+            lines.append(f"{step['concurrency']:>5} {name:<11} {row['requests']:>7} {row['throughput']:>9} "
+                         f"{row['error_rate'] * 100:>6.2f} {row['rejected']:>5} {row['p50_ms']!s:>9} "
+                         f"{row['p95_ms']!s:>9} {row['p99_ms']!s:>9}")
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadgen",
+                                     description="Drive the classifier API and report latency percentiles")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="base URL of a running API, e.g. http://localhost:8000")
+    target.add_argument("--in-process", action="store_true",
+                        help="serve main.app in this process (SQLite, synthetic corpus) - no network")
+    parser.add_argument("--prefix", default="/api/v1", help="API prefix (--url only)")
+    parser.add_argument("--mix", default="classify=8,feedback=1,categories=1",
+                        help=f"endpoint weights, any of: {', '.join(ENDPOINTS)}")
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    parser.add_argument("--ramp", help="comma-separated concurrency steps (overrides --concurrency)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds per step")
+    parser.add_argument("-n", "--requests", type=int, help="stop each step after this many requests")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--documents", type=int, default=2000, help="synthetic documents (texts and labels)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write results as JSON ('-' for stdout only)")
+    return parser
+
+
+async def _main(args, mix, steps):
+    documents = list(SyntheticCorpus(args.seed).generate(args.documents))
+    limits = httpx.Limits(max_connections=max(steps), max_keepalive_connections=max(steps))
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+            return await run_ramp(client, args.prefix, mix, documents, steps, args.duration, args.requests,
+                                  args.seed)
+
+    from .suite import in_process_api
+    with tempfile.TemporaryDirectory(prefix='loadgen-') as directory:
+        with in_process_api(documents, directory) as (app, prefix):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://loadgen",
+                                         timeout=args.timeout, limits=limits) as client:
+                return await run_ramp(client, prefix, mix, documents, steps, args.duration, args.requests,
+                                      args.seed)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if httpx is None:
+        print("httpx is required: pip install -r benchmarks/requirements.txt", file=sys.stderr)
+        return 2
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    steps = [int(step) for step in args.ramp.split(",")] if args.ramp else [args.concurrency]
+
+    results = asyncio.run(_main(args, mix, steps))
+    if args.json == "-":
+        print(json.dumps(results, indent=2))
+        return 0
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
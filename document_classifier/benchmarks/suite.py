@@ -0,0 +1,428 @@
+# benchmarks/suite.py
+"""Powtarzalny zestaw benchmarków na syntetycznym korpusie (offline, SQLite zamiast PostgreSQL).
+
+Dla każdego rozmiaru korpusu mierzy: generowanie korpusu, trening wsadowy (fit),
+douczanie (learn), predykcję pojedynczą i wsadową, zapis i zapytania bazy oraz
+opóźnienia API (in-process, TestClient). Raz na przebieg (imports) mierzy też
+zimny start: import modułów i budowę serwisu w świeżym interpreterze. Wynik to
+JSON z metadanymi (commit, wersje bibliotek), więc przebiegi z różnych commitów
+da się porównać:
+
+    python -m benchmarks.suite --sizes 1k,10k --output before.json
+    python -m benchmarks.suite --sizes 1k,10k --output after.json
+    python -m benchmarks.suite --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from core.classifier import ClassificationEngine
+from core.database import DatabaseManager
+from core.features import vectorizer_config
+
+from .corpus import SyntheticCorpus
+
+BENCHMARKS = ('generate', 'fit', 'learn', 'predict', 'predict_batch', 'db', 'api', 'imports')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Zimny start - każdy pomiar w nowym interpreterze (python -X importtime), katalog roboczy ROOT
+STARTUP_TARGETS = {
+    'document_service': "import core.document_service",
+    'cli': "import cli",
+    'database_pg': "from core.database_pg import DatabaseManager\nDatabaseManager()",
+    'service': ("import sys\n"
+                "from core.database import DatabaseManager\n"
+                "from core.document_service import DocumentService\n"
+                "DocumentService(db=DatabaseManager(sys.argv[1]))"),
+    # Domyślny serwis (PostgreSQL): konstrukcja bez połączenia - synchronizacja indeksu czeka na warm_up()
+    'service_pg': ("from core.document_service import DocumentService\n"
+                   "DocumentService()"),
+}
+# Importy, które powinny czekać na pierwsze użycie (model, baza)
+HEAVY_MODULES = ('sklearn', 'scipy', 'joblib', 'psycopg2')
+
+
+def parse_size(value):
+    """1000, 10k, 1M -> liczba dokumentów"""
+    value = value.strip().lower()
+    multiplier = {'k': 1000, 'm': 1000000}.get(value[-1:], 1)
+    return int(float(value.rstrip('km')) * multiplier)
+
+
+def latency_stats(seconds):
+    """p50/p95/p99 w ms i operacje na sekundę z listy czasów pojedynczych operacji"""
+    seconds = np.asarray(seconds, dtype=np.float64)
+    return {
+        'count': int(len(seconds)),
+        'p50_ms': round(float(np.percentile(seconds, 50)) * 1000, 4),
+        'p95_ms': round(float(np.percentile(seconds, 95)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(seconds, 99)) * 1000, 4),
+        'ops_per_second': round(len(seconds) / float(seconds.sum()), 1) if seconds.sum() else None,
+    }
+
+
+def _timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def bench_generate(size, seed):
+    started = time.perf_counter()
+    documents = list(SyntheticCorpus(seed).generate(size))
+    seconds = time.perf_counter() - started
+    return documents, {'seconds': round(seconds, 4), 'docs_per_second': round(size / seconds, 1)}
+
+
+def bench_fit(documents, features, engine=None):
+    model = ClassificationEngine(features, engine=engine)
+    started = time.perf_counter()
+    model.fit([text for text, _, _ in documents], [area for _, area, _ in documents])
+    seconds = time.perf_counter() - started
+    return model, {'seconds': round(seconds, 4), 'docs_per_second': round(len(documents) / seconds, 1)}
+
+
+def bench_learn(documents, features, engine=None, base=2000, steps=20):
+    """learn() przelicza model na całym korpusie w pamięci - koszt rośnie z base"""
+    base = min(base, len(documents) - steps)
+    model = ClassificationEngine(features, engine=engine)
+    model.fit([text for text, _, _ in documents[:base]], [area for _, area, _ in documents[:base]])
+    timings = []
+    for text, area, _ in documents[base:base + steps]:
+        started = time.perf_counter()
+        model.learn(text, area)
+        timings.append(time.perf_counter() - started)
+    return dict(latency_stats(timings), base_documents=base)
+
+
+def bench_predict(model, texts, samples=2000):
+    texts = [texts[i % len(texts)] for i in range(samples)]
+    for text in texts[:50]:
+        model.predict(text)
+    timings = []
+    for text in texts:
+        started = time.perf_counter()
+        model.predict(text)
+        timings.append(time.perf_counter() - started)
+    result = dict(latency_stats(timings), inference_kernel=model.kernel() is not None)
+    if result['inference_kernel']:
+        # Punkt odniesienia: ta sama predykcja przez sklearn (transform + predict + predict_proba)
+        baseline = []
+        for text in texts[:500]:
+            started = time.perf_counter()
+            X = model.vectorizer.transform([text])
+            model.model.predict(X)
+            model.model.predict_proba(X)
+            baseline.append(time.perf_counter() - started)
+        result['sklearn_p50_ms'] = round(float(np.percentile(baseline, 50)) * 1000, 4)
+        result['kernel_speedup'] = round(result['sklearn_p50_ms'] / result['p50_ms'], 1) if result['p50_ms'] else None
+    return result
+
+
+def bench_predict_batch(model, texts, batch_size=1000):
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        model.predict_batch(texts[start:start + batch_size])
+    seconds = time.perf_counter() - started
+    return {'seconds': round(seconds, 4), 'docs_per_second': round(len(texts) / seconds, 1),
+            'batch_size': batch_size}
+
+
+def bench_db(documents, path, batch_size=1000, repeat=20):
+    """Zapis paczkami (save_documents) i typowe zapytania dashboardu/eksportu"""
+    db = DatabaseManager(path)
+    started = time.perf_counter()
+    for start in range(0, len(documents), batch_size):
+        db.save_documents(documents[start:start + batch_size])
+    insert_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scanned = sum(1 for _ in db.iter_documents(batch_size=5000))
+    scan_seconds = time.perf_counter() - started
+    return db, {
+        'insert': {'seconds': round(insert_seconds, 4),
+                   'docs_per_second': round(len(documents) / insert_seconds, 1), 'batch_size': batch_size},
+        'scan': {'seconds': round(scan_seconds, 4), 'docs_per_second': round(scanned / scan_seconds, 1)},
+        'count_documents': latency_stats(_timed(db.count_documents, repeat)),
+        'category_counts': latency_stats(_timed(db.get_category_counts, repeat)),
+        'recent_documents': latency_stats(_timed(lambda: db.get_recent_documents(10), repeat)),
+        'daily_counts': latency_stats(_timed(db.get_daily_counts, repeat)),
+    }
+
+
+@contextmanager
+def in_process_api(documents, directory, model=None, features=None):
+    """Aplikacja API (main.app) z serwisem na SQLite w directory, w trybie auto; daje (app, prefix).
+
+    Model: podany albo trenowany na documents. Startup aplikacji nie jest
+    uruchamiany - budowałby własny serwis (PostgreSQL) obok podmienionego.
+    """
+    paths = {'MODEL_STORE_DIR': os.path.join(directory, 'models'),
+             'NEAR_DUPLICATES_INDEX': os.path.join(directory, 'near_duplicates.db')}
+    saved = {name: os.environ.get(name) for name in paths}
+    os.environ.update(paths)
+    api_root = os.path.join(ROOT, 'api')
+    if api_root not in sys.path:
+        sys.path.insert(0, api_root)
+    import dependencies
+    import main
+    from core.document_service import DocumentService
+
+    try:
+        db = DatabaseManager(os.path.join(directory, 'api.db'))
+        db.save_documents(documents)
+        service = DocumentService(db=db)
+        service.duplicates.sync(db)  # czeka na indeksowanie w tle - nie konkuruje z pomiarem
+        if model is None:
+            model = bench_fit(documents, features)[0]
+        service.classifier = ClassificationEngine.from_state(model.export_state(), model.export_corpus())
+        service.publish_model()
+        service.set_mode('auto')
+        main.app.dependency_overrides[dependencies.get_document_service] = lambda: service
+        yield main.app, main.settings.api_prefix
+    finally:
+        main.app.dependency_overrides.clear()
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def bench_api(documents, model, directory, requests=300, feedback_requests=10):
+    """Opóźnienia endpointów w procesie (TestClient) - bez sieci, z pełnym stosem middleware"""
+    from fastapi.testclient import TestClient
+
+    texts = [text for text, _, _ in documents]
+
+    def measure(call, count):
+        timings = []
+        for i in range(count):
+            started = time.perf_counter()
+            response = call(i)
+            timings.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"{response.request.url} -> {response.status_code}: {response.text[:200]}")
+        return latency_stats(timings)
+
+    with in_process_api(documents, directory, model) as (app, prefix):
+        client = TestClient(app)
+        return {
+            'classify': measure(lambda i: client.post(f"{prefix}/classify/",
+                                                      json={'text': texts[i % len(texts)]}), requests),
+            'categories': measure(lambda i: client.get(f"{prefix}/classify/categories"), requests // 3),
+            'feedback': measure(lambda i: client.post(f"{prefix}/classify/feedback", json={
+                'text': texts[-(i + 1)], 'area': documents[-(i + 1)][1]}), feedback_requests),
+        }
+
+
+def _import_times(stderr):
+    """({moduł: skumulowany czas importu w ms}, suma dla modułów najwyższego poziomu) z -X importtime"""
+    times, total = {}, 0.0
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative) / 1000
+        if not name[1:].startswith(' '):  # bez wcięcia - import wprost, nie zależność innego modułu
+            total += int(cumulative) / 1000
+    return times, total
+
+
+def bench_startup(directory, repeat=5):
+    """Zimny start celów STARTUP_TARGETS: czas procesu, czas importów i załadowane ciężkie moduły"""
+    env = dict(os.environ, MODEL_STORE_DIR=os.path.join(directory, 'models'),
+               NEAR_DUPLICATES_INDEX=os.path.join(directory, 'near_duplicates.db'))
+    database = os.path.join(directory, 'startup.db')
+    results = {}
+    for name, code in STARTUP_TARGETS.items():
+        walls, imports = [], []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            process = subprocess.run([sys.executable, '-X', 'importtime', '-c', code, database], cwd=ROOT,
+                                     env=env, capture_output=True, text=True, timeout=120)
+            walls.append(time.perf_counter() - started)
+            if process.returncode != 0:
+                raise RuntimeError(f"startup target {name} failed:\n{process.stderr[-2000:]}")
+            times, total = _import_times(process.stderr)
+            imports.append(total)
+        results[name] = {
+            'wall_ms': round(float(np.median(walls)) * 1000, 1),
+            'import_ms': round(float(np.median(imports)), 1),
+            'heavy_modules': [module for module in HEAVY_MODULES if module in times],
+        }
+    return results
+
+
+def run_size(size, args, features):
+    result = {'size': size}
+    only = set(args.only)
+    documents, result['generate'] = bench_generate(size, args.seed)
+    texts = [text for text, _, _ in documents]
+    model = None
+    if only & {'fit', 'predict', 'predict_batch', 'api'}:
+        model, fit = bench_fit(documents, features, args.engine)
+        if 'fit' in only:
+            result['fit'] = fit
+    if 'learn' in only:
+        result['learn'] = bench_learn(documents, features, args.engine, base=args.learn_base)
+    if 'predict' in only:
+        result['predict'] = bench_predict(model, texts, args.predict_samples)
+    if 'predict_batch' in only:
+        result['predict_batch'] = bench_predict_batch(model, texts)
+    with tempfile.TemporaryDirectory(prefix='bench-') as directory:
+        if 'db' in only:
+            result['db'] = bench_db(documents, os.path.join(directory, 'classifier.db'))[1]
+        if 'api' in only:
+            api_documents = documents[:args.api_documents]
+            api_model = model if len(api_documents) == len(documents) else bench_fit(api_documents, features,
+                                                                                   args.engine)[0]
+            result['api'] = dict(bench_api(api_documents, api_model, directory), documents=len(api_documents))
+    return result
+
+
+def metadata(args, features):
+    def git(*command):
+        try:
+            return subprocess.run(['git', *command], cwd=ROOT, capture_output=True, text=True,
+                                  timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    import scipy
+    import sklearn
+    return {
+        'commit': git('rev-parse', 'HEAD') or None,
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': {'numpy': np.__version__, 'scipy': scipy.__version__, 'sklearn': sklearn.__version__},
+        'seed': args.seed,
+        'engine': ClassificationEngine(features, engine=args.engine).engine,
+        'features': features,
+    }
+
+
+def _flatten(prefix, value, out):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else key, item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+    return out
+
+
+def _direction(metric):
+    """+1 gdy większe znaczy lepsze, -1 gdy mniejsze, 0 dla metryk opisowych"""
+    if metric.endswith('per_second'):
+        return 1
+    if metric.endswith('_ms') or metric.endswith('seconds'):
+        return -1
+    return 0
+
+
+def _comparable(before, after):
+    """Pary (etykieta, przed, po): wyniki tego samego rozmiaru i pomiar zimnego startu"""
+    old_sizes = {str(entry['size']): entry for entry in before['results']}
+    for entry in after['results']:
+        old = old_sizes.get(str(entry['size']))
+        if old is not None:
+            yield entry['size'], old, entry
+    if before.get('startup') and after.get('startup'):
+        yield 'startup', before['startup'], after['startup']
+
+
+def compare(before, after, tolerance=0.1):
+    """[(metryka, przed, po, zmiana względna, regresja?)] dla metryk wspólnych obu przebiegów"""
+    rows = []
+    for label, old, entry in _comparable(before, after):
+        old_metrics, new_metrics = _flatten('', old, {}), _flatten('', entry, {})
+        for metric, new_value in new_metrics.items():
+            direction = _direction(metric)
+            old_value = old_metrics.get(metric)
+            if not direction or not old_value:
+                continue
+            change = (new_value - old_value) / old_value
+            rows.append((f"{label}:{metric}", old_value, new_value, change,
+                         change * direction < -tolerance))
+    return rows
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite",
+                                     description="Benchmark the classifier on synthetic corpora")
+    parser.add_argument("--sizes", default="1k,10k", help="comma-separated corpus sizes, e.g. 1k,10k,100k,1M")
+    parser.add_argument("--only", default=",".join(BENCHMARKS),
+                        help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--engine", help="override CLASSIFIER_ENGINE")
+    parser.add_argument("--vectorizer", choices=["tfidf", "hashing"], help="override CLASSIFIER_VECTORIZER")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--predict-samples", type=int, default=2000)
+    parser.add_argument("--learn-base", type=int, default=2000, help="corpus size learn() retrains on")
+    parser.add_argument("--api-documents", type=int, default=5000, help="documents behind the API benchmark")
+    parser.add_argument("--startup-repeat", type=int, default=5, help="fresh interpreters per startup target")
+    parser.add_argument("-o", "--output", help="write JSON results here (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="relative slowdown reported as a regression (with --compare)")
+    return parser
+
+
+def run_compare(args):
+    with open(args.compare[0]) as f:
+        before = json.load(f)
+    with open(args.compare[1]) as f:
+        after = json.load(f)
+    rows = compare(before, after, args.tolerance)
+    print(f"{(before['meta'].get('commit') or '?')[:10]} -> {(after['meta'].get('commit') or '?')[:10]}")
+    for metric, old, new, change, regression in rows:
+        print(f"{'REGRESSION ' if regression else '           '}{metric:<45} {old:>12} -> {new:>12}  {change:+.1%}")
+    return 1 if any(row[4] for row in rows) else 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.compare:
+        return run_compare(args)
+
+    args.only = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in args.only if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)} (choose from {', '.join(BENCHMARKS)})", file=sys.stderr)
+        return 2
+    features = vectorizer_config(**({'vectorizer': args.vectorizer} if args.vectorizer else {}))
+    report = {'meta': metadata(args, features), 'results': []}
+    if 'imports' in args.only:
+        print("... cold start", file=sys.stderr)
+        with tempfile.TemporaryDirectory(prefix='bench-startup-') as directory:
+            report['startup'] = bench_startup(directory, args.startup_repeat)
+    for size in (parse_size(value) for value in args.sizes.split(",")):
+        print(f"... {size} documents", file=sys.stderr)
+        report['results'].append(run_size(size, args, features))
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
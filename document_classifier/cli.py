@@ -0,0 +1,154 @@
+# cli.py
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+
+def open_database(args):
+    """SQLite (--sqlite PATH) albo PostgreSQL skonfigurowany przez DB_* w środowisku"""
+    if args.sqlite:
+        from core.database import DatabaseManager
+        return DatabaseManager(args.sqlite)
+    from core.database_pg import DatabaseManager
+    return DatabaseManager()
+
+
+def cmd_export(args):
+    """Eksport korpusu strumieniem z kursora - pamięć nie zależy od rozmiaru bazy"""
+    from core.export import available_formats, export_documents
+
+    if args.format not in available_formats():
+        print(f"Format '{args.format}' unavailable (available: {', '.join(available_formats())})",
+              file=sys.stderr)
+        return 2
+
+    db = open_database(args)
+    chunks = export_documents(db, args.format, area=args.area, subarea=args.subarea,
+                              date_from=args.date_from, date_to=args.date_to,
+                              batch_size=args.batch_size)
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+    return 0
+
+
+def cmd_classify(args):
+    """Klasyfikacja offline ze stdin, plików i katalogów - opublikowany model, bez HTTP i bazy"""
+    from core.batch_classify import classify_documents, iter_documents, model_store_for, write_results
+
+    workers = args.workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    try:
+        store = model_store_for(args.model_dir, args.system_id)
+        results = classify_documents(iter_documents(args.paths, args.input, args.pattern), store,
+                                     version=args.model_version, workers=workers,
+                                     batch_size=args.batch_size)
+        out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+        try:
+            count = write_results(results, out, args.format)
+        finally:
+            if args.output:
+                out.close()
+            else:
+                out.flush()
+    except (ValueError, OSError) as e:
+        print(f"classify: {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+    print(f"Classified {count} documents in {elapsed:.2f}s ({count / elapsed:.0f} docs/s, {workers} workers)",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_import_labels(args):
+    """Import oznaczonych dokumentów (CSV albo NDJSON) paczkami, opcjonalnie z retreningiem"""
+    from core.csv_import import import_csv, import_ndjson
+
+    input_format = args.format
+    if input_format is None:
+        input_format = 'ndjson' if args.path.endswith(('.ndjson', '.jsonl')) else 'csv'
+    importer = import_ndjson if input_format == 'ndjson' else import_csv
+
+    db = open_database(args)
+    stream = sys.stdin.buffer if args.path == '-' else open(args.path, 'rb')
+    try:
+        result = importer(stream, db, batch_size=args.batch_size)
+    finally:
+        if args.path != '-':
+            stream.close()
+    print(result['message'], file=sys.stderr)
+    for error in result['errors']:
+        print(f"  {error}", file=sys.stderr)
+    if not result['success']:
+        return 1
+
+    if args.retrain:
+        from core.document_service import DocumentService
+        training = DocumentService(db=db).retrain_from_database()
+        print(training['message'], file=sys.stderr)
+        if not training['success']:
+            return 1
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Document Classifier command line tools")
+    parser.add_argument("--sqlite", metavar="PATH",
+                        help="use a local SQLite database instead of PostgreSQL (DB_* env vars)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="stream labelled documents as csv, ndjson or parquet")
+    export.add_argument("-f", "--format", default="csv", choices=["csv", "ndjson", "parquet"])
+    export.add_argument("-o", "--output", help="output file (default: stdout)")
+    export.add_argument("--area")
+    export.add_argument("--subarea")
+    export.add_argument("--from", dest="date_from", type=date.fromisoformat, metavar="YYYY-MM-DD")
+    export.add_argument("--to", dest="date_to", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                        help="inclusive")
+    export.add_argument("--batch-size", type=int, default=1000)
+    export.set_defaults(handler=cmd_export)
+
+    classify = commands.add_parser("classify", help="classify documents from stdin, files or directories")
+    classify.add_argument("paths", nargs="*", metavar="PATH",
+                          help="files or directories (recursive); '-' or nothing reads stdin")
+    classify.add_argument("--input", default="auto", choices=["auto", "file", "line", "ndjson"],
+                          help="file: one document per file, line: one per line, ndjson: {\"text\", \"id\"} "
+                               "per line (default: file for paths, line for stdin)")
+    classify.add_argument("--pattern", default="*", help="file name pattern inside directories, e.g. '*.txt'")
+    classify.add_argument("-f", "--format", default="ndjson", choices=["ndjson", "csv"])
+    classify.add_argument("-o", "--output", help="output file (default: stdout)")
+    classify.add_argument("-w", "--workers", type=int, default=1,
+                          help="worker processes; 0 uses every core (default: 1, batched in-process)")
+    classify.add_argument("--batch-size", type=int, default=512, help="documents per predict_batch call")
+    classify.add_argument("--model-dir", help="model store directory (default: MODEL_STORE_DIR or data/models)")
+    classify.add_argument("--model-version", type=int, help="published version (default: latest)")
+    classify.add_argument("--system-id", help="use this system's own model")
+    classify.set_defaults(handler=cmd_classify)
+
+    labels = commands.add_parser("import-labels", help="bulk-import labelled documents from CSV or NDJSON")
+    labels.add_argument("path", nargs="?", default="-",
+                        help="CSV with text,area[,subarea] columns or NDJSON objects; '-' reads stdin")
+    labels.add_argument("-f", "--format", choices=["csv", "ndjson"],
+                        help="input format (default: from the extension, csv for stdin)")
+    labels.add_argument("--batch-size", type=int, default=1000)
+    labels.add_argument("--retrain", action="store_true", help="retrain and publish the model afterwards")
+    labels.set_defaults(handler=cmd_import_labels)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
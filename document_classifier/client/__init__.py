@@ -0,0 +1,11 @@
+# client/__init__.py
+"""Klient Python dla API klasyfikatora dokumentów (synchroniczny i asyncio).
+
+Pula połączeń keep-alive, limity czasu, ponowienia z backoffem (Retry-After
+z admission control) i paczki na POST /classify/batch.
+"""
+from .aio import AsyncClassifierClient
+from .base import ClassifierError, RetryPolicy
+from .sync import ClassifierClient
+
+__all__ = ["AsyncClassifierClient", "ClassifierClient", "ClassifierError", "RetryPolicy"]
\ No newline at end of file
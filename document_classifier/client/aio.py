@@ -0,0 +1,159 @@
+# client/aio.py
+import asyncio
+
+import httpx
+
+from .base import BaseClient, ClassifierError, chunked
+
+
+class _Batcher:
+    """Łączy współbieżne classify() w paczki dla POST /classify/batch.
+
+    Teksty z tym samym (system_id, próg) czekają najwyżej max_delay sekund albo
+    do zebrania max_batch sztuk; każde wywołanie dostaje swój wynik z paczki.
+    Paczka odrzucona walidacją (422) jest wysyłana ponownie tekst po tekście,
+    więc błąd dostaje tylko wywołanie z niepoprawnym tekstem.
+    """
+
+    def __init__(self, client, max_batch, max_delay):
+        self.client = client
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending = {}  # (system_id, próg) -> [(tekst, future)]
+        self._timers = {}
+        self._tasks = set()
+
+    def submit(self, text, key):
+        future = asyncio.get_running_loop().create_future()
+        queue = self._pending.setdefault(key, [])
+        queue.append((text, future))
+        if len(queue) >= self.max_batch:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.max_delay, self._flush, key)
+        return future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        queue = self._pending.pop(key, None)
+        if queue:
+            task = asyncio.ensure_future(self._send(key, queue))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key, queue):
+        system_id, confidence_threshold = key
+        try:
+            response = await self.client._call(
+                "POST", "/classify/batch",
+                self.client._batch_payload([text for text, _ in queue], confidence_threshold, system_id))
+        except ClassifierError as e:
+            if len(queue) > 1 and e.status_code == 422:
+                # Walidacja tekstu: paczki jednoelementowe (ten sam kształt wyniku), błąd tylko dla winnego.
+                # Inne odrzucenia (tryb learning, autoryzacja) dotyczą wszystkich - bez rozbijania
+                await asyncio.gather(*(self._send(key, [item]) for item in queue))
+            else:
+                self._fail(queue, e)
+            return
+        except Exception as e:
+            self._fail(queue, e)
+            return
+        for (_, future), result in zip(queue, response["results"]):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _fail(queue, error):
+        for _, future in queue:
+            if not future.done():
+                future.set_exception(error)
+
+    async def drain(self):
+        for key in list(self._pending):
+            self._flush(key)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class AsyncClassifierClient(BaseClient):
+    """Asynchroniczny klient API (asyncio) z pulą połączeń, ponowieniami i automatycznym batchowaniem.
+
+    Przy auto_batch=True (domyślnie) classify() z wielu korutyn jest łączone w
+    paczki po najwyżej batch_size tekstów, wysyłane po max_delay sekundach -
+    kilkaset równoległych wywołań to kilka żądań HTTP zamiast kilkuset.
+    Z auto_batch=True classify() zwraca element wyniku paczki ({area,
+    confidence, suggestions, metadata}); context nie jest wtedy przesyłany.
+
+        async with AsyncClassifierClient("http://classifier:8000") as client:
+            results = await asyncio.gather(*(client.classify(text) for text in texts))
+    """
+
+    def __init__(self, base_url="http://localhost:8000", auto_batch=True, max_delay=0.005,
+                 transport=None, **options):
+        super().__init__(base_url, **options)
+        self._http = httpx.AsyncClient(
+            base_url=self.base_url + self.api_prefix,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            headers=self.headers,
+            transport=transport,
+        )
+        self._batcher = _Batcher(self, self.batch_size, max_delay) if auto_batch else None
+
+    async def _call(self, method, path, payload=None, idempotent=True):
+        attempt = 0
+        while True:
+            try:
+                response = await self._http.request(method, path, json=payload)
+            except httpx.TransportError as e:
+                if not self.retry.should_retry(attempt, None, idempotent, isinstance(e, httpx.ConnectError)):
+                    raise ClassifierError(f"{path} failed: {e!r}") from e
+                await asyncio.sleep(self.retry.delay(attempt))
+            else:
+                if response.status_code < 400 or not self.retry.should_retry(
+                        attempt, response.status_code, idempotent):
+                    return self._result(response, path)
+                await asyncio.sleep(self.retry.delay(attempt, response.headers.get("retry-after")))
+            attempt += 1
+
+    async def classify(self, text, confidence_threshold=None, context=None, system_id=None):
+        """Klasyfikacja jednego tekstu - przez paczkę (auto_batch) albo POST /classify/"""
+        if self._batcher is not None and not context:
+            self._check_text(text)
+            return await self._batcher.submit(text, (system_id or self.system_id, confidence_threshold))
+        return await self._call("POST", "/classify/",
+                                self._classify_payload(text, confidence_threshold, context, system_id))
+
+    async def classify_many(self, texts, confidence_threshold=None, system_id=None):
+        """Wyniki dla wielu tekstów w tej samej kolejności; paczki wysyłane równolegle"""
+        responses = await asyncio.gather(*(
+            self._call("POST", "/classify/batch", self._batch_payload(chunk, confidence_threshold, system_id))
+            for chunk in chunked(list(texts), self.batch_size)
+        ))
+        return [result for response in responses for result in response["results"]]
+
+    async def feedback(self, text, area, subarea=None, predicted_area=None, user_id=None, system_id=None):
+        """Poprawna etykieta dla tekstu (POST /classify/feedback) - ponawiane tylko po odrzuceniu"""
+        return await self._call("POST", "/classify/feedback",
+                                self._feedback_payload(text, area, subarea, predicted_area, user_id, system_id),
+                                idempotent=False)
+
+    async def categories(self):
+        return await self._call("GET", "/classify/categories")
+
+    async def health(self):
+        return await self._call("GET", "/health/")
+
+    async def aclose(self):
+        """Wysyła oczekujące paczki i zamyka pulę połączeń"""
+        if self._batcher is not None:
+            await self._batcher.drain()
+        await self._http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
\ No newline at end of file
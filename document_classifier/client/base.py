@@ -0,0 +1,122 @@
+# client/base.py
+import random
+
+# Odpowiedzi, po których warto ponowić: przeciążenie (admission control) i błędy bramki
+RETRY_STATUSES = (429, 502, 503, 504)
+# Żądanie nieidempotentne (feedback zapisuje dokument) ponawiamy tylko, gdy serwer
+# na pewno go nie przetworzył - odrzucenie przez admission control
+REJECTED_STATUSES = (429, 503)
+MAX_BATCH = 1000  # limit POST /classify/batch
+MAX_TEXT_LENGTH = 10000  # limit długości tekstu w API
+
+
+class ClassifierError(Exception):
+    """Błąd wywołania API: status HTTP (None przy błędzie sieci) i komunikat serwera"""
+
+    def __init__(self, message, status_code=None, response=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+
+
+class RetryPolicy:
+    """Ponowienia z wykładniczym backoffem i losowym rozrzutem (full jitter).
+
+    Retry-After z odpowiedzi 429/503 ma pierwszeństwo przed backoffem, ale
+    nie dłużej niż max_backoff - klient nie zawiesza się na minuty.
+    """
+
+    def __init__(self, attempts=3, backoff=0.2, max_backoff=5.0, statuses=RETRY_STATUSES):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = tuple(statuses)
+
+    def should_retry(self, attempt, status_code=None, idempotent=True, connect_error=False):
+        """Czy po próbie attempt (od 0) ponowić; status_code None = błąd sieci"""
+        if attempt + 1 >= self.attempts:
+            return False
+        if status_code is None:
+            return idempotent or connect_error
+        if not idempotent:
+            return status_code in REJECTED_STATUSES
+        return status_code in self.statuses
+
+    def delay(self, attempt, retry_after=None):
+        """Sekundy przed kolejną próbą"""
+        if retry_after is not None:
+            try:
+                return min(max(float(retry_after), 0.0), self.max_backoff)
+            except ValueError:
+                pass  # Retry-After jako data HTTP - zwykły backoff
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+NO_RETRIES = RetryPolicy(attempts=1)
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class BaseClient:
+    """Wspólna część klienta synchronicznego i asynchronicznego: adresy, treści żądań, błędy"""
+
+    def __init__(self, base_url="http://localhost:8000", api_prefix="/api/v1", system_id=None,
+                 timeout=10.0, connect_timeout=3.0, retry=None, pool_size=10, batch_size=100,
+                 headers=None):
+        if not 1 <= batch_size <= MAX_BATCH:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH}")
+        self.base_url = base_url.rstrip("/")
+        self.api_prefix = api_prefix.rstrip("/")
+        self.system_id = system_id
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retry = retry or RetryPolicy()
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.headers = {"User-Agent": "document-classifier-client/1.0", **(headers or {})}
+
+    def _classify_payload(self, text, confidence_threshold=None, context=None, system_id=None):
+        payload = {"text": text, "context": context or {}}
+        if confidence_threshold is not None:
+            payload["confidence_threshold"] = confidence_threshold
+        if system_id or self.system_id:
+            payload["system_id"] = system_id or self.system_id
+        return payload
+
+    @staticmethod
+    def _check_text(text):
+        """Ta sama walidacja co w API (422) - zanim tekst trafi do paczki z cudzymi tekstami"""
+        if not isinstance(text, str) or not 1 <= len(text) <= MAX_TEXT_LENGTH:
+            length = len(text) if isinstance(text, str) else type(text).__name__
+            raise ClassifierError(f"text must be a string of 1 to {MAX_TEXT_LENGTH} characters (got {length})",
+                                  status_code=422)
+
+    def _batch_payload(self, texts, confidence_threshold=None, system_id=None):
+        payload = {"texts": list(texts)}
+        if confidence_threshold is not None:
+            payload["confidence_threshold"] = confidence_threshold
+        if system_id or self.system_id:
+            payload["system_id"] = system_id or self.system_id
+        return payload
+
+    def _feedback_payload(self, text, area, subarea=None, predicted_area=None, user_id=None, system_id=None):
+        payload = {"text": text, "area": area, "subarea": subarea, "predicted_area": predicted_area,
+                   "user_id": user_id}
+        if system_id or self.system_id:
+            payload["system_id"] = system_id or self.system_id
+        return {key: value for key, value in payload.items() if value is not None}
+
+    @staticmethod
+    def _result(response, path):
+        """JSON odpowiedzi albo ClassifierError ze szczegółem z API (pole detail)"""
+        if response.status_code < 400:
+            return response.json()
+        try:
+            detail = response.json().get("detail", response.text)
+        except ValueError:
+            detail = response.text
+        raise ClassifierError(f"{path} failed with HTTP {response.status_code}: {detail}",
+                              status_code=response.status_code, response=response)
\ No newline at end of file
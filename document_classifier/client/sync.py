@@ -0,0 +1,79 @@
+# client/sync.py
+import time
+
+import httpx
+
+from .base import BaseClient, ClassifierError, chunked
+
+
+class ClassifierClient(BaseClient):
+    """Klient API z pulą połączeń keep-alive, ponowieniami i limitami czasu.
+
+    Jedna instancja na proces (jest bezpieczna wątkowo) - połączenia TCP są
+    używane ponownie zamiast otwierane na każde wywołanie. classify_many
+    wysyła teksty paczkami po batch_size na POST /classify/batch.
+
+        with ClassifierClient("http://classifier:8000", system_id="fasttrack") as client:
+            client.classify("Invoice #12345 from ABC Company")
+    """
+
+    def __init__(self, base_url="http://localhost:8000", transport=None, **options):
+        super().__init__(base_url, **options)
+        self._http = httpx.Client(
+            base_url=self.base_url + self.api_prefix,
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            headers=self.headers,
+            transport=transport,
+        )
+
+    def _call(self, method, path, payload=None, idempotent=True):
+        attempt = 0
+        while True:
+            try:
+                response = self._http.request(method, path, json=payload)
+            except httpx.TransportError as e:
+                if not self.retry.should_retry(attempt, None, idempotent, isinstance(e, httpx.ConnectError)):
+                    raise ClassifierError(f"{path} failed: {e!r}") from e
+                time.sleep(self.retry.delay(attempt))
+            else:
+                if response.status_code < 400 or not self.retry.should_retry(
+                        attempt, response.status_code, idempotent):
+                    return self._result(response, path)
+                time.sleep(self.retry.delay(attempt, response.headers.get("retry-after")))
+            attempt += 1
+
+    def classify(self, text, confidence_threshold=None, context=None, system_id=None):
+        """Klasyfikacja jednego tekstu (POST /classify/)"""
+        return self._call("POST", "/classify/",
+                          self._classify_payload(text, confidence_threshold, context, system_id))
+
+    def classify_many(self, texts, confidence_threshold=None, system_id=None):
+        """Wyniki dla wielu tekstów w tej samej kolejności, paczkami po batch_size"""
+        results = []
+        for chunk in chunked(list(texts), self.batch_size):
+            response = self._call("POST", "/classify/batch",
+                                  self._batch_payload(chunk, confidence_threshold, system_id))
+            results.extend(response["results"])
+        return results
+
+    def feedback(self, text, area, subarea=None, predicted_area=None, user_id=None, system_id=None):
+        """Poprawna etykieta dla tekstu (POST /classify/feedback) - ponawiane tylko po odrzuceniu"""
+        return self._call("POST", "/classify/feedback",
+                          self._feedback_payload(text, area, subarea, predicted_area, user_id, system_id),
+                          idempotent=False)
+
+    def categories(self):
+        return self._call("GET", "/classify/categories")
+
+    def health(self):
+        return self._call("GET", "/health/")
+
+    def close(self):
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
\ No newline at end of file
@@ -7,7 +7,7 @@ def show_startup_menu(service):
     print("\n=== STARTUP OPTIONS ===")
     
     # Sprawdź czy już są jakieś dane
-    total_docs = len(service.db.get_all_documents())
+    total_docs = service.db.count_documents()
     if total_docs > 0:
         print(f"Found {total_docs} existing documents in database.")
         choice = input("Continue with existing data? (y/n): ").strip().lower()
@@ -20,12 +20,35 @@ def show_startup_menu(service):
     choice = input("Choose option (1 or 2): ").strip()
     
     if choice == "1":
-        load_starter_data(service.db, service.classifier)
-        print("✓ Starter data loaded! You can now use AUTO mode.")
-        service.set_mode("auto")  # Przełącz na auto mode
+        load_starter_data(service.db)
+        # retrain_from_database przełącza na auto, gdy model umie klasyfikować
+        result = service.retrain_from_database()
+        print(f"✓ Starter data loaded! {result['message']}")
     else:
         print("✓ Starting with empty database in LEARNING mode.")
 
+def label_queue(service):
+    """Oznaczanie dokumentów z puli - zawsze ten, przy którym model jest najmniej pewny"""
+    while True:
+        queue = service.labelling_queue(limit=1)
+        if not queue['documents']:
+            print("✓ Labelling queue is empty.")
+            return
+        doc = queue['documents'][0]
+        print(f"\n📋 Pending: {queue['pending']} (strategy: {queue['strategy']})")
+        print(f"📄 {doc['text'][:300]}")
+        if doc['uncertainty'] is not None:
+            print(f"🤖 Model guess: {doc['predicted_area']} (uncertainty: {doc['uncertainty']:.2f})")
+        area = input("What Area is this? (Enter to skip, 'q' to stop): ").strip()
+        if area.lower() == 'q':
+            return
+        if not area:
+            service.db.set_unlabelled_status(doc['id'], 'skipped')
+            continue
+        subarea = input("SubArea (optional, press Enter to skip): ").strip() or None
+        if service.label_queued(doc['id'], area, subarea):
+            print(f"✓ Learned: '{doc['text'][:50]}...' → {area}")
+
 def main():
     print("=== Document Classifier ===")
     
@@ -39,7 +62,7 @@ def main():
         print(f"Current mode: {service.get_mode().upper()}")
         
         # Reszta kodu bez zmian...
-        print("Commands: 'mode auto', 'mode learning', 'stats', 'quit'")
+        print("Commands: 'mode auto', 'mode learning', 'queue', 'stats', 'quit'")
         text = input("Enter document text (or command): ").strip()
         
         if text.lower() == 'quit':
@@ -50,11 +73,16 @@ def main():
         if text.lower() == 'stats':
             categories = service.db.get_categories()
             unique_areas = len(set(cat[0] for cat in categories))
-            total_docs = len(service.db.get_all_documents())
+            total_docs = service.db.count_documents()
             print(f"📊 Total areas: {unique_areas}, Total documents: {total_docs}")
             print(f"📊 Can predict: {service.classifier.can_predict()}")
             continue
             
+        # Najbardziej niepewne dokumenty z puli do oznaczenia
+        if text.lower() == 'queue':
+            label_queue(service)
+            continue
+            
         # Zmiana trybu
         if text.lower() == 'mode auto':
             if service.classifier.can_predict():
@@ -81,7 +109,7 @@ def main():
                 subarea = subarea if subarea else None
                 
                 service.db.save_document(text, area, subarea)
-                service.classifier.learn(text, area)
+                service.learn(text, area)
                 
                 print(f"✓ Learned: '{text[:50]}...' → {area}")
                 if subarea:
@@ -89,7 +117,7 @@ def main():
                 
                 categories = service.db.get_categories()
                 unique_areas = len(set(cat[0] for cat in categories))
-                total_docs = len(service.db.get_all_documents())
+                total_docs = service.db.count_documents()
                 print(f"✓ Total areas: {unique_areas}, Total documents: {total_docs}")
                 
                 if service.classifier.can_predict():
@@ -109,7 +137,7 @@ def main():
                         correct_area = input("What should it be? ").strip()
                         if correct_area:
                             service.db.save_document(text, correct_area)
-                            service.classifier.learn(text, correct_area)
+                            service.learn(text, correct_area)
                             print(f"✓ Thanks! Learned: {correct_area}")
                 else:
                     print("Unable to classify. Switching to learning mode.")
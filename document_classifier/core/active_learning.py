@@ -0,0 +1,99 @@
+# core/active_learning.py
+import os
+
+import numpy as np
+
+STRATEGIES = ('margin', 'entropy', 'least_confidence')
+
+
+def uncertainty_scores(probabilities, strategy='margin'):
+    """Niepewność modelu per wiersz macierzy prawdopodobieństw (dokumenty x klasy), w skali 0..1.
+
+    margin           - 1 - (p1 - p2): dwie najlepsze klasy prawie remisują
+    entropy          - entropia rozkładu podzielona przez log(liczba klas)
+    least_confidence - 1 - p1
+    """
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    n_classes = probabilities.shape[1]
+    if strategy == 'margin':
+        if n_classes < 2:
+            return np.zeros(len(probabilities))
+        top_two = np.partition(probabilities, n_classes - 2, axis=1)[:, -2:]
+        return 1.0 - (top_two[:, 1] - top_two[:, 0])
+    if strategy == 'entropy':
+        if n_classes < 2:
+            return np.zeros(len(probabilities))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = np.where(probabilities > 0, probabilities * np.log(probabilities), 0.0)
+        return -terms.sum(axis=1) / np.log(n_classes)
+    if strategy == 'least_confidence':
+        return 1.0 - probabilities.max(axis=1)
+    raise ValueError(f"Unknown strategy: {strategy} (choose from {', '.join(STRATEGIES)})")
+
+
+class LabellingQueue:
+    """Pula nieoznaczonych dokumentów uszeregowana wg niepewności modelu.
+
+    Ocena to jedno predict_proba na paczkę batch_size dokumentów. Każda ocena
+    pamięta wersję modelu; po publikacji nowej wersji refresh() przelicza
+    tylko dokumenty z nieaktualną oceną, najwyżej budget na wywołanie -
+    najpierw nieocenione, potem dotychczas najbardziej niepewne - więc kolejka
+    szybko odzwierciedla nowy model, a koszt jednego żądania jest ograniczony.
+    """
+
+    def __init__(self, db, strategy=None, batch_size=500, refresh_budget=None):
+        self.db = db
+        self.strategy = strategy or os.getenv('ACTIVE_LEARNING_STRATEGY', 'margin')
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {self.strategy} (choose from {', '.join(STRATEGIES)})")
+        self.batch_size = batch_size
+        self.refresh_budget = refresh_budget or int(os.getenv('ACTIVE_LEARNING_REFRESH_BUDGET', '2000'))
+
+    def add(self, documents):
+        """Dodaje dokumenty [(text, source)] do puli"""
+        return self.db.add_unlabelled_documents(documents)
+
+    def refresh(self, engine, budget=None):
+        """Przelicza nieaktualne oceny (najwyżej budget dokumentów); zwraca liczbę ocenionych"""
+        if not engine.can_predict():
+            return 0
+        version = engine.model_version or 0
+        budget = self.refresh_budget if budget is None else budget
+        scored = 0
+        while scored < budget:
+            batch = self.db.get_stale_unlabelled(version, limit=min(self.batch_size, budget - scored))
+            if not batch:
+                break
+            classes, probabilities = engine.predict_proba_batch([text for _, text in batch])
+            scores = uncertainty_scores(probabilities, self.strategy)
+            predicted = classes[probabilities.argmax(axis=1)]
+            self.db.update_uncertainty([
+                (round(float(score), 6), str(area), version, doc_id)
+                for (doc_id, _), score, area in zip(batch, scores, predicted)
+            ])
+            scored += len(batch)
+        return scored
+
+    def next(self, engine, limit=10):
+        """Najbardziej niepewne dokumenty po odświeżeniu ocen w ramach budżetu"""
+        scored = self.refresh(engine)
+        pending, stale = self.db.count_unlabelled(engine.model_version or 0)
+        documents = [
+            {
+                'id': doc_id,
+                'text': text,
+                'source': source,
+                'uncertainty': uncertainty,
+                'predicted_area': predicted_area,
+                'model_version': model_version,
+            }
+            for doc_id, text, source, uncertainty, predicted_area, model_version, _ in
+            self.db.get_labelling_queue(limit)
+        ]
+        return {
+            'strategy': self.strategy,
+            'documents': documents,
+            'pending': pending,
+            'stale': stale,
+            'rescored': scored,
+        }
\ No newline at end of file
@@ -0,0 +1,156 @@
+# core/batch_classify.py
+import csv
+import fnmatch
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .model_store import ModelStore
+
+INPUT_MODES = ('auto', 'file', 'line', 'ndjson')
+OUTPUT_FORMATS = ('ndjson', 'csv')
+OUTPUT_FIELDS = ['id', 'area', 'confidence', 'model_version']
+
+# Model trafia do workera raz (initializer) - mapowany z ModelStore, współdzielony przez page cache
+_worker_engine = None
+
+
+def _read_lines(stream, source, mode):
+    """Dokument na linię (pomijane puste) albo obiekt JSON na linię z polem text i opcjonalnym id"""
+    for number, line in enumerate(stream, 1):
+        line = line.rstrip('\r\n')
+        if not line.strip():
+            continue
+        if mode == 'ndjson':
+            record = json.loads(line)
+            if not isinstance(record, dict) or not isinstance(record.get('text'), str):
+                raise ValueError(f"{source}:{number}: expected a JSON object with a text field")
+            yield record.get('id', f"{source}:{number}"), record['text']
+        else:
+            yield f"{source}:{number}", line
+
+
+def _walk(path, pattern):
+    for directory, subdirectories, files in os.walk(path):
+        subdirectories.sort()
+        for name in sorted(files):
+            if fnmatch.fnmatch(name, pattern):
+                yield os.path.join(directory, name)
+
+
+def iter_documents(paths, mode='auto', pattern='*'):
+    """Strumień (id, text) ze stdin ('-'), plików i drzew katalogów - czytany leniwie.
+
+    mode: file   - cały plik to jeden dokument (id = ścieżka); domyślnie dla plików
+          line   - dokument na linię (id = źródło:linia); domyślnie dla stdin
+          ndjson - obiekt JSON na linię z polem text (i opcjonalnym id)
+    Katalogi są przechodzone rekurencyjnie, pliki filtrowane wzorcem pattern.
+    """
+    if mode not in INPUT_MODES:
+        raise ValueError(f"Unknown input mode: {mode} (choose from {', '.join(INPUT_MODES)})")
+    for path in paths or ['-']:
+        if path == '-':
+            yield from _read_lines(sys.stdin, 'stdin', 'line' if mode in ('auto', 'file') else mode)
+            continue
+        files = _walk(path, pattern) if os.path.isdir(path) else [path]
+        for file_path in files:
+            with open(file_path, encoding='utf-8', errors='replace') as f:
+                if mode in ('auto', 'file'):
+                    yield file_path, f.read()
+                else:
+                    yield from _read_lines(f, file_path, mode)
+
+
+def _chunks(documents, batch_size):
+    chunk = []
+    for document in documents:
+        chunk.append(document)
+        if len(chunk) >= batch_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _predict(engine, chunk):
+    """Jedna paczka przez predict_batch - jedna macierz cech zamiast predykcji per dokument"""
+    predictions = engine.predict_batch([text for _, text in chunk])
+    return [
+        {
+            'id': doc_id,
+            'area': prediction['area'] if prediction else None,
+            'confidence': round(prediction['confidence'], 6) if prediction else None,
+            'model_version': engine.model_version,
+        }
+        for (doc_id, _), prediction in zip(chunk, predictions)
+    ]
+
+
+def _init_worker(root, version):
+    global _worker_engine
+    _worker_engine = ModelStore(root).load(version)
+
+
+def _classify_chunk(chunk):
+    return _predict(_worker_engine, chunk)
+
+
+def model_store_for(root=None, system_id=None):
+    """ModelStore modelu domyślnego albo modelu systemu (jak TenantModelRegistry)"""
+    root = root or os.getenv('MODEL_STORE_DIR', 'data/models')
+    if system_id:
+        from .tenant_models import SYSTEM_ID_PATTERN
+        if not SYSTEM_ID_PATTERN.match(system_id):
+            raise ValueError(f"Invalid system_id: {system_id!r}")
+        root = os.path.join(root, 'tenants', system_id)
+    return ModelStore(root)
+
+
+def classify_documents(documents, store, version=None, workers=1, batch_size=512):
+    """Wyniki {id, area, confidence, model_version} w kolejności wejścia, paczkami po batch_size.
+
+    Przy workers > 1 paczki trafiają do puli procesów; w locie jest najwyżej
+    2 x workers paczek, więc pamięć nie zależy od rozmiaru wejścia.
+    """
+    version = version or store.current_version()
+    if version is None:
+        raise ValueError(f"No published model in {store.root}")
+    engine = store.load(version)  # tablice zmapowane - tanie sprawdzenie przed startem puli
+    if not engine.can_predict():
+        raise ValueError(f"Model version {version} cannot predict yet")
+    chunks = _chunks(documents, batch_size)
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _predict(engine, chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(store.root, version)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_classify_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_results(results, out, output_format='ndjson'):
+    """Zapisuje wyniki do strumienia tekstowego (NDJSON albo CSV); zwraca liczbę wierszy"""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format: {output_format} (choose from {', '.join(OUTPUT_FORMATS)})")
+    count = 0
+    if output_format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=OUTPUT_FIELDS, lineterminator='\n')
+        writer.writeheader()
+        for row in results:
+            writer.writerow(row)
+            count += 1
+        return count
+    for row in results:
+        out.write(json.dumps(row, ensure_ascii=False) + '\n')
+        count += 1
+    return count
\ No newline at end of file
@@ -1,27 +1,57 @@
 # core/classifier.py  
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
 import pickle
 import os
 
+import numpy as np
+
+from .engines import build_model, engine_name, supports_counts
+from .features import build_vectorizer, vectorizer_config
+from .inference import InferenceKernel
+from .neighbors import NeighborIndex
+from .parallel_training import fit_hashed_parallel, nb_from_counts
+from .sampling import training_sampler
+
 class ClassificationEngine:
-    def __init__(self):
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-        self.model = MultinomialNB()
+    def __init__(self, features=None, engine=None):
+        # Ekstrakcja cech z CLASSIFIER_* (tfidf/hashing, n-gramy, rozmiar, stop words, dtype)
+        self.features = features or vectorizer_config()
+        self.vectorizer = build_vectorizer(self.features)
+        # Silnik z CLASSIFIER_ENGINE: nb | complement_nb | sgd
+        self.engine = engine_name(engine)
+        self.model = build_model(self.engine)
         self.is_trained = False
         self.categories = set()
         self.training_texts = []
         self.training_labels = []
+        self.model_version = None  # wersja opublikowana w ModelStore
+        self._kernel = None  # szybka ścieżka predykcji, budowana leniwie po treningu
+        self._training_matrix = None  # cechy korpusu z ostatniego treningu - zwalniane po zbudowaniu indeksu sąsiadów
+        self.neighbors = None  # NeighborIndex - budowany przy publikacji (albo leniwie) lub wczytany z ModelStore
+        # Model z fit_parallel: bez korpusu w pamięci, douczany przyrostowo (partial_fit)
+        self.incremental = False
+        self.document_count = 0
+        # Limit dokumentów per klasa (TRAINING_CLASS_CAP) - korpus treningowy to próbka rezerwuarowa
+        self.sampler = training_sampler()
+        self.revision = 0  # rośnie przy każdej zmianie modelu lub korpusu - bez zmiany nie ma czego publikować
     
     def can_predict(self):
         """Sprawdza czy model może już klasyfikować"""
         return self.is_trained and len(self.categories) >= 2
 
     def learn(self, text, area):
-        """Douczanie modelu na nowym przykładzie"""
+        """Douczanie modelu na nowym przykładzie; True, gdy model został przez nie zaktualizowany"""
+        if self.incremental:
+            return self._learn_incremental(text, area)
         self.categories.add(area)
-        self.training_texts.append(text)
-        self.training_labels.append(area)
+        self.document_count += 1
+        if self.sampler is not None:
+            if not self.sampler.offer(text, area):
+                return False  # nie wszedł do próbki - model bez zmian
+            self.training_texts, self.training_labels = self.sampler.sample()
+        else:
+            self.training_texts.append(text)
+            self.training_labels.append(area)
+        self.revision += 1
         
         # Jeśli mamy przynajmniej 2 kategorie, trenuj model
         if len(self.categories) >= 2:
@@ -31,17 +61,123 @@ class ClassificationEngine:
         
         return False
     
+    def fit(self, texts, labels):
+        """Trening od zera na całym korpusie - jedno dopasowanie zamiast learn() per dokument"""
+        if self.sampler is not None:
+            return self.fit_stream(zip(texts, labels))
+        self.training_texts = list(texts)
+        self.training_labels = list(labels)
+        self.categories = set(self.training_labels)
+        self.document_count = len(self.training_texts)
+        return self._fit_training_set()
+
+    def fit_stream(self, documents):
+        """Trening od zera ze strumienia (text, area) albo (text, area, created_at), czytanego raz.
+
+        Z polityką próbkowania w pamięci zostaje tylko próbka (limit per klasa,
+        opcjonalnie z wygaszaniem wg created_at), bez niej - cały strumień.
+        """
+        if self.sampler is None:
+            documents = [tuple(document) for document in documents]
+            return self.fit([document[0] for document in documents], [document[1] for document in documents])
+        self.sampler.reset()
+        self.document_count = self.sampler.extend(documents)
+        self.training_texts, self.training_labels = self.sampler.sample()
+        self.categories = set(self.training_labels)
+        return self._fit_training_set()
+
+    def sampling_report(self):
+        """Liczności korpusu treningowego per klasa (widziane, w próbce, efektywne) albo None bez limitu"""
+        return self.sampler.report() if self.sampler is not None else None
+
+    def _fit_training_set(self):
+        self.revision += 1
+        if len(self.categories) >= 2:
+            self._retrain_model()
+            self.is_trained = True
+        return self.is_trained
+
+    def fit_parallel(self, documents, workers=None, chunk_size=5000):
+        """Trening na haszowanych cechach w puli procesów; liczniki NB z paczek są sumowane.
+
+        documents to iterator (text, area), np. strumień z bazy - czytany raz i nie
+        trzymany w pamięci; kolejne learn() douczają model przyrostowo.
+        Tylko dla silników liczonych z liczników (nb, complement_nb).
+        """
+        if not supports_counts(self.engine):
+            raise ValueError(f"Engine {self.engine} cannot be trained from summed counts; use fit()")
+        vectorizer, model, class_counts = fit_hashed_parallel(
+            documents, self.features, workers=workers, chunk_size=chunk_size,
+            estimator=type(self.model)
+        )
+        self.categories = set(class_counts)
+        self.document_count = sum(class_counts.values())
+        self.training_texts = []
+        self.training_labels = []
+        if model is not None:
+            self.features = dict(self.features, vectorizer='hashing',
+                                 max_features=vectorizer.named_steps['hashing'].n_features)
+            self.vectorizer = vectorizer
+            self.model = model
+            self.is_trained = True
+            self.incremental = True
+            self._kernel = None
+            self._training_matrix = None
+            self.neighbors = None
+            self.revision += 1
+        return self.is_trained
+
+    def _learn_incremental(self, text, area):
+        """Jeden dokument dopisany do liczników NB (IDF zostaje z pełnego treningu)"""
+        row = self.vectorizer.transform([text]).toarray().astype(np.float64)[0]
+        classes = list(self.model.classes_)
+        # Kopie liczników - tablice modelu z ModelStore są zmapowane tylko do odczytu
+        feature_counts = np.array(self.model.feature_count_, dtype=np.float64)
+        class_counts = np.array(self.model.class_count_, dtype=np.float64)
+        if area in classes:
+            feature_counts[classes.index(area)] += row
+            class_counts[classes.index(area)] += 1
+        else:
+            classes.append(area)
+            feature_counts = np.vstack([feature_counts, row])
+            class_counts = np.append(class_counts, 1.0)
+        order = np.argsort(classes)
+        self.model = nb_from_counts([classes[i] for i in order], feature_counts[order],
+                                    class_counts[order], alpha=self.model.alpha,
+                                    estimator=type(self.model))
+        self.categories.add(area)
+        self.document_count += 1
+        self.revision += 1
+        self._kernel = None
+        self.neighbors = None  # IDF jest stałe, ale indeks nie zawiera nowego dokumentu
+        return True
+
     def _retrain_model(self):
-        """Przetrenuj model na wszystkich przykładach"""
+        """Przetrenuj model na wszystkich przykładach.
+
+        Macierz cech z fit_transform czeka na indeks sąsiadów - budowany z niej
+        przy publikacji (export_neighbors), po czym macierz jest zwalniana.
+        """
         if len(self.training_texts) >= 2:
             X = self.vectorizer.fit_transform(self.training_texts)
             self.model.fit(X, self.training_labels)
+            self._kernel = None
+            self._training_matrix = X
+            self.neighbors = None
     
     def predict(self, text):
         """Klasyfikuj tekst"""
         if not self.can_predict():
             return None
         
+        kernel = self.kernel()
+        if kernel is not None:
+            prediction, max_prob = kernel.predict(text)
+            return {
+                'area': prediction,
+                'confidence': max_prob
+            }
+        
         X = self.vectorizer.transform([text])
         prediction = self.model.predict(X)[0]
         
@@ -52,4 +188,93 @@ class ClassificationEngine:
         return {
             'area': prediction,
             'confidence': max_prob
-        }
\ No newline at end of file
+        }
+
+    def predict_batch(self, texts):
+        """Klasyfikuj wiele tekstów naraz - jedna macierz, narzut sklearn rozłożony na paczkę"""
+        if not self.can_predict():
+            return [None] * len(texts)
+        
+        classes, probabilities = self.predict_proba_batch(texts)
+        best = probabilities.argmax(axis=1)
+        return [
+            {'area': classes[i], 'confidence': float(row[i])}
+            for row, i in zip(probabilities, best)
+        ]
+
+    def predict_proba_batch(self, texts):
+        """(klasy, macierz prawdopodobieństw dokumenty x klasy) dla paczki tekstów"""
+        if not self.can_predict():
+            return None, None
+        return self.model.classes_, self.model.predict_proba(self.vectorizer.transform(texts))
+
+    def kernel(self):
+        """Kernel inferencji (NumPy) dla bieżącego modelu albo None, gdy model go nie obsługuje"""
+        if self._kernel is None and self.can_predict():
+            self._kernel = InferenceKernel.from_fitted(self.vectorizer, self.model) or False
+        return self._kernel or None
+
+    def neighbor_index(self):
+        """Indeks najbliższych przykładów dla bieżącego modelu albo None (model bez korpusu)"""
+        if self.neighbors is None and self._training_matrix is not None:
+            self.neighbors = NeighborIndex.build(self._training_matrix, self.training_texts,
+                                                 self.training_labels)
+            self._training_matrix = None  # indeks ma już wszystko, czego potrzebuje
+        return self.neighbors
+
+    def nearest(self, text, k=5):
+        """k najbardziej podobnych oznaczonych przykładów w przestrzeni cech modelu"""
+        index = self.neighbor_index() if self.can_predict() else None
+        if index is None:
+            return None
+        kernel = self.kernel()
+        if kernel is not None:
+            indices, values = kernel.features(text)
+        else:
+            row = self.vectorizer.transform([text]).tocsr()
+            indices, values = row.indices, row.data
+        return index.query(np.asarray(indices, dtype=np.int64), values, k)
+
+    def export_neighbors(self):
+        """Stan indeksu sąsiadów do publikacji obok modelu (None gdy niedostępny)"""
+        index = self.neighbor_index()
+        return index.export_state() if index is not None else None
+
+    def export_state(self):
+        """Stan dopasowanego modelu do publikacji (bez korpusu treningowego)"""
+        return {
+            'features': self.features,
+            'engine': self.engine,
+            'vectorizer': self.vectorizer,
+            'model': self.model,
+            'is_trained': self.is_trained,
+            'categories': sorted(self.categories),
+            'incremental': self.incremental,
+            'document_count': self.document_count,
+        }
+
+    def export_corpus(self):
+        """Korpus treningowy potrzebny do dalszego douczania"""
+        return {
+            'texts': list(self.training_texts),
+            'labels': list(self.training_labels),
+            'sampler': self.sampler.export_state() if self.sampler is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, state, corpus=None):
+        """Odtwarza silnik z opublikowanego stanu (opcjonalnie z korpusem)"""
+        engine = cls(state.get('features'), state.get('engine', 'nb'))
+        engine.vectorizer = state['vectorizer']
+        engine.model = state['model']
+        engine.is_trained = state['is_trained']
+        engine.categories = set(state['categories'])
+        engine.incremental = state.get('incremental', False)
+        engine.document_count = state.get('document_count', 0)
+        if corpus is not None:
+            engine.training_texts = list(corpus['texts'])
+            engine.training_labels = list(corpus['labels'])
+            if engine.sampler is not None:
+                engine.sampler.restore(corpus.get('sampler'), engine.training_texts, engine.training_labels)
+                engine.training_texts, engine.training_labels = engine.sampler.sample()
+        return engine
\ No newline at end of file
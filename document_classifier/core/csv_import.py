@@ -0,0 +1,232 @@
+# core/csv_import.py
+import csv
+import io
+import json
+
+REQUIRED_COLUMNS = ['text', 'area']
+KNOWN_COLUMNS = ['text', 'area', 'subarea']
+MIN_TEXT_LENGTH = 5
+MAX_TEXT_LENGTH = 10000
+
+
+def _result(success, message, total_rows=0, imported_rows=0, rejected_rows=0, errors=None, preview=None):
+    return {
+        "success": success,
+        "message": message,
+        "total_rows": total_rows,
+        "imported_rows": imported_rows,
+        "rejected_rows": rejected_rows,
+        "errors": errors or [],
+        "preview": preview or [],
+    }
+
+
+def validate_row(row, column_mapping):
+    """Zwraca (text, area, subarea) albo komunikat błędu dla wiersza"""
+    text = (row.get(column_mapping['text']) or '').strip()
+    area = (row.get(column_mapping['area']) or '').strip()
+    subarea = (row.get(column_mapping.get('subarea', '')) or '').strip() or None
+
+    if not text:
+        return None, "Missing or empty 'text' field"
+    if not area:
+        return None, "Missing or empty 'area' field"
+    if len(text) < MIN_TEXT_LENGTH:
+        return None, f"Text too short (minimum {MIN_TEXT_LENGTH} characters)"
+    if len(text) > MAX_TEXT_LENGTH:
+        return None, f"Text too long (maximum {MAX_TEXT_LENGTH:,} characters)"
+    return (text, area, subarea), None
+
+
+def import_csv(binary_stream, db, batch_size=1000, max_errors=100, preview_size=5,
+               skip_rows=0, on_batch=None):
+    """Strumieniowy import CSV: wiersz po wierszu, zapis paczkami, stała pamięć.
+
+    binary_stream - plik otwarty binarnie (np. UploadFile.file); nic nie jest
+    wczytywane w całości. Uszkodzony albo zbyt duży wiersz (csv.field_size_limit)
+    jest odrzucany jak wiersz z błędem walidacji - import idzie dalej.
+
+    Punkty zaczepienia dla zadań w tle (core.import_jobs): skip_rows wznawia
+    import od danego wiersza, on_batch(progress) jest wołane po każdej paczce.
+    """
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text_stream)
+
+    total_rows = 0
+    imported_rows = 0
+    rejected_rows = 0
+    errors = []
+    preview = []
+    batch = []
+
+    def reject(row_number, message):
+        nonlocal rejected_rows
+        rejected_rows += 1
+        if len(errors) < max_errors:
+            errors.append(f"Row {row_number}: {message}")
+
+    def flush():
+        nonlocal imported_rows, batch
+        if batch:
+            imported_rows += db.save_documents(batch)
+            batch = []
+        if on_batch is not None:
+            on_batch({
+                "rows_parsed": total_rows,
+                "imported_rows": imported_rows,
+                "rejected_rows": rejected_rows,
+            })
+
+    try:
+        fieldnames = reader.fieldnames
+        if not fieldnames:
+            return _result(False, "CSV file is empty or has no data rows",
+                           errors=["No data rows found in CSV file"])
+
+        # Create column mapping (case-insensitive)
+        column_mapping = {}
+        for original_key in fieldnames:
+            clean_key = (original_key or '').strip().lower()
+            if clean_key in KNOWN_COLUMNS:
+                column_mapping[clean_key] = original_key
+
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in column_mapping]
+        if missing_columns:
+            available_columns = ", ".join(key.strip().lower() for key in fieldnames if key)
+            return _result(
+                False,
+                f"Missing required columns: {', '.join(missing_columns)}",
+                errors=[
+                    f"Required columns: {', '.join(REQUIRED_COLUMNS)}",
+                    f"Available columns: {available_columns}",
+                    "Column names are case-insensitive"
+                ]
+            )
+
+        rows = iter(reader)
+        while True:
+            try:
+                row = next(rows)
+            except StopIteration:
+                break
+            except csv.Error as e:
+                # Reader wraca do stanu początkowego - kolejne wiersze da się czytać dalej
+                total_rows += 1
+                if total_rows > skip_rows:
+                    reject(total_rows + 1, f"Malformed CSV row: {e}")
+                continue
+            total_rows += 1
+            if total_rows <= skip_rows:
+                continue
+            row_number = total_rows + 1  # +1 for the header line
+
+            document, error = validate_row(row, column_mapping)
+            if error:
+                reject(row_number, error)
+                continue
+
+            batch.append(document)
+            if len(preview) < preview_size:
+                text, area, subarea = document
+                preview.append({
+                    "row": row_number,
+                    "text": text[:100] + "..." if len(text) > 100 else text,
+                    "area": area,
+                    "subarea": subarea
+                })
+
+            if len(batch) >= batch_size:
+                flush()
+
+        flush()
+
+    except UnicodeDecodeError:
+        return _result(False, "Could not read CSV file. Please ensure it's saved in UTF-8 encoding.",
+                       total_rows, imported_rows, rejected_rows,
+                       errors + ["File encoding error. Save CSV as UTF-8."], preview)
+    except csv.Error as e:
+        return _result(False, f"Malformed CSV near row {total_rows + 2}: {e}",
+                       total_rows, imported_rows, rejected_rows, errors + [str(e)], preview)
+    finally:
+        text_stream.detach()  # nie zamykaj pliku wywołującego
+
+    if total_rows == 0:
+        return _result(False, "CSV file is empty or has no data rows",
+                       errors=["No data rows found in CSV file"])
+
+    if imported_rows > 0:
+        success_rate = round((imported_rows / total_rows) * 100, 1)
+        message = f"Successfully imported {imported_rows} of {total_rows} documents ({success_rate}%)"
+    else:
+        message = "No documents were imported due to validation errors"
+
+    if rejected_rows > len(errors):
+        errors.append(f"... and {rejected_rows - len(errors)} more rejected rows")
+
+    return _result(imported_rows > 0, message, total_rows, imported_rows, rejected_rows, errors, preview)
+
+
+def import_ndjson(binary_stream, db, batch_size=1000, max_errors=100, on_batch=None):
+    """Strumieniowy import NDJSON: obiekt {text, area, subarea?} na linię, zapis paczkami"""
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig')
+    column_mapping = {column: column for column in KNOWN_COLUMNS}
+
+    total_rows = 0
+    imported_rows = 0
+    rejected_rows = 0
+    errors = []
+    batch = []
+
+    def reject(line_number, message):
+        nonlocal rejected_rows
+        rejected_rows += 1
+        if len(errors) < max_errors:
+            errors.append(f"Line {line_number}: {message}")
+
+    def flush():
+        nonlocal imported_rows, batch
+        if batch:
+            imported_rows += db.save_documents(batch)
+            batch = []
+        if on_batch is not None:
+            on_batch({
+                "rows_parsed": total_rows,
+                "imported_rows": imported_rows,
+                "rejected_rows": rejected_rows,
+            })
+
+    try:
+        for line_number, line in enumerate(text_stream, 1):
+            if not line.strip():
+                continue
+            total_rows += 1
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                reject(line_number, f"Invalid JSON: {e}")
+                continue
+            if not isinstance(row, dict):
+                reject(line_number, "Expected a JSON object")
+                continue
+            document, error = validate_row({key: str(value) for key, value in row.items()
+                                            if value is not None}, column_mapping)
+            if error:
+                reject(line_number, error)
+                continue
+            batch.append(document)
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    except UnicodeDecodeError:
+        return _result(False, "Could not read NDJSON file. Please ensure it's saved in UTF-8 encoding.",
+                       total_rows, imported_rows, rejected_rows, errors + ["File encoding error."])
+    finally:
+        text_stream.detach()
+
+    if total_rows == 0:
+        return _result(False, "NDJSON file is empty", errors=["No records found"])
+    if rejected_rows > len(errors):
+        errors.append(f"... and {rejected_rows - len(errors)} more rejected rows")
+    message = (f"Successfully imported {imported_rows} of {total_rows} documents" if imported_rows
+               else "No documents were imported due to validation errors")
+    return _result(imported_rows > 0, message, total_rows, imported_rows, rejected_rows, errors)
\ No newline at end of file
@@ -1,12 +1,20 @@
 # core/database.py
 import sqlite3
 import json
+from collections import Counter
 from datetime import datetime
 
+from .document_filters import document_filters
+
 class DatabaseManager:
     def __init__(self, db_path="data/classifier.db"):
         self.db_path = db_path
+        # Wołane po zatwierdzeniu INSERT z [(id, text, area, subarea)] - np. indeks duplikatów
+        self.insert_listeners = []
         self._init_database()
+
+    def ensure_schema(self):
+        """Schemat SQLite powstaje już w konstruktorze (lokalny plik) - zgodność z database_pg"""
     
     def _init_database(self):
         """Tworzy tabele jeśli nie istnieją"""
@@ -26,15 +34,110 @@ class DatabaseManager:
                     value TEXT
                 )
             """)
+            # Liczniki aktualizowane przy każdym zapisie - dashboard nie skanuje dokumentów
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats_categories (
+                    area TEXT NOT NULL,
+                    subarea TEXT NOT NULL DEFAULT '',
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (area, subarea)
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stats_daily (
+                    day TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            # Pula dokumentów do oznaczenia (active learning), z niepewnością wg wersji modelu
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS unlabelled_documents (
+                    id INTEGER PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    source TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    uncertainty REAL,
+                    predicted_area TEXT,
+                    model_version INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_unlabelled_queue
+                ON unlabelled_documents (status, uncertainty)
+            """)
+            has_stats = conn.execute("SELECT 1 FROM stats_categories LIMIT 1").fetchone()
+            has_documents = conn.execute("SELECT 1 FROM documents LIMIT 1").fetchone()
+            if has_documents and not has_stats:
+                self._rebuild_stats(conn)
+
+    def _rebuild_stats(self, conn):
+        """Jednorazowe przeliczenie liczników z istniejących dokumentów"""
+        conn.execute("DELETE FROM stats_categories")
+        conn.execute("DELETE FROM stats_daily")
+        conn.execute("""
+            INSERT INTO stats_categories (area, subarea, count)
+            SELECT area, COALESCE(subarea, ''), COUNT(*) FROM documents
+            GROUP BY area, COALESCE(subarea, '')
+        """)
+        conn.execute("""
+            INSERT INTO stats_daily (day, count)
+            SELECT date(created_at), COUNT(*) FROM documents GROUP BY date(created_at)
+        """)
+
+    def _bump_stats(self, conn, documents):
+        """Podbija liczniki w tej samej transakcji co INSERT dokumentów"""
+        counts = Counter((area, subarea or '') for _, area, subarea in documents)
+        conn.executemany("""
+            INSERT INTO stats_categories (area, subarea, count) VALUES (?, ?, ?)
+            ON CONFLICT(area, subarea) DO UPDATE SET count = count + excluded.count
+        """, [(area, subarea, count) for (area, subarea), count in counts.items()])
+        conn.execute("""
+            INSERT INTO stats_daily (day, count) VALUES (date('now'), ?)
+            ON CONFLICT(day) DO UPDATE SET count = count + excluded.count
+        """, (len(documents),))
+
+    def ping(self, timeout=1.0):
+        """Sprawdza czy baza odpowiada (SELECT 1)"""
+        with sqlite3.connect(self.db_path, timeout=timeout) as conn:
+            conn.execute("SELECT 1").fetchone()
+        return True
+
+    def _notify_insert(self, documents):
+        """Powiadamia słuchaczy o nowych dokumentach; ich błąd nie cofa zapisu"""
+        for listener in self.insert_listeners:
+            try:
+                listener(documents)
+            except Exception as e:
+                print(f"⚠️  Insert listener failed: {e}")
 
     def save_document(self, text, area, subarea=None):
-        """Zapisuje dokument do bazy"""
+        """Zapisuje dokument do bazy i zwraca jego id"""
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+            cursor = conn.execute(
                 "INSERT INTO documents (text, area, subarea) VALUES (?, ?, ?)",
                 (text, area, subarea)
             )
-        return True
+            doc_id = cursor.lastrowid
+            self._bump_stats(conn, [(text, area, subarea)])
+        self._notify_insert([(doc_id, text, area, subarea)])
+        return doc_id
+
+    def save_documents(self, rows):
+        """Zapisuje wiele dokumentów (text, area, subarea) w jednej transakcji"""
+        rows = list(rows)
+        if not rows:
+            return 0
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("INSERT INTO documents (text, area, subarea) VALUES (?, ?, ?)", rows)
+            # Transakcja trzyma blokadę zapisu, a id to max + 1 - wstawione wiersze mają kolejne id
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+            self._bump_stats(conn, rows)
+        if self.insert_listeners:
+            first_id = last_id - len(rows) + 1
+            self._notify_insert([(first_id + i, *row) for i, row in enumerate(rows)])
+        return len(rows)
+
     def get_all_documents(self):
         """Pobiera wszystkie dokumenty z bazy"""
         with sqlite3.connect(self.db_path) as conn:
@@ -45,12 +148,167 @@ class DatabaseManager:
             """)
             return cursor.fetchall()
 
+    def iter_documents(self, area=None, subarea=None, date_from=None, date_to=None, batch_size=1000,
+                       after_id=None):
+        """Strumień dokumentów (id, text, area, subarea, created_at) paczkami po batch_size.
+
+        Filtry są opcjonalne; date_from/date_to to daty (YYYY-MM-DD), date_to włącznie.
+        Pamięć zależy od batch_size, nie od liczby dokumentów.
+        """
+        where, params = document_filters(area, subarea, date_from, date_to, "?", after_id)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(f"""
+                SELECT id, text, area, subarea, created_at 
+                FROM documents 
+                {where}
+                ORDER BY id
+            """, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    def get_settings(self):
+        """Pobiera wszystkie ustawienia jako słownik"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("SELECT key, value FROM settings")
+            return dict(cursor.fetchall())
+
+    def get_settings_version(self):
+        """Licznik zmian ustawień - tani odczyt do unieważniania cache"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT value FROM settings WHERE key = 'settings_version'"
+            ).fetchone()
+            return int(row[0]) if row else 0
+
+    def set_setting(self, key, value):
+        """Zapisuje ustawienie i podbija licznik wersji w jednej transakcji"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("""
+                INSERT INTO settings (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+            """, (key, value))
+            conn.execute("""
+                INSERT INTO settings (key, value) VALUES ('settings_version', '1')
+                ON CONFLICT(key) DO UPDATE
+                SET value = CAST(CAST(settings.value AS INTEGER) + 1 AS TEXT)
+            """)
+        return True
+
     def get_categories(self):
         """Pobiera wszystkie unikalne Area i SubArea"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute("""
-                SELECT DISTINCT area, subarea 
-                FROM documents 
-                WHERE area IS NOT NULL
+                SELECT area, NULLIF(subarea, '') 
+                FROM stats_categories 
+                WHERE count > 0
+            """)
+            return cursor.fetchall()
+
+    def get_category_counts(self):
+        """Liczba dokumentów per (area, subarea) - z liczników, bez skanowania dokumentów"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT area, NULLIF(subarea, ''), count 
+                FROM stats_categories 
+                WHERE count > 0
             """)
-            return cursor.fetchall()
\ No newline at end of file
+            return cursor.fetchall()
+
+    def count_documents(self):
+        """Łączna liczba dokumentów"""
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT COALESCE(SUM(count), 0) FROM stats_categories").fetchone()
+            return row[0]
+
+    def get_daily_counts(self, days=7):
+        """Liczba dokumentów dodanych w ostatnich dniach: [(YYYY-MM-DD, count)]"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT day, count FROM stats_daily 
+                WHERE day > date('now', ?) 
+                ORDER BY day
+            """, (f"-{int(days)} days",))
+            return cursor.fetchall()
+
+    def get_recent_documents(self, limit=10):
+        """Ostatnio dodane dokumenty (po kluczu głównym, bez sortowania całej tabeli)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT id, text, area, subarea, created_at 
+                FROM documents 
+                ORDER BY id DESC 
+                LIMIT ?
+            """, (limit,))
+            return cursor.fetchall()
+
+    def add_unlabelled_documents(self, rows):
+        """Dodaje dokumenty (text, source) do puli do oznaczenia w jednej transakcji"""
+        rows = list(rows)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("INSERT INTO unlabelled_documents (text, source) VALUES (?, ?)", rows)
+        return len(rows)
+
+    def get_stale_unlabelled(self, model_version, limit=500):
+        """Oczekujące dokumenty bez oceny dla tej wersji modelu: najpierw nieocenione, potem najbardziej niepewne"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT id, text FROM unlabelled_documents 
+                WHERE status = 'pending' AND model_version IS NOT ? 
+                ORDER BY uncertainty IS NOT NULL, uncertainty DESC, id 
+                LIMIT ?
+            """, (model_version, limit))
+            return cursor.fetchall()
+
+    def update_uncertainty(self, rows):
+        """Zapisuje oceny [(uncertainty, predicted_area, model_version, id)]"""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany("""
+                UPDATE unlabelled_documents 
+                SET uncertainty = ?, predicted_area = ?, model_version = ? 
+                WHERE id = ?
+            """, rows)
+        return len(rows)
+
+    def get_labelling_queue(self, limit=10):
+        """Oczekujące dokumenty od najbardziej niepewnych (nieocenione na końcu, od najstarszych)"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute("""
+                SELECT id, text, source, uncertainty, predicted_area, model_version, created_at 
+                FROM unlabelled_documents 
+                WHERE status = 'pending' 
+                ORDER BY uncertainty IS NULL, uncertainty DESC, id 
+                LIMIT ?
+            """, (limit,))
+            return cursor.fetchall()
+
+    def count_unlabelled(self, model_version=None):
+        """(oczekujące, oczekujące bez oceny dla tej wersji modelu)"""
+        with sqlite3.connect(self.db_path) as conn:
+            pending, stale = conn.execute("""
+                SELECT COUNT(*), 
+                       COALESCE(SUM(model_version IS NOT ?), 0) 
+                FROM unlabelled_documents WHERE status = 'pending'
+            """, (model_version,)).fetchone()
+            return pending, stale
+
+    def get_unlabelled_document(self, doc_id):
+        """(id, text, source, status) dokumentu z puli albo None"""
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(
+                "SELECT id, text, source, status FROM unlabelled_documents WHERE id = ?", (doc_id,)
+            ).fetchone()
+
+    def set_unlabelled_status(self, doc_id, status, expected='pending'):
+        """Zmienia status dokumentu z puli (domyślnie pending -> labelled | skipped); False gdy status nie jest expected"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "UPDATE unlabelled_documents SET status = ? WHERE id = ? AND status = ?",
+                (status, doc_id, expected)
+            )
+            return cursor.rowcount > 0
\ No newline at end of file
@@ -1,8 +1,21 @@
 # core/database_pg.py
-import psycopg2
 import os
+import threading
+from collections import Counter
 from datetime import datetime
 
+from .document_filters import document_filters
+
+psycopg2 = None  # sterownik importowany przy pierwszym połączeniu
+
+
+def _driver():
+    """psycopg2 (z extras) - import odłożony do pierwszego użycia bazy"""
+    global psycopg2
+    if psycopg2 is None:
+        import psycopg2.extras
+    return psycopg2
+
 class DatabaseManager:
     def __init__(self):
         # Pobieranie z environment variables
@@ -13,15 +26,28 @@ class DatabaseManager:
             'user': os.getenv('DB_USER', 'app_user'),
             'password': os.getenv('DB_PASSWORD', 'app_password')
         }
-        self._init_database()
+        # Wołane po zatwierdzeniu INSERT z [(id, text, area, subarea)] - np. indeks duplikatów
+        self.insert_listeners = []
+        # Połączenie i DDL dopiero przy pierwszym zapytaniu - konstruktor nie dotyka bazy
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
     
     def _get_connection(self):
-        """Tworzy połączenie z PostgreSQL"""
-        return psycopg2.connect(**self.db_config)
+        """Tworzy połączenie z PostgreSQL (za pierwszym razem upewnia się, że schemat istnieje)"""
+        if not self._schema_ready:
+            self.ensure_schema()
+        return _driver().connect(**self.db_config)
+
+    def ensure_schema(self):
+        """Tworzy schemat raz na proces; wołane leniwie albo wprost przy starcie serwisu"""
+        with self._schema_lock:
+            if not self._schema_ready:
+                self._init_database()
+                self._schema_ready = True
     
     def _init_database(self):
         """Tworzy tabele jeśli nie istnieją"""
-        with self._get_connection() as conn:
+        with _driver().connect(**self.db_config) as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS documents (
@@ -38,18 +64,128 @@ class DatabaseManager:
                         value TEXT
                     )
                 """)
+                # Liczniki aktualizowane przy każdym zapisie - dashboard nie skanuje dokumentów
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS stats_categories (
+                        area TEXT NOT NULL,
+                        subarea TEXT NOT NULL DEFAULT '',
+                        count BIGINT NOT NULL DEFAULT 0,
+                        PRIMARY KEY (area, subarea)
+                    )
+                """)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS stats_daily (
+                        day DATE PRIMARY KEY,
+                        count BIGINT NOT NULL DEFAULT 0
+                    )
+                """)
+                # Pula dokumentów do oznaczenia (active learning), z niepewnością wg wersji modelu
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS unlabelled_documents (
+                        id SERIAL PRIMARY KEY,
+                        text TEXT NOT NULL,
+                        source TEXT,
+                        status TEXT NOT NULL DEFAULT 'pending',
+                        uncertainty DOUBLE PRECISION,
+                        predicted_area TEXT,
+                        model_version INTEGER,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_unlabelled_queue
+                    ON unlabelled_documents (status, uncertainty)
+                """)
+                cursor.execute("SELECT 1 FROM stats_categories LIMIT 1")
+                has_stats = cursor.fetchone()
+                cursor.execute("SELECT 1 FROM documents LIMIT 1")
+                has_documents = cursor.fetchone()
+                if has_documents and not has_stats:
+                    self._rebuild_stats(cursor)
                 conn.commit()
 
+    def _rebuild_stats(self, cursor):
+        """Jednorazowe przeliczenie liczników z istniejących dokumentów"""
+        cursor.execute("DELETE FROM stats_categories")
+        cursor.execute("DELETE FROM stats_daily")
+        cursor.execute("""
+            INSERT INTO stats_categories (area, subarea, count)
+            SELECT area, COALESCE(subarea, ''), COUNT(*) FROM documents
+            GROUP BY area, COALESCE(subarea, '')
+        """)
+        cursor.execute("""
+            INSERT INTO stats_daily (day, count)
+            SELECT created_at::date, COUNT(*) FROM documents GROUP BY created_at::date
+        """)
+
+    def _bump_stats(self, cursor, documents):
+        """Podbija liczniki w tej samej transakcji co INSERT dokumentów"""
+        counts = Counter((area, subarea or '') for _, area, subarea in documents)
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO stats_categories (area, subarea, count) VALUES %s
+            ON CONFLICT (area, subarea)
+            DO UPDATE SET count = stats_categories.count + EXCLUDED.count
+        """, [(area, subarea, count) for (area, subarea), count in counts.items()])
+        cursor.execute("""
+            INSERT INTO stats_daily (day, count) VALUES (CURRENT_DATE, %s)
+            ON CONFLICT (day) DO UPDATE SET count = stats_daily.count + EXCLUDED.count
+        """, (len(documents),))
+
+    def ping(self, timeout=1.0):
+        """Sprawdza czy baza odpowiada (SELECT 1) z limitem czasu połączenia i zapytania"""
+        conn = _driver().connect(
+            **self.db_config,
+            connect_timeout=max(1, int(timeout)),
+            options=f"-c statement_timeout={int(timeout * 1000)}"
+        )
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        finally:
+            conn.close()
+        return True
+
+    def _notify_insert(self, documents):
+        """Powiadamia słuchaczy o nowych dokumentach; ich błąd nie cofa zapisu"""
+        for listener in self.insert_listeners:
+            try:
+                listener(documents)
+            except Exception as e:
+                print(f"⚠️  Insert listener failed: {e}")
+
     def save_document(self, text, area, subarea=None):
-        """Zapisuje dokument do bazy"""
+        """Zapisuje dokument do bazy i zwraca jego id"""
         with self._get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute(
-                    "INSERT INTO documents (text, area, subarea) VALUES (%s, %s, %s)",
+                    "INSERT INTO documents (text, area, subarea) VALUES (%s, %s, %s) RETURNING id",
                     (text, area, subarea)
                 )
+                doc_id = cursor.fetchone()[0]
+                self._bump_stats(cursor, [(text, area, subarea)])
                 conn.commit()
-        return True
+        self._notify_insert([(doc_id, text, area, subarea)])
+        return doc_id
+
+    def save_documents(self, rows):
+        """Zapisuje wiele dokumentów (text, area, subarea) w jednej transakcji"""
+        rows = list(rows)
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                ids = psycopg2.extras.execute_values(
+                    cursor,
+                    "INSERT INTO documents (text, area, subarea) VALUES %s RETURNING id",
+                    rows,
+                    page_size=1000,
+                    fetch=True
+                )
+                if rows:
+                    self._bump_stats(cursor, rows)
+                conn.commit()
+        if rows and self.insert_listeners:
+            self._notify_insert([(doc_id, *row) for (doc_id,), row in zip(ids, rows)])
+        return len(rows)
 
     def get_all_documents(self):
         """Pobiera wszystkie dokumenty z bazy"""
@@ -62,13 +198,190 @@ class DatabaseManager:
                 """)
                 return cursor.fetchall()
 
+    def iter_documents(self, area=None, subarea=None, date_from=None, date_to=None, batch_size=1000,
+                       after_id=None):
+        """Strumień dokumentów (id, text, area, subarea, created_at) z kursora po stronie serwera.
+
+        Filtry są opcjonalne; date_from/date_to to daty (YYYY-MM-DD), date_to włącznie.
+        Nazwany kursor pobiera po batch_size wierszy - pamięć nie rośnie z rozmiarem korpusu.
+        """
+        where, params = document_filters(area, subarea, date_from, date_to, "%s", after_id)
+        conn = self._get_connection()
+        try:
+            with conn.cursor(name="iter_documents") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(f"""
+                    SELECT id, text, area, subarea, created_at 
+                    FROM documents 
+                    {where}
+                    ORDER BY id
+                """, params)
+                yield from cursor
+        finally:
+            conn.close()
+
+    def get_settings(self):
+        """Pobiera wszystkie ustawienia jako słownik"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT key, value FROM settings")
+                return dict(cursor.fetchall())
+
+    def get_settings_version(self):
+        """Licznik zmian ustawień - tani odczyt do unieważniania cache"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT value FROM settings WHERE key = 'settings_version'")
+                row = cursor.fetchone()
+                return int(row[0]) if row else 0
+
+    def set_setting(self, key, value):
+        """Zapisuje ustawienie i podbija licznik wersji w jednej transakcji"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO settings (key, value) VALUES (%s, %s)
+                    ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value
+                """, (key, value))
+                cursor.execute("""
+                    INSERT INTO settings (key, value) VALUES ('settings_version', '1')
+                    ON CONFLICT (key) DO UPDATE
+                    SET value = (settings.value::integer + 1)::text
+                """)
+                conn.commit()
+        return True
+
     def get_categories(self):
         """Pobiera wszystkie unikalne Area i SubArea"""
         with self._get_connection() as conn:
             with conn.cursor() as cursor:
                 cursor.execute("""
-                    SELECT DISTINCT area, subarea 
-                    FROM documents 
-                    WHERE area IS NOT NULL
+                    SELECT area, NULLIF(subarea, '') 
+                    FROM stats_categories 
+                    WHERE count > 0
+                """)
+                return cursor.fetchall()
+
+    def get_category_counts(self):
+        """Liczba dokumentów per (area, subarea) - z liczników, bez skanowania dokumentów"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT area, NULLIF(subarea, ''), count 
+                    FROM stats_categories 
+                    WHERE count > 0
                 """)
-                return cursor.fetchall()
\ No newline at end of file
+                return cursor.fetchall()
+
+    def count_documents(self):
+        """Łączna liczba dokumentów"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT COALESCE(SUM(count), 0) FROM stats_categories")
+                return int(cursor.fetchone()[0])
+
+    def get_daily_counts(self, days=7):
+        """Liczba dokumentów dodanych w ostatnich dniach: [(YYYY-MM-DD, count)]"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT to_char(day, 'YYYY-MM-DD'), count FROM stats_daily 
+                    WHERE day > CURRENT_DATE - %s 
+                    ORDER BY day
+                """, (int(days),))
+                return cursor.fetchall()
+
+    def get_recent_documents(self, limit=10):
+        """Ostatnio dodane dokumenty (po kluczu głównym, bez sortowania całej tabeli)"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, text, area, subarea, created_at 
+                    FROM documents 
+                    ORDER BY id DESC 
+                    LIMIT %s
+                """, (limit,))
+                return cursor.fetchall()
+
+    def add_unlabelled_documents(self, rows):
+        """Dodaje dokumenty (text, source) do puli do oznaczenia w jednej transakcji"""
+        rows = list(rows)
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                psycopg2.extras.execute_values(
+                    cursor,
+                    "INSERT INTO unlabelled_documents (text, source) VALUES %s",
+                    rows,
+                    page_size=1000
+                )
+                conn.commit()
+        return len(rows)
+
+    def get_stale_unlabelled(self, model_version, limit=500):
+        """Oczekujące dokumenty bez oceny dla tej wersji modelu: najpierw nieocenione, potem najbardziej niepewne"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, text FROM unlabelled_documents 
+                    WHERE status = 'pending' AND model_version IS DISTINCT FROM %s 
+                    ORDER BY uncertainty DESC NULLS FIRST, id 
+                    LIMIT %s
+                """, (model_version, limit))
+                return cursor.fetchall()
+
+    def update_uncertainty(self, rows):
+        """Zapisuje oceny [(uncertainty, predicted_area, model_version, id)]"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                psycopg2.extras.execute_batch(cursor, """
+                    UPDATE unlabelled_documents 
+                    SET uncertainty = %s, predicted_area = %s, model_version = %s 
+                    WHERE id = %s
+                """, rows, page_size=1000)
+                conn.commit()
+        return len(rows)
+
+    def get_labelling_queue(self, limit=10):
+        """Oczekujące dokumenty od najbardziej niepewnych (nieocenione na końcu, od najstarszych)"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, text, source, uncertainty, predicted_area, model_version, created_at 
+                    FROM unlabelled_documents 
+                    WHERE status = 'pending' 
+                    ORDER BY uncertainty DESC NULLS LAST, id 
+                    LIMIT %s
+                """, (limit,))
+                return cursor.fetchall()
+
+    def count_unlabelled(self, model_version=None):
+        """(oczekujące, oczekujące bez oceny dla tej wersji modelu)"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT COUNT(*), COUNT(*) FILTER (WHERE model_version IS DISTINCT FROM %s) 
+                    FROM unlabelled_documents WHERE status = 'pending'
+                """, (model_version,))
+                pending, stale = cursor.fetchone()
+                return pending, stale
+
+    def get_unlabelled_document(self, doc_id):
+        """(id, text, source, status) dokumentu z puli albo None"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT id, text, source, status FROM unlabelled_documents WHERE id = %s", (doc_id,)
+                )
+                return cursor.fetchone()
+
+    def set_unlabelled_status(self, doc_id, status, expected='pending'):
+        """Zmienia status dokumentu z puli (domyślnie pending -> labelled | skipped); False gdy status nie jest expected"""
+        with self._get_connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "UPDATE unlabelled_documents SET status = %s WHERE id = %s AND status = %s",
+                    (status, doc_id, expected)
+                )
+                updated = cursor.rowcount > 0
+                conn.commit()
+                return updated
\ No newline at end of file
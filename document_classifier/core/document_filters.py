@@ -0,0 +1,24 @@
+# core/document_filters.py
+from datetime import timedelta
+
+
+def document_filters(area, subarea, date_from, date_to, placeholder, after_id=None):
+    """Klauzula WHERE dla filtrów eksportu (wspólna dla SQLite i PostgreSQL)"""
+    clauses, params = [], []
+    if after_id:
+        clauses.append(f"id > {placeholder}")
+        params.append(int(after_id))
+    if area:
+        clauses.append(f"area = {placeholder}")
+        params.append(area)
+    if subarea:
+        clauses.append(f"subarea = {placeholder}")
+        params.append(subarea)
+    if date_from:
+        clauses.append(f"created_at >= {placeholder}")
+        params.append(str(date_from))
+    if date_to:
+        # date_to włącznie - porównanie z początkiem następnego dnia
+        clauses.append(f"created_at < {placeholder}")
+        params.append(str(date_to + timedelta(days=1)))
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
\ No newline at end of file
@@ -1,20 +1,273 @@
 # core/document_service.py
+import os
+import threading
+
 from .database_pg import DatabaseManager
 from .classifier import ClassificationEngine
+from .engines import supports_counts
+from .model_store import ModelStore
+from .tenant_models import TenantModelRegistry
+from .runtime_settings import RuntimeSettings
+from .near_duplicates import NearDuplicateIndex
+from .active_learning import LabellingQueue
 
 class DocumentService:
-    def __init__(self):
-        self.db = DatabaseManager()
-        self.classifier = ClassificationEngine()
-        self.mode = "learning"  # learning lub auto
+    DUPLICATES_CATCH_UP = 5000  # dokumentów z innych procesów indeksowanych wprost przed zapytaniem
+
+    def __init__(self, db=None):
+        # Domyślnie PostgreSQL; narzędzia offline (benchmarki, testy) podają core.database (SQLite)
+        self.db = db or DatabaseManager()
+        # Tryb, progi i przypięta wersja modelu są wspólne dla wszystkich procesów
+        self.settings = RuntimeSettings(self.db)
+        # Sprzątanie starych wersji czyta pin z bazy - ten sam dla API, panelu i konsoli
+        self.model_store = ModelStore(pinned=self._current_pin)
+        self._missing_pin = None  # (wersja, settings_version) pinu, którego nie ma na dysku
+        # Model (i z nim sklearn) ładowany przy pierwszym użyciu - patrz classifier
+        self._classifier = None
+        self._classifier_lock = threading.Lock()
+        self._corpus_version = None  # wersja, której korpus trzymamy w pamięci
+        self.tenants = TenantModelRegistry()
+        # Indeks near-duplikatów: uzupełniany przy każdym zapisie, zaległości nadrabiane w tle -
+        # od warm_up() albo pierwszego użycia, bo synchronizacja łączy się z bazą
+        self.duplicates = NearDuplicateIndex()
+        self.db.insert_listeners.append(self._index_documents)
+        self._sync_thread = None
+        self._sync_lock = threading.Lock()
+        # Nieoznaczone dokumenty szeregowane wg niepewności modelu (active learning)
+        self.labelling = LabellingQueue(self.db)
+
+    @property
+    def classifier(self):
+        """Model domyślny; przy pierwszym odczycie opublikowany przez inny proces albo nowy, pusty"""
+        if self._classifier is None:
+            with self._classifier_lock:
+                if self._classifier is None:
+                    self._classifier = self.model_store.load() or ClassificationEngine()
+        return self._classifier
+
+    @classifier.setter
+    def classifier(self, engine):
+        self._classifier = engine
+
+    def warm_up(self):
+        """Od razu łączy się z bazą (schemat) i ładuje model - dla serwerów, które mają wstać gotowe"""
+        self.db.ensure_schema()
+        self.start_duplicates_sync()
+        return self.classifier
         
     def get_mode(self):
         """Zwraca aktualny tryb"""
-        return self.mode
+        return self.settings.get('mode')
     
     def set_mode(self, mode):
         """Ustawia tryb: learning lub auto"""
         if mode in ["learning", "auto"]:
-            self.mode = mode
-            return True
-        return False
\ No newline at end of file
+            return self.settings.set('mode', mode)
+        return False
+
+    def get_confidence_threshold(self):
+        """Domyślny próg pewności dla klasyfikacji"""
+        return self.settings.get_float('confidence_threshold')
+
+    def get_duplicate_policy(self):
+        """Co robić z feedbackiem bliskim istniejącemu dokumentowi: off | flag | collapse"""
+        return self.settings.get('duplicate_policy')
+
+    def find_duplicates(self, text, threshold=None, limit=10):
+        """Zapisane dokumenty podobne do tekstu (MinHash/LSH)"""
+        self._catch_up_duplicates()
+        return self.duplicates.query(text, threshold=threshold, limit=limit)
+
+    def _catch_up_duplicates(self):
+        """Dokumenty zapisane przez inne workery/repliki od ostatniej synchronizacji trafiają do indeksu
+        przed zapytaniem; duża zaległość (ponad DUPLICATES_CATCH_UP) jest kończona w tle"""
+        if self.start_duplicates_sync().is_alive():
+            return  # nadrabianie w tle już trwa
+        added = self.duplicates.sync(self.db, limit=self.DUPLICATES_CATCH_UP, blocking=False)
+        if added >= self.DUPLICATES_CATCH_UP:
+            self.start_duplicates_sync(restart=True)
+
+    def start_duplicates_sync(self, restart=False):
+        """Uruchamia (raz, z restart=True ponownie po zakończeniu) nadrabianie zaległości indeksu
+        near-duplikatów w tle; zwraca wątek"""
+        with self._sync_lock:
+            if self._sync_thread is None or (restart and not self._sync_thread.is_alive()):
+                self._sync_thread = threading.Thread(target=self._sync_duplicates,
+                                                     name='near-duplicates-sync', daemon=True)
+                self._sync_thread.start()
+            return self._sync_thread
+
+    def _index_documents(self, documents):
+        self.start_duplicates_sync()
+        return self.duplicates.add_documents(documents)
+
+    def _sync_duplicates(self):
+        try:
+            added = self.duplicates.sync(self.db)
+            if added:
+                print(f"✓ Near-duplicate index: {added} documents indexed")
+        except Exception as e:
+            print(f"⚠️  Near-duplicate index sync failed: {e}")
+
+    def _current_pin(self):
+        """Przypięta wersja wprost z bazy - sprzątanie nie może polegać na cache z TTL"""
+        self.settings.invalidate()
+        return self.settings.get_int('model_version_pin')
+
+    def refresh_model(self):
+        """Przeładowuje model, jeśli inny proces opublikował nowszą wersję"""
+        pinned = self.settings.get_int('model_version_pin')
+        if pinned is not None and self._missing_pin == (pinned, self.settings.revision()):
+            pinned = None  # brak pinu już zgłoszony - bez dysku i logu aż do zmiany ustawień
+        if pinned is not None and self.classifier.model_version != pinned:
+            try:
+                self.classifier = self.model_store.load(pinned)
+            except FileNotFoundError:
+                print(f"⚠️  Pinned model version {pinned} not found, using latest")
+                self._missing_pin = (pinned, self.settings.revision())
+                pinned = None
+        if pinned is not None:
+            return pinned
+
+        # Najnowsza wersja w chwili odczytu - ta z poll mogła już zostać wyparta i usunięta
+        if self.model_store.poll(self.classifier.model_version) is not None:
+            self.classifier = self.model_store.load()
+        return self.classifier.model_version
+
+    def classifier_for(self, system_id=None):
+        """Model danego systemu, a gdy go nie ma (albo nie umie klasyfikować) - model domyślny"""
+        self.refresh_model()
+        if system_id:
+            engine = self.tenants.get(system_id)
+            if engine is not None and engine.can_predict():
+                return engine, f"tenant:{system_id}"
+        return self.classifier, "default"
+
+    def explain(self, text, k=5, system_id=None):
+        """Predykcja wraz z k najbliższymi oznaczonymi przykładami z korpusu modelu"""
+        engine, scope = self.classifier_for(system_id)
+        if not engine.can_predict():
+            return None
+        result = engine.predict(text)
+        return {
+            "area": result['area'],
+            "confidence": result['confidence'],
+            "neighbors": engine.nearest(text, k),
+            "model_version": engine.model_version,
+            "model": scope,
+        }
+
+    def learn(self, text, area, system_id=None):
+        """Douczanie na najnowszym wspólnym korpusie i publikacja nowej wersji.
+
+        Dokument odrzucony przez próbkę rezerwuarową (TRAINING_CLASS_CAP) nie
+        zmienia modelu - wtedy nowa wersja nie jest publikowana.
+        """
+        if system_id:
+            return self.tenants.learn(system_id, text, area)
+        with self.model_store.lock():
+            latest = self.model_store.current_version()
+            if latest is not None and latest != self._corpus_version:
+                self.classifier = self.model_store.load(latest, with_corpus=True)
+            revision = self.classifier.revision
+            trained = self.classifier.learn(text, area)
+            if self.classifier.revision != revision:
+                self.publish_model()
+        return trained
+
+    def labelling_queue(self, limit=10):
+        """Dokumenty do oznaczenia, od tych, przy których bieżący model jest najmniej pewny"""
+        self.refresh_model()
+        return self.labelling.next(self.classifier, limit)
+
+    def label_queued(self, doc_id, area, subarea=None):
+        """Etykieta dla dokumentu z puli: zapis, douczenie modelu i zdjęcie z kolejki.
+
+        None, gdy dokumentu nie ma albo został już oznaczony. Status 'labelled'
+        rezerwuje dokument przed zapisem (dwie równoczesne etykiety nie zapiszą
+        go dwa razy); gdy zapis się nie uda, dokument wraca do kolejki. Błąd
+        douczenia już go nie cofa - etykieta jest w bazie i trafi do modelu
+        przy następnym treningu.
+        """
+        document = self.db.get_unlabelled_document(doc_id)
+        if document is None or document[3] != 'pending':
+            return None
+        if not self.db.set_unlabelled_status(doc_id, 'labelled'):
+            return None  # ktoś oznaczył go w międzyczasie
+        try:
+            saved_id = self.db.save_document(document[1], area, subarea)
+        except Exception:
+            self.db.set_unlabelled_status(doc_id, 'pending', expected='labelled')
+            raise
+        trained = self.learn(document[1], area)
+        return {"document_id": saved_id, "model_updated": trained,
+                "model_version": self.classifier.model_version}
+
+    def publish_model(self):
+        """Publikuje bieżący model wszystkim workerom"""
+        version = self.model_store.publish(self.classifier)
+        self._corpus_version = version
+        return version
+
+
+    def retrain_from_database(self):
+        """Trenuje model domyślny od zera na wszystkich dokumentach z bazy i go publikuje.
+
+        Przy CLASSIFIER_TRAINING_WORKERS > 1 korpus jest strumieniowany z bazy do puli
+        procesów (fit_parallel) zamiast wczytywany w całości - o ile silnik (CLASSIFIER_ENGINE)
+        da się liczyć z sumowanych liczników; sgd trenuje się zawsze sekwencyjnie.
+        Z limitem per klasa (TRAINING_CLASS_CAP) strumień przechodzi przez próbkę
+        rezerwuarową - czas i pamięć retreningu są ograniczone niezależnie od wielkości bazy.
+        """
+        # Liczność kategorii z liczników - bez skanowania dokumentów
+        area_counts = {}
+        for area, _, count in self.db.get_category_counts():
+            area_counts[area] = area_counts.get(area, 0) + count
+        total = sum(area_counts.values())
+        
+        if total < 2:
+            return {
+                "success": False,
+                "message": "Need at least 2 documents to train model"
+            }
+        
+        if len(area_counts) < 2:
+            return {
+                "success": False,
+                "message": f"Need at least 2 different categories to train. Found: {list(area_counts.keys())}"
+            }
+        
+        engine = ClassificationEngine()
+        workers = int(os.getenv('CLASSIFIER_TRAINING_WORKERS', '1'))
+        if engine.sampler is not None:
+            engine.fit_stream((doc[1], doc[2], doc[4]) for doc in self.db.iter_documents(batch_size=5000))
+            total = len(engine.training_texts)
+        elif workers > 1 and supports_counts(engine.engine):
+            engine.fit_parallel(((doc[1], doc[2]) for doc in self.db.iter_documents(batch_size=5000)),
+                                workers=workers)
+            total = engine.document_count
+        else:
+            documents = self.db.get_all_documents()
+            engine.fit([doc[1] for doc in documents], [doc[2] for doc in documents])
+            total = len(documents)
+        
+        with self.model_store.lock():
+            self.classifier = engine
+            self.publish_model()
+        
+        # Switch to auto mode if model can predict
+        if self.classifier.can_predict():
+            self.set_mode("auto")
+        
+        return {
+            "success": True,
+            "message": f"Model trained successfully on {total} documents",
+            "trained_documents": total,
+            "categories": list(self.classifier.categories),
+            "categories_count": len(self.classifier.categories),
+            "can_predict": self.classifier.can_predict(),
+            "mode": self.get_mode(),
+            "category_distribution": area_counts,
+            "sampling": self.classifier.sampling_report(),
+            "model_version": self.classifier.model_version
+        }
\ No newline at end of file
@@ -0,0 +1,48 @@
+# core/engines.py
+import os
+
+# sklearn importowany dopiero przy budowie modelu - sam import modułu nie kosztuje ~0.7 s
+
+
+def _nb():
+    from sklearn.naive_bayes import MultinomialNB
+    return MultinomialNB()
+
+
+def _complement_nb():
+    from sklearn.naive_bayes import ComplementNB
+    return ComplementNB()
+
+
+def _sgd():
+    from sklearn.linear_model import SGDClassifier
+    # log_loss - potrzebne predict_proba (pewność, próg, kolejka active learning)
+    return SGDClassifier(loss='log_loss', alpha=1e-5, max_iter=50, tol=1e-4, random_state=0)
+
+
+# Silniki klasyfikacji wybierane przez CLASSIFIER_ENGINE.
+# counts - model wyznaczony przez sumowane liczniki cech per klasa, więc obsługuje
+#          trening równoległy (fit_parallel) i douczanie przyrostowe
+ENGINES = {
+    'nb': {'build': _nb, 'counts': True},
+    'complement_nb': {'build': _complement_nb, 'counts': True},
+    'sgd': {'build': _sgd, 'counts': False},
+}
+
+
+def engine_name(name=None):
+    """Nazwa silnika: argument albo CLASSIFIER_ENGINE (domyślnie nb)"""
+    name = name or os.getenv('CLASSIFIER_ENGINE', 'nb')
+    if name not in ENGINES:
+        raise ValueError(f"Unknown engine: {name} (choose from {', '.join(ENGINES)})")
+    return name
+
+
+def build_model(name=None):
+    """Nowy (niedopasowany) model sklearn dla silnika"""
+    return ENGINES[engine_name(name)]['build']()
+
+
+def supports_counts(name=None):
+    """Czy silnik da się trenować z sumowanych liczników (fit_parallel, learn przyrostowy)"""
+    return ENGINES[engine_name(name)]['counts']
\ No newline at end of file
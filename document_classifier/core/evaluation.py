@@ -0,0 +1,198 @@
+# core/evaluation.py
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from .classifier import ClassificationEngine
+
+# Korpus trafia do każdego procesu raz (initializer), a nie z każdym foldem
+_worker_texts = None
+_worker_labels = None
+_worker_config = (None, None)
+
+
+def _init_worker(texts, labels, features=None, engine=None):
+    global _worker_texts, _worker_labels, _worker_config
+    _worker_texts = texts
+    _worker_labels = labels
+    _worker_config = (features, engine)  # cechy i silnik ocenianego modelu, nie z CLASSIFIER_*
+
+
+def _evaluate_fold(split):
+    """Trening na części treningowej, predykcja na testowej - wykonywane w osobnym procesie"""
+    train_idx, test_idx = split
+    engine = ClassificationEngine(*_worker_config)
+    engine.fit([_worker_texts[i] for i in train_idx], [_worker_labels[i] for i in train_idx])
+    if not engine.can_predict():
+        return [], []
+
+    X = engine.vectorizer.transform([_worker_texts[i] for i in test_idx])
+    y_pred = engine.model.predict(X).tolist()
+    y_true = [_worker_labels[i] for i in test_idx]
+    return y_true, y_pred
+
+
+def _sample(texts, labels, max_documents, seed):
+    """Ograniczenie kosztu ewaluacji - losowa próbka (proporcje klas zachowane w przybliżeniu)"""
+    if max_documents is None or len(texts) <= max_documents:
+        return texts, labels
+    rng = np.random.default_rng(seed)
+    keep = np.sort(rng.choice(len(texts), size=max_documents, replace=False))
+    return [texts[i] for i in keep], [labels[i] for i in keep]
+
+
+def evaluate(texts, labels, folds=5, max_workers=None, max_documents=20000, seed=0,
+             features=None, engine=None):
+    """K-fold cross-validation: accuracy, precision/recall/F1 per klasa i macierz pomyłek.
+
+    features/engine - konfiguracja ocenianego modelu (domyślnie z CLASSIFIER_*)
+    """
+    from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
+    from sklearn.model_selection import KFold, StratifiedKFold
+
+    texts, labels = _sample(list(texts), list(labels), max_documents, seed)
+    class_counts = Counter(labels)
+    if len(texts) < 4 or len(class_counts) < 2:
+        return None
+
+    # Stratyfikacja wymaga co najmniej n_splits przykładów w każdej klasie
+    smallest = min(class_counts.values())
+    if smallest >= 2:
+        n_splits = min(folds, smallest)
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    else:
+        n_splits = min(folds, len(texts))
+        splitter = KFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    splits = [(train.tolist(), test.tolist()) for train, test in splitter.split(texts, labels)]
+
+    y_true, y_pred = [], []
+    workers = min(max_workers or os.cpu_count() or 1, n_splits)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(texts, labels, features, engine)) as pool:
+        for fold_true, fold_pred in pool.map(_evaluate_fold, splits):
+            y_true.extend(fold_true)
+            y_pred.extend(fold_pred)
+
+    classes = sorted(class_counts)
+    precision, recall, f1, support = precision_recall_fscore_support(
+        y_true, y_pred, labels=classes, zero_division=0
+    )
+
+    def pct(value):
+        return round(float(value) * 100, 1)
+
+    return {
+        "accuracy": pct(accuracy_score(y_true, y_pred)),
+        "precision": pct(np.mean(precision)),
+        "recall": pct(np.mean(recall)),
+        "f1_score": pct(np.mean(f1)),
+        "per_class": {
+            label: {
+                "precision": pct(precision[i]),
+                "recall": pct(recall[i]),
+                "f1_score": pct(f1[i]),
+                "support": int(support[i]),
+            }
+            for i, label in enumerate(classes)
+        },
+        "confusion_matrix": {
+            "labels": classes,
+            "matrix": confusion_matrix(y_true, y_pred, labels=classes).tolist(),
+        },
+        "folds": n_splits,
+        "evaluated_documents": len(texts),
+    }
+
+
+class ModelEvaluator:
+    """Wyniki ewaluacji per wersja modelu; liczone w tle, zapisywane obok artefaktu"""
+
+    RESULT_FILE = "evaluation.json"
+
+    def __init__(self, model_store, folds=None, max_workers=None, max_documents=None, db=None):
+        self.model_store = model_store
+        self.db = db  # źródło próbki dla modeli trenowanych bez korpusu (fit_parallel)
+        self.folds = folds or int(os.getenv('EVALUATION_FOLDS', '5'))
+        self.max_workers = max_workers or int(os.getenv('EVALUATION_WORKERS', '0')) or None
+        self.max_documents = max_documents or int(os.getenv('EVALUATION_MAX_DOCUMENTS', '20000'))
+        self._results = {}
+        self._running = set()
+        self._lock = threading.Lock()
+        # Jeden wątek sterujący pulą procesów - ewaluacje nie konkurują ze sobą
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='evaluation')
+
+    def get(self, version):
+        """Wynik dla wersji albo None (wtedy obliczenia zostają zlecone w tle).
+
+        Nieudana ewaluacja zwraca {"error": ...} i nie jest ponawiana przy
+        każdym odpytaniu - do restartu procesu.
+        """
+        if version is None:
+            return None
+        with self._lock:
+            if version in self._results:
+                return self._results[version]
+
+        result = self._load(version)
+        with self._lock:
+            if result is not None:
+                self._results[version] = result
+                return result
+            if version not in self._running:
+                self._running.add(version)
+                self._executor.submit(self._compute, version)
+        return None
+
+    def _compute(self, version):
+        try:
+            engine = self.model_store.load(version, with_corpus=True)
+            texts, labels = engine.training_texts, engine.training_labels
+            if not texts and self.db is not None:
+                texts, labels = self._sample_database()
+            result = evaluate(texts, labels, folds=self.folds,
+                              max_workers=self.max_workers, max_documents=self.max_documents,
+                              features=engine.features, engine=engine.engine)
+            if result is None:
+                result = {"error": "Not enough labelled documents to evaluate"}
+            result["model_version"] = version
+            self._save(version, result)
+        except Exception as e:
+            print(f"⚠️  Evaluation of model v{version} failed: {e}")
+            # Tylko w pamięci - po restarcie ewaluacja zostanie spróbowana ponownie
+            result = {"error": f"Evaluation failed: {e}", "model_version": version}
+        with self._lock:
+            self._results[version] = result
+            # Każdy feedback to nowa wersja - trzymaj tylko kilka ostatnich wyników
+            for old in sorted(self._results)[:-8]:
+                del self._results[old]
+            self._running.discard(version)
+
+    def _sample_database(self, seed=0):
+        """Losowa próbka max_documents dokumentów z bazy (reservoir sampling, jeden przebieg)"""
+        rng = np.random.default_rng(seed)
+        sample = []
+        for seen, doc in enumerate(self.db.iter_documents(batch_size=5000)):
+            if len(sample) < self.max_documents:
+                sample.append((doc[1], doc[2]))
+            else:
+                slot = rng.integers(0, seen + 1)
+                if slot < self.max_documents:
+                    sample[slot] = (doc[1], doc[2])
+        return [text for text, _ in sample], [label for _, label in sample]
+
+    def _load(self, version):
+        try:
+            with open(os.path.join(self.model_store.version_path(version), self.RESULT_FILE)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save(self, version, result):
+        path = os.path.join(self.model_store.version_path(version), self.RESULT_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(result, f)
+        os.replace(path + '.tmp', path)
\ No newline at end of file
@@ -0,0 +1,142 @@
+# core/export.py
+import csv
+import io
+import json
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # parquet jest opcjonalny - CSV i NDJSON działają bez pyarrow
+    pa = None
+    pq = None
+
+COLUMNS = ['id', 'text', 'area', 'subarea', 'created_at']
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def available_formats():
+    """Formaty dostępne w tej instalacji"""
+    return [name for name in EXPORT_FORMATS if name != 'parquet' or pa is not None]
+
+
+def _timestamp(value):
+    """PostgreSQL zwraca datetime, SQLite tekst - w eksporcie zawsze 'YYYY-MM-DD HH:MM:SS'"""
+    return value.isoformat(sep=' ') if isinstance(value, datetime) else value
+
+
+def _chunks(rows, chunk_rows):
+    """Grupuje strumień wierszy w listy po chunk_rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(rows, chunk_rows=1000):
+    """CSV (z nagłówkiem) jako strumień bajtów - format zgodny z importem"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(
+            (doc_id, text, area, subarea or '', _timestamp(created_at))
+            for doc_id, text, area, subarea, created_at in chunk
+        )
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def iter_ndjson(rows, chunk_rows=1000):
+    """Jeden obiekt JSON na linię"""
+    for chunk in _chunks(rows, chunk_rows):
+        yield ''.join(
+            json.dumps(dict(zip(COLUMNS, (doc_id, text, area, subarea, _timestamp(created_at)))),
+                       ensure_ascii=False) + '\n'
+            for doc_id, text, area, subarea, created_at in chunk
+        ).encode('utf-8')
+
+
+class _ChunkSink:
+    """Plik tylko do zapisu, z którego generator odbiera kolejne fragmenty parquet"""
+
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.parts)
+        self.parts = []
+        return data
+
+
+def iter_parquet(rows, chunk_rows=10000):
+    """Parquet: jedna grupa wierszy na paczkę, wysyłana zaraz po zapisaniu"""
+    if pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([
+        ('id', pa.int64()),
+        ('text', pa.string()),
+        ('area', pa.string()),
+        ('subarea', pa.string()),
+        ('created_at', pa.string()),
+    ])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    try:
+        for chunk in _chunks(rows, chunk_rows):
+            columns = list(zip(*chunk))
+            table = pa.Table.from_arrays([
+                pa.array(columns[0], pa.int64()),
+                pa.array(columns[1], pa.string()),
+                pa.array(columns[2], pa.string()),
+                pa.array(columns[3], pa.string()),
+                pa.array([_timestamp(value) for value in columns[4]], pa.string()),
+            ], schema=schema)
+            writer.write_table(table)
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_documents(db, fmt='csv', area=None, subarea=None, date_from=None, date_to=None,
+                     batch_size=1000):
+    """Generator bajtów eksportu - wiersze idą prosto z kursora bazy do wyjścia"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt} (choose from {', '.join(EXPORT_FORMATS)})")
+    if fmt == 'parquet' and pa is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    rows = db.iter_documents(area=area, subarea=subarea, date_from=date_from,
+                             date_to=date_to, batch_size=batch_size)
+    if fmt == 'csv':
+        return iter_csv(rows, batch_size)
+    if fmt == 'ndjson':
+        return iter_ndjson(rows, batch_size)
+    return iter_parquet(rows, max(batch_size, 10000))
\ No newline at end of file
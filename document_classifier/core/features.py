@@ -0,0 +1,65 @@
+# core/features.py
+import os
+
+import numpy as np
+
+from .stop_words import get_stop_words
+
+VECTORIZER_TYPES = ('tfidf', 'hashing')
+DTYPES = {'float32': np.float32, 'float64': np.float64}
+
+# Domyślnie jak dotąd (TF-IDF, 1000 cech, angielskie stop words), ale macierze float32
+DEFAULT_FEATURES = {
+    'tfidf': 1000,
+    'hashing': 2 ** 16,
+}
+
+
+def vectorizer_config(**overrides):
+    """Konfiguracja ekstrakcji cech ze zmiennych CLASSIFIER_* (nadpisywalna argumentami)"""
+    config = {
+        'vectorizer': os.getenv('CLASSIFIER_VECTORIZER', 'tfidf'),
+        'max_features': int(os.getenv('CLASSIFIER_MAX_FEATURES', '0')) or None,
+        'ngram_max': int(os.getenv('CLASSIFIER_NGRAM_MAX', '1')),
+        'stop_words': os.getenv('CLASSIFIER_STOP_WORDS', 'english'),
+        'dtype': os.getenv('CLASSIFIER_DTYPE', 'float32'),
+    }
+    config.update(overrides)
+
+    if config['vectorizer'] not in VECTORIZER_TYPES:
+        raise ValueError(f"Unknown vectorizer: {config['vectorizer']} (choose from {', '.join(VECTORIZER_TYPES)})")
+    if config['dtype'] not in DTYPES:
+        raise ValueError(f"Unknown dtype: {config['dtype']} (choose from {', '.join(DTYPES)})")
+    if config['ngram_max'] < 1:
+        raise ValueError("ngram_max must be at least 1")
+    if not config['max_features']:
+        config['max_features'] = DEFAULT_FEATURES[config['vectorizer']]
+    return config
+
+
+def build_vectorizer(config=None):
+    """Nowy (niedopasowany) wektoryzer według konfiguracji.
+
+    tfidf   - słownik w pamięci, max_features najczęstszych termów
+    hashing - bez słownika: termy haszowane do max_features kolumn, potem IDF;
+              szybszy fit i brak słownika w pamięci kosztem kolizji haszy
+              (NB trzyma klasy x max_features wag, więc rozmiar dobieraj do korpusu)
+    """
+    from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+    from sklearn.pipeline import Pipeline
+
+    config = config or vectorizer_config()
+    dtype = DTYPES[config['dtype']]
+    common = {
+        'stop_words': get_stop_words(config['stop_words']),
+        'ngram_range': (1, config['ngram_max']),
+        'dtype': dtype,
+    }
+
+    if config['vectorizer'] == 'hashing':
+        return Pipeline([
+            ('hashing', HashingVectorizer(n_features=config['max_features'], alternate_sign=False,
+                                          norm=None, **common)),
+            ('tfidf', TfidfTransformer()),
+        ])
+    return TfidfVectorizer(max_features=config['max_features'], **common)
\ No newline at end of file
@@ -0,0 +1,221 @@
+# core/import_jobs.py
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .csv_import import import_csv
+
+try:
+    import fcntl
+except ImportError:  # Windows - lokalnie i tak działa jeden proces
+    fcntl = None
+
+
+class ImportJobManager:
+    """Importy CSV w tle z postępem, checkpointem i automatycznym retreningiem.
+
+    Plik jest kopiowany na dysk, a stan zadania (łącznie z numerem ostatniego
+    zapisanego wiersza) trafia do <job_id>.json po każdej paczce. Po awarii
+    resume_incomplete() wznawia import od checkpointu - w najgorszym razie
+    powtarza jedną paczkę. Zadania wykonują się po kolei; retrening odpala się
+    raz, gdy kolejka importów się opróżni.
+    """
+
+    def __init__(self, db, on_complete=None, root=None, batch_size=1000):
+        self.db = db
+        self.on_complete = on_complete
+        self.root = root or os.getenv('IMPORT_JOBS_DIR', 'data/imports')
+        self.batch_size = batch_size
+        os.makedirs(self.root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._pending = 0
+        self._imported_since_retrain = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='csv-import')
+
+    def _path(self, job_id, suffix):
+        return os.path.join(self.root, f"{job_id}{suffix}")
+
+    def submit(self, stream, filename):
+        """Zapisuje upload na dysk (strumieniowo) i kolejkuje import"""
+        job_id = uuid.uuid4().hex
+        with open(self._path(job_id, '.csv'), 'wb') as f:
+            shutil.copyfileobj(stream, f, length=1024 * 1024)
+
+        state = {
+            "job_id": job_id,
+            "filename": filename,
+            "status": "queued",
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "rows_parsed": 0,
+            "imported_rows": 0,
+            "rejected_rows": 0,
+            "rows_checkpoint": 0,
+            "elapsed_seconds": 0.0,
+            "errors": [],
+            "message": "Waiting in queue",
+            "retrain": None,
+        }
+        self._save(state)
+        self._schedule(job_id)
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """Stan zadania z przepustowością (wiersze/s)"""
+        if not re.fullmatch(r'[0-9a-f]{32}', job_id):
+            return None
+        with self._lock:
+            state = self._jobs.get(job_id)
+        if state is None:
+            state = self._load(job_id)
+        if state is None:
+            return None
+        state = dict(state)
+        elapsed = state["elapsed_seconds"]
+        state["rows_per_second"] = round(state["rows_parsed"] / elapsed, 1) if elapsed else 0.0
+        return state
+
+    def list(self):
+        """Wszystkie znane zadania, od najnowszych"""
+        job_ids = [name[:-5] for name in os.listdir(self.root) if name.endswith('.json')]
+        jobs = [self.get(job_id) for job_id in job_ids]
+        return sorted((job for job in jobs if job), key=lambda job: job["created_at"], reverse=True)
+
+    def resume_incomplete(self):
+        """Wznawia zadania przerwane przez restart lub awarię procesu"""
+        resumed = []
+        for job in self.list():
+            if job["status"] in ("queued", "running"):
+                self._schedule(job["job_id"])
+                resumed.append(job["job_id"])
+        return resumed
+
+    def _schedule(self, job_id):
+        with self._lock:
+            self._pending += 1
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        try:
+            lock_file = self._acquire(job_id)
+            if lock_file is None:
+                return  # inny proces już prowadzi to zadanie
+            try:
+                self._import(job_id)
+            finally:
+                lock_file.close()
+        finally:
+            with self._lock:
+                self._pending -= 1
+                retrain = self._pending == 0 and self._imported_since_retrain > 0
+                if retrain:
+                    self._imported_since_retrain = 0
+            if retrain:
+                self._retrain()
+
+    def _acquire(self, job_id):
+        lock_file = open(self._path(job_id, '.lock'), 'a+')
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock_file.close()
+                return None
+        return lock_file
+
+    def _import(self, job_id):
+        state = self._load(job_id)
+        if state is None or state["status"] not in ("queued", "running"):
+            return
+
+        # Liczniki sprzed checkpointu - postęp bieżącego przebiegu jest do nich dodawany
+        base_imported = state["imported_rows"]
+        base_rejected = state["rejected_rows"]
+        base_elapsed = state["elapsed_seconds"]
+        started = time.monotonic()
+
+        state["status"] = "running"
+        state["started_at"] = state["started_at"] or datetime.now().isoformat()
+        state["message"] = f"Importing (resumed from row {state['rows_checkpoint']})" \
+            if state["rows_checkpoint"] else "Importing"
+        self._save(state)
+
+        def on_batch(progress):
+            state["rows_parsed"] = progress["rows_parsed"]
+            state["rows_checkpoint"] = progress["rows_parsed"]
+            state["imported_rows"] = base_imported + progress["imported_rows"]
+            state["rejected_rows"] = base_rejected + progress["rejected_rows"]
+            state["elapsed_seconds"] = round(base_elapsed + time.monotonic() - started, 3)
+            self._save(state)
+
+        try:
+            with open(self._path(job_id, '.csv'), 'rb') as f:
+                result = import_csv(f, self.db, batch_size=self.batch_size,
+                                    skip_rows=state["rows_checkpoint"], on_batch=on_batch)
+        except Exception as e:
+            state["status"] = "failed"
+            state["message"] = f"Import failed: {e}"
+            state["finished_at"] = datetime.now().isoformat()
+            self._save(state)
+            return
+
+        # Wynik dotyczy tylko tego przebiegu - po wznowieniu liczą się sumy od początku zadania
+        state["imported_rows"] = base_imported + result["imported_rows"]
+        state["rejected_rows"] = base_rejected + result["rejected_rows"]
+        state["errors"] = state["errors"] + result["errors"]
+        state["rows_parsed"] = max(result["total_rows"], state["rows_parsed"])
+        if state["imported_rows"]:
+            state["status"] = "completed"
+            state["message"] = (f"Successfully imported {state['imported_rows']} of {state['rows_parsed']} documents"
+                                f" ({state['rejected_rows']} rejected)")
+        else:
+            state["status"] = "failed"
+            state["message"] = result["message"]
+        state["elapsed_seconds"] = round(base_elapsed + time.monotonic() - started, 3)
+        state["finished_at"] = datetime.now().isoformat()
+        state["retrain"] = "pending" if state["imported_rows"] and self.on_complete else None
+        self._save(state)
+
+        with self._lock:
+            self._imported_since_retrain += state["imported_rows"]
+        os.remove(self._path(job_id, '.csv'))
+
+    def _retrain(self):
+        """Jeden retrening po wszystkich zakończonych importach"""
+        if self.on_complete is None:
+            return
+        try:
+            result = self.on_complete()
+            outcome = result.get("message") if isinstance(result, dict) else "done"
+        except Exception as e:
+            outcome = f"Retrain failed: {e}"
+        for job in self.list():
+            if job["retrain"] == "pending":
+                state = self._load(job["job_id"])
+                state["retrain"] = outcome
+                self._save(state)
+
+    def _load(self, job_id):
+        try:
+            with open(self._path(job_id, '.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save(self, state):
+        """Atomowy zapis stanu - po awarii plik jest zawsze kompletny"""
+        path = self._path(state["job_id"], '.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(path + '.tmp', path)
+        with self._lock:
+            self._jobs[state["job_id"]] = dict(state)
\ No newline at end of file
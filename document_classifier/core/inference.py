@@ -0,0 +1,141 @@
+# core/inference.py
+import numpy as np
+
+
+class InferenceKernel:
+    """Predykcja pojedynczego dokumentu bez narzutu sklearn (walidacja, dispatch, macierze sparse).
+
+    Tokenizacja tym samym analizatorem co wektoryzer, potem zliczenia -> TF-IDF ->
+    normalizacja -> iloczyn z wagami modelu liniowego (klasy x cechy) + bias -> link:
+    softmax dla NB (wagi to log-prawdopodobieństwa cech), sigmoidy one-vs-rest
+    dla regresji logistycznej (SGD). Tablice wag są używane bez kopiowania, więc
+    model zmapowany z dysku (mmap) pozostaje współdzielony między procesami.
+    """
+
+    def __init__(self, analyzer, classes, weights, bias, link='softmax', idf=None,
+                 vocabulary=None, n_features=None, norm='l2', sublinear_tf=False, binary=False,
+                 dtype=np.float64):
+        self.analyzer = analyzer
+        self.classes = classes
+        self.weights = weights  # (klasy, cechy); przy link='binary' jeden wiersz dla classes[1]
+        self.bias = bias
+        self.link = link
+        self.idf = idf
+        self.vocabulary = vocabulary  # dict term -> kolumna albo None przy haszowaniu
+        self.n_features = n_features
+        self.norm = norm
+        self.sublinear_tf = sublinear_tf
+        self.binary = binary
+        self.dtype = dtype
+
+    @classmethod
+    def from_fitted(cls, vectorizer, model):
+        """Kernel dla dopasowanej pary wektoryzer + model (NB, Complement NB, SGD) albo None, gdy nieobsługiwana"""
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
+        from sklearn.pipeline import Pipeline
+
+        params = cls._model_params(model)
+        if params is None:
+            return None
+
+        if isinstance(vectorizer, TfidfVectorizer):
+            if not hasattr(vectorizer, 'vocabulary_'):
+                return None
+            return cls(
+                vectorizer.build_analyzer(),
+                vocabulary=vectorizer.vocabulary_,
+                idf=vectorizer.idf_ if vectorizer.use_idf else None,
+                norm=vectorizer.norm,
+                sublinear_tf=vectorizer.sublinear_tf,
+                binary=vectorizer.binary,
+                dtype=vectorizer.dtype,
+                **params
+            )
+
+        if isinstance(vectorizer, Pipeline) and len(vectorizer.steps) == 2:
+            hashing, tfidf = vectorizer.steps[0][1], vectorizer.steps[1][1]
+            if not isinstance(hashing, HashingVectorizer) or hashing.alternate_sign or hashing.norm:
+                return None
+            return cls(
+                hashing.build_analyzer(),
+                n_features=hashing.n_features,
+                idf=tfidf.idf_ if tfidf.use_idf else None,
+                norm=tfidf.norm,
+                sublinear_tf=tfidf.sublinear_tf,
+                binary=hashing.binary,
+                dtype=hashing.dtype,
+                **params
+            )
+        return None
+
+    @staticmethod
+    def _model_params(model):
+        """Wagi, bias i link odtwarzające predict_proba modelu (albo None)"""
+        from sklearn.linear_model import SGDClassifier
+        from sklearn.naive_bayes import ComplementNB, MultinomialNB
+
+        if isinstance(model, MultinomialNB) and hasattr(model, 'feature_log_prob_'):
+            return {'classes': model.classes_, 'weights': model.feature_log_prob_,
+                    'bias': model.class_log_prior_, 'link': 'softmax'}
+        if isinstance(model, ComplementNB) and hasattr(model, 'feature_log_prob_'):
+            # Complement NB dodaje prior tylko przy jednej klasie (jak sklearn _joint_log_likelihood)
+            bias = model.class_log_prior_ if len(model.classes_) == 1 else np.zeros(len(model.classes_))
+            return {'classes': model.classes_, 'weights': model.feature_log_prob_,
+                    'bias': bias, 'link': 'softmax'}
+        if isinstance(model, SGDClassifier) and model.loss == 'log_loss' and hasattr(model, 'coef_'):
+            return {'classes': model.classes_, 'weights': model.coef_, 'bias': model.intercept_,
+                    'link': 'binary' if len(model.classes_) == 2 else 'ovr'}
+        return None
+
+    def features(self, text):
+        """Indeksy i wagi niezerowych cech dokumentu (odpowiednik jednego wiersza macierzy sparse)"""
+        counts = {}
+        if self.vocabulary is not None:
+            vocabulary = self.vocabulary
+            for token in self.analyzer(text):
+                index = vocabulary.get(token)
+                if index is not None:
+                    counts[index] = counts.get(index, 0) + 1
+        else:
+            from sklearn.utils import murmurhash3_32
+            n_features = self.n_features
+            for token in self.analyzer(text):
+                index = abs(murmurhash3_32(token)) % n_features  # jak HashingVectorizer
+                counts[index] = counts.get(index, 0) + 1
+
+        indices = np.fromiter(counts.keys(), dtype=np.intp, count=len(counts))
+        values = np.fromiter(counts.values(), dtype=self.dtype, count=len(counts))
+        if self.binary:
+            values[:] = 1
+        if self.sublinear_tf:
+            values = np.log(values) + 1
+        if self.idf is not None:
+            values = values * self.idf[indices].astype(self.dtype, copy=False)
+        if self.norm == 'l2':
+            length = np.sqrt(np.dot(values, values))
+            if length:
+                values = values / length
+        elif self.norm == 'l1':
+            length = np.abs(values).sum()
+            if length:
+                values = values / length
+        return indices, values
+
+    def predict_log_proba(self, text):
+        """Znormalizowane log-prawdopodobieństwa klas (kolejność jak self.classes)"""
+        indices, values = self.features(text)
+        scores = self.bias + self.weights[:, indices] @ values.astype(np.float64)
+        if self.link == 'softmax':
+            return scores - np.logaddexp.reduce(scores)
+        if self.link == 'binary':
+            # [1 - sigmoid(d), sigmoid(d)] w skali log
+            return np.array([-np.logaddexp(0, scores[0]), -np.logaddexp(0, -scores[0])])
+        # one-vs-rest: sigmoidy klas znormalizowane do sumy 1 (sklearn _predict_proba_lr)
+        log_sigmoid = -np.logaddexp(0, -scores)
+        return log_sigmoid - np.logaddexp.reduce(log_sigmoid)
+
+    def predict(self, text):
+        """(etykieta, pewność) - to samo co model.predict / max(model.predict_proba)"""
+        log_proba = self.predict_log_proba(text)
+        best = int(np.argmax(log_proba))
+        return self.classes[best], float(np.exp(log_proba[best]))
\ No newline at end of file
@@ -0,0 +1,163 @@
+# core/model_store.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from .classifier import ClassificationEngine
+from .neighbors import NeighborIndex
+
+try:
+    import fcntl
+except ImportError:  # Windows - lokalnie i tak działa jeden proces
+    fcntl = None
+
+
+class ModelStore:
+    """Wspólny artefakt modelu publikowany przez jeden proces i mapowany (mmap) przez pozostałe"""
+
+    MODEL_FILE = "model.joblib"
+    CORPUS_FILE = "corpus.joblib"
+    NEIGHBORS_FILE = "neighbors.joblib"
+
+    def __init__(self, root=None, check_interval=None, keep_versions=3, pinned=None):
+        self.root = root or os.getenv('MODEL_STORE_DIR', 'data/models')
+        if check_interval is None:
+            check_interval = float(os.getenv('MODEL_CHECK_INTERVAL', '2'))
+        self.check_interval = check_interval
+        self.keep_versions = keep_versions
+        # Źródło przypiętej wersji (np. ustawienia wspólne dla procesów) - nie jest usuwana przy sprzątaniu
+        self.pinned = pinned
+        os.makedirs(self.root, exist_ok=True)
+
+        self._pointer_path = os.path.join(self.root, 'CURRENT')
+        self._lock_path = os.path.join(self.root, '.lock')
+        self._thread_lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+        self._last_check = 0.0
+
+    def version_path(self, version):
+        """Katalog z plikami danej wersji modelu"""
+        return os.path.join(self.root, f"v{version:06d}")
+
+    @contextmanager
+    def lock(self):
+        """Blokada między procesami (reentrant w obrębie procesu)"""
+        with self._thread_lock:
+            if self._lock_depth == 0:
+                self._lock_file = open(self._lock_path, 'a+')
+                if fcntl is not None:
+                    fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+    def current_version(self):
+        """Zwraca numer aktualnie opublikowanej wersji (albo None)"""
+        try:
+            with open(self._pointer_path) as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def poll(self, known_version):
+        """Tania kontrola czy pojawiła się nowa wersja - najwyżej raz na check_interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return None
+        self._last_check = now
+        latest = self.current_version()
+        if latest is not None and latest != known_version:
+            return latest
+        return None
+
+    def publish(self, engine):
+        """Zapisuje model jako nową wersję i atomowo przestawia wskaźnik CURRENT"""
+        import joblib
+
+        with self.lock():
+            version = (self.current_version() or 0) + 1
+            tmp_dir = tempfile.mkdtemp(prefix='.publish-', dir=self.root)
+            try:
+                # Bez kompresji - tablice numpy muszą dać się zmapować przy odczycie
+                joblib.dump(engine.export_state(), os.path.join(tmp_dir, self.MODEL_FILE))
+                joblib.dump(engine.export_corpus(), os.path.join(tmp_dir, self.CORPUS_FILE))
+                neighbors = engine.export_neighbors()
+                if neighbors is not None:
+                    joblib.dump(neighbors, os.path.join(tmp_dir, self.NEIGHBORS_FILE))
+                os.replace(tmp_dir, self.version_path(version))
+            except Exception:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                raise
+
+            tmp_pointer = self._pointer_path + '.tmp'
+            with open(tmp_pointer, 'w') as f:
+                f.write(str(version))
+            os.replace(tmp_pointer, self._pointer_path)
+
+            engine.model_version = version
+            self._cleanup(version)
+            return version
+
+    def load(self, version=None, with_corpus=False, attempts=3):
+        """Ładuje wersję modelu; tablice są mapowane read-only i współdzielone przez page cache.
+
+        Bez version - najnowszą; gdy w międzyczasie inny proces ją wyparł i usunął
+        (_cleanup), odczyt jest ponawiany z nowym CURRENT. Wskazana wersja, której
+        nie ma, daje FileNotFoundError.
+        """
+        if version is not None:
+            return self._load(version, with_corpus)
+        for attempt in range(attempts):
+            version = self.current_version()
+            if version is None:
+                return None
+            try:
+                return self._load(version, with_corpus)
+            except FileNotFoundError:
+                if attempt == attempts - 1 or self.current_version() == version:
+                    raise
+
+    def _load(self, version, with_corpus):
+        import joblib
+
+        path = self.version_path(version)
+        state = joblib.load(os.path.join(path, self.MODEL_FILE), mmap_mode='r')
+        corpus = None
+        if with_corpus:
+            corpus = joblib.load(os.path.join(path, self.CORPUS_FILE))
+
+        engine = ClassificationEngine.from_state(state, corpus)
+        engine.model_version = version
+        neighbors_path = os.path.join(path, self.NEIGHBORS_FILE)
+        if os.path.exists(neighbors_path):
+            engine.neighbors = NeighborIndex.from_state(joblib.load(neighbors_path, mmap_mode='r'))
+        return engine
+
+    def _cleanup(self, current):
+        """Usuwa stare wersje (zmapowane pliki pozostają ważne do czasu przeładowania)"""
+        try:
+            pinned = self.pinned() if self.pinned is not None else None
+        except Exception as e:
+            # Nie wiadomo, co jest przypięte - lepiej zostawić stare wersje do następnej publikacji
+            print(f"⚠️  Skipping model cleanup, pinned version unknown: {e}")
+            return
+        for name in os.listdir(self.root):
+            if not name.startswith('v'):
+                continue
+            try:
+                version = int(name[1:])
+            except ValueError:
+                continue
+            if version <= current - self.keep_versions and version != pinned:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,213 @@
+# core/near_duplicates.py
+import os
+import re
+import sqlite3
+import threading
+import zlib
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+class MinHasher:
+    """Sygnatury MinHash ze znakowych 5-gramów (shingli) - przybliżają podobieństwo Jaccarda.
+
+    Znakowe shingle są odporne na drobne zmiany (numer faktury, data), które
+    w krótkich tekstach psułyby większość słownych n-gramów.
+    """
+
+    def __init__(self, num_perm=64, shingle_size=5, seed=1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # a*h + b mieści się w uint64: a, b, h < 2^32
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text):
+        normalized = ' '.join(_TOKEN.findall(text.lower()))
+        size = self.shingle_size
+        if len(normalized) <= size:
+            return {normalized} if normalized else set()
+        return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+    def signature(self, text):
+        """Wektor num_perm minimów (uint32) - jeden przebieg numpy na dokument"""
+        shingles = self.shingles(text)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _MERSENNE_PRIME
+        return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """Indeks LSH (MinHash w pasmach) nad zapisanymi dokumentami, trwały w pliku SQLite.
+
+    Sygnatura jest dzielona na bands pasm po num_perm/bands wartości; dokumenty
+    z identycznym pasmem trafiają do tego samego kubełka. Zapytanie czyta tylko
+    swoje kubełki (indeks po (band, key)), więc koszt nie rośnie z liczbą
+    dokumentów; kandydaci są weryfikowani szacowanym Jaccardem >= threshold.
+    Indeks jest uzupełniany przy każdym zapisie dokumentu (listener
+    DatabaseManager), a sync() nadrabia dokumenty zapisane poza tym procesem -
+    przy starcie i przed zapytaniami (DocumentService.find_duplicates).
+    """
+
+    def __init__(self, path=None, num_perm=64, bands=16, threshold=0.8, max_candidates=200):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path or os.getenv('NEAR_DUPLICATES_INDEX', 'data/near_duplicates.db')
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._band_coefficients = np.random.RandomState(2).randint(
+            1, 1 << 63, size=self.rows, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.threshold = threshold
+        self.max_candidates = max_candidates  # limit na kubełek - szablony potrafią mieć tysiące kopii
+        self._sync_lock = threading.Lock()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_index()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _init_index(self):
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # czytelnicy z innych procesów nie blokują zapisu
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS minhash_signatures (
+                    doc_id INTEGER PRIMARY KEY,
+                    area TEXT NOT NULL,
+                    subarea TEXT,
+                    signature BLOB NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    key INTEGER NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    PRIMARY KEY (band, key, doc_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT)")
+            params = f"{self.hasher.num_perm}/{self.bands}/{self.hasher.shingle_size}"
+            row = conn.execute("SELECT value FROM index_meta WHERE key = 'params'").fetchone()
+            if row is None:
+                conn.execute("INSERT INTO index_meta (key, value) VALUES ('params', ?)", (params,))
+            elif row[0] != params:
+                raise ValueError(f"Index {self.path} was built with num_perm/bands/shingle {row[0]}, not {params}")
+
+    def _band_keys(self, signature):
+        """Klucz kubełka każdego pasma: losowa kombinacja liniowa jego wartości modulo 2^64"""
+        bands = signature.reshape(self.bands, self.rows).astype(np.uint64)
+        return (bands * self._band_coefficients).sum(axis=1).view(np.int64).tolist()
+
+    def add_documents(self, documents, synced=False):
+        """Dodaje dokumenty [(id, text, area, subarea)] w jednej transakcji (powtórki są ignorowane).
+
+        Znacznik synced_through przesuwa się, gdy dokumenty domykają ciągłość
+        z nim (np. listener zapisu po nadrobieniu zaległości) albo gdy synced=True
+        (sync() czyta wszystko od znacznika) - inaczej sync() nadrobi lukę.
+        """
+        signatures, buckets = [], []
+        for doc_id, text, area, subarea in documents:
+            signature = self.hasher.signature(text)
+            signatures.append((doc_id, area, subarea, signature.tobytes()))
+            buckets.extend((band, key, doc_id) for band, key in enumerate(self._band_keys(signature)))
+        if not signatures:
+            return 0
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO minhash_signatures (doc_id, area, subarea, signature) VALUES (?, ?, ?, ?)",
+                signatures
+            )
+            conn.executemany("INSERT OR IGNORE INTO lsh_buckets (band, key, doc_id) VALUES (?, ?, ?)", buckets)
+            # Odczyt po zapisie - w tej samej transakcji, pod blokadą zapisu pliku indeksu
+            ids = [signature[0] for signature in signatures]
+            if synced or min(ids) <= self._synced_through(conn) + 1:
+                conn.execute("""
+                    INSERT INTO index_meta (key, value) VALUES ('synced_through', ?)
+                    ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))
+                """, (str(max(ids)),))
+        return len(signatures)
+
+    def _synced_through(self, conn):
+        row = conn.execute("SELECT value FROM index_meta WHERE key = 'synced_through'").fetchone()
+        return int(row[0]) if row else 0
+
+    def query(self, text, threshold=None, limit=10, exclude_id=None):
+        """Dokumenty podobne do tekstu: [{id, similarity, area, subarea}] od najbardziej podobnych"""
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.hasher.signature(text)
+        with self._connect() as conn:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(doc_id for (doc_id,) in conn.execute(
+                    "SELECT doc_id FROM lsh_buckets WHERE band = ? AND key = ? LIMIT ?",
+                    (band, key, self.max_candidates)
+                ))
+            candidates.discard(exclude_id)
+            if not candidates:
+                return []
+            rows = []
+            ids = sorted(candidates)
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows.extend(conn.execute(
+                    f"SELECT doc_id, area, subarea, signature FROM minhash_signatures "
+                    f"WHERE doc_id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+
+        matrix = np.frombuffer(b''.join(row[3] for row in rows), dtype=np.uint32).reshape(len(rows), -1)
+        similarity = (matrix == signature).mean(axis=1)
+        order = np.argsort(-similarity, kind='stable')
+        return [
+            {
+                'id': rows[i][0],
+                'similarity': round(float(similarity[i]), 3),
+                'area': rows[i][1],
+                'subarea': rows[i][2],
+            }
+            for i in order[:limit] if similarity[i] >= threshold
+        ]
+
+    def count(self):
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM minhash_signatures").fetchone()[0]
+
+    def sync(self, db, batch_size=5000, limit=None, blocking=True):
+        """Dopisuje dokumenty zapisane od ostatniej synchronizacji (przed powstaniem indeksu albo
+        przez inne procesy). limit - najwyżej tyle dokumentów w tym wywołaniu; blocking=False -
+        0 bez czekania, gdy synchronizacja już trwa."""
+        if not self._sync_lock.acquire(blocking):
+            return 0
+        try:
+            with self._connect() as conn:
+                synced_through = self._synced_through(conn)
+
+            if limit is not None:
+                batch_size = min(batch_size, limit)
+            added = 0
+            batch = []
+            documents = db.iter_documents(after_id=synced_through, batch_size=batch_size)
+            try:
+                for doc_id, text, area, subarea, _ in documents:
+                    batch.append((doc_id, text, area, subarea))
+                    if len(batch) >= batch_size:
+                        added += self.add_documents(batch, synced=True)
+                        batch = []
+                        if limit is not None and added >= limit:
+                            break
+            finally:
+                documents.close()
+            added += self.add_documents(batch, synced=True)
+            return added
+        finally:
+            self._sync_lock.release()
\ No newline at end of file
@@ -0,0 +1,94 @@
+# core/neighbors.py
+import numpy as np
+
+PREVIEW_LENGTH = 200
+
+
+class NeighborIndex:
+    """Najbliższe oznaczone przykłady w przestrzeni cech modelu (odwrócony indeks).
+
+    Macierz TF-IDF korpusu treningowego w układzie CSC: kolumna cechy to lista
+    dokumentów, w których występuje, z wagami. Wiersze są znormalizowane L2,
+    więc iloczyn z wektorem zapytania to podobieństwo cosinusowe, a zapytanie
+    czyta tylko listy swoich cech zamiast skanować cały korpus. Wszystkie dane
+    to płaskie tablice numpy - po zapisie obok modelu są mapowane (mmap).
+    """
+
+    def __init__(self, indptr, indices, data, label_codes, classes, text_blob, text_offsets):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.label_codes = label_codes
+        self.classes = classes
+        self.text_blob = text_blob
+        self.text_offsets = text_offsets
+
+    @classmethod
+    def build(cls, matrix, texts, labels):
+        """Z macierzy cech (dokumenty x cechy), tekstów i etykiet w tej samej kolejności"""
+        from scipy import sparse
+
+        csc = sparse.csc_matrix(matrix, dtype=np.float32)
+        csc.sort_indices()
+        classes, label_codes = np.unique(np.asarray(labels, dtype=object).astype(str), return_inverse=True)
+        previews = [text[:PREVIEW_LENGTH].encode('utf-8') for text in texts]
+        offsets = np.zeros(len(previews) + 1, dtype=np.int64)
+        np.cumsum([len(preview) for preview in previews], out=offsets[1:])
+        return cls(
+            csc.indptr.astype(np.int64), csc.indices.astype(np.int32), csc.data,
+            label_codes.astype(np.int32), classes,
+            np.frombuffer(b''.join(previews), dtype=np.uint8), offsets
+        )
+
+    def export_state(self):
+        return {
+            'indptr': self.indptr,
+            'indices': self.indices,
+            'data': self.data,
+            'label_codes': self.label_codes,
+            'classes': self.classes,
+            'text_blob': self.text_blob,
+            'text_offsets': self.text_offsets,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(**state)
+
+    def __len__(self):
+        return len(self.label_codes)
+
+    def _text(self, row):
+        start, end = self.text_offsets[row], self.text_offsets[row + 1]
+        return self.text_blob[start:end].tobytes().decode('utf-8', errors='replace')
+
+    def query(self, indices, values, k=5):
+        """Top-k dokumentów dla wektora zapytania (indeksy cech, wagi): [{similarity, area, text}]"""
+        n_features = len(self.indptr) - 1
+        keep = indices < n_features
+        indices, values = indices[keep], values[keep]
+        if not len(indices):
+            return []
+
+        starts, ends = self.indptr[indices], self.indptr[indices + 1]
+        lengths = ends - starts
+        if not lengths.sum():
+            return []
+        # Listy dokumentów dla cech zapytania, sklejone w jeden wektor
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        rows = self.indices[positions]
+        weights = self.data[positions].astype(np.float64) * np.repeat(values.astype(np.float64), lengths)
+
+        candidates, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [
+            {
+                'similarity': round(float(scores[i]), 4),
+                'area': str(self.classes[self.label_codes[candidates[i]]]),
+                'text': self._text(candidates[i]),
+            }
+            for i in top
+        ]
\ No newline at end of file
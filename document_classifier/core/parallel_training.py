@@ -0,0 +1,141 @@
+# core/parallel_training.py
+import os
+import tempfile
+import uuid
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .features import DEFAULT_FEATURES, DTYPES, build_vectorizer
+
+# Wektoryzer trafia do workera raz (initializer), a nie z każdą paczką
+_worker_vectorizer = None
+
+
+def _init_worker(vectorizer):
+    global _worker_vectorizer
+    _worker_vectorizer = vectorizer
+
+
+def _count_document_frequency(task):
+    """Przebieg 1: haszowanie paczki (zapis na dysk) + częstości dokumentowe i liczność klas"""
+    from scipy import sparse
+
+    path, texts, labels = task
+    X = _worker_vectorizer.named_steps['hashing'].transform(texts).tocsr()
+    sparse.save_npz(path, X, compressed=False)
+    df = np.bincount(X.indices, minlength=X.shape[1]).astype(np.int64)
+    return path, labels, df, Counter(labels)
+
+
+def _sum_class_features(task):
+    """Przebieg 2: suma wektorów TF-IDF per klasa (statystyki dostateczne NB)"""
+    from scipy import sparse
+
+    path, labels = task
+    tfidf = _worker_vectorizer.named_steps['tfidf']
+    X = tfidf.transform(sparse.load_npz(path)).astype(np.float64)
+    os.remove(path)
+    labels = np.asarray(labels)
+    sums = {}
+    for label in np.unique(labels):
+        sums[label] = np.asarray(X[labels == label].sum(axis=0)).ravel()
+    return sums
+
+
+def _chunks(documents, chunk_size, directory):
+    texts, labels = [], []
+    for text, label in documents:
+        texts.append(text)
+        labels.append(label)
+        if len(texts) >= chunk_size:
+            yield os.path.join(directory, f"chunk{uuid.uuid4().hex}.npz"), texts, labels
+            texts, labels = [], []
+    if texts:
+        yield os.path.join(directory, f"chunk{uuid.uuid4().hex}.npz"), texts, labels
+
+
+def _map_unordered(pool, fn, chunks, max_in_flight):
+    """Jak pool.map, ale z ograniczoną liczbą paczek w locie - korpus nie trafia cały do pamięci"""
+    pending = set()
+    for chunk in chunks:
+        pending.add(pool.submit(fn, chunk))
+        if len(pending) >= max_in_flight:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    for future in pending:
+        yield future.result()
+
+
+def nb_from_counts(classes, feature_counts, class_counts, alpha=1.0, estimator=None):
+    """Model NB (Multinomial/Complement) z gotowych liczników (klasy x cechy) - przez publiczne partial_fit.
+
+    Każda klasa wchodzi jako jeden "dokument" feature_counts/class_count z wagą
+    class_count, co daje dokładnie feature_count_ = feature_counts i class_count_ = class_counts.
+    Domyślny estimator to MultinomialNB.
+    """
+    if estimator is None:
+        from sklearn.naive_bayes import MultinomialNB as estimator
+    class_counts = np.asarray(class_counts, dtype=np.float64)
+    rows = np.asarray(feature_counts, dtype=np.float64) / class_counts[:, None]
+    model = estimator(alpha=alpha)
+    model.partial_fit(rows, np.asarray(classes), classes=np.asarray(classes), sample_weight=class_counts)
+    return model
+
+
+def fit_hashed_parallel(documents, config, workers=None, chunk_size=5000, estimator=None):
+    """Trening NB (estimator: MultinomialNB - domyślnie - albo ComplementNB) na haszowanych cechach w puli procesów.
+
+    documents - iterator (text, label), np. strumień z bazy; czytany raz.
+    Przebieg 1 haszuje paczki w workerach (macierze zliczeń trafiają do plików
+    tymczasowych) i sumuje częstości dokumentowe do IDF. Przebieg 2 liczy w
+    workerach sumy wektorów TF-IDF per klasa. Wyniki paczek po prostu się
+    dodają, więc czas skaluje się z liczbą rdzeni. Zwraca (vectorizer, model, liczniki klas).
+    """
+    if config['vectorizer'] != 'hashing':
+        # Wspólna przestrzeń cech bez słownika - tylko haszowanie da się liczyć niezależnie w workerach
+        config = dict(config, vectorizer='hashing', max_features=DEFAULT_FEATURES['hashing'])
+    workers = workers or os.cpu_count() or 1
+    n_features = config['max_features']
+    dtype = DTYPES[config['dtype']]
+    vectorizer = build_vectorizer(config)
+
+    with tempfile.TemporaryDirectory(prefix='nb-train-') as directory:
+        df = np.zeros(n_features, dtype=np.int64)
+        class_counts = Counter()
+        shards = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(vectorizer,)) as pool:
+            for path, labels, chunk_df, chunk_counts in _map_unordered(
+                    pool, _count_document_frequency, _chunks(documents, chunk_size, directory), workers * 2):
+                df += chunk_df
+                class_counts.update(chunk_counts)
+                shards.append((path, labels))
+
+        n_documents = sum(class_counts.values())
+        if len(class_counts) < 2:
+            return None, None, class_counts
+
+        tfidf = vectorizer.named_steps['tfidf']
+        # To samo wygładzone IDF, które policzyłby TfidfTransformer.fit na całym korpusie
+        idf = np.full(n_features, n_documents + int(tfidf.smooth_idf), dtype=dtype)
+        idf /= (df + int(tfidf.smooth_idf)).astype(dtype)
+        np.log(idf, out=idf)
+        idf += 1.0
+        tfidf.idf_ = idf
+        tfidf.n_features_in_ = n_features
+
+        classes = sorted(class_counts)
+        index = {label: i for i, label in enumerate(classes)}
+        feature_counts = np.zeros((len(classes), n_features), dtype=np.float64)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(vectorizer,)) as pool:
+            for sums in _map_unordered(pool, _sum_class_features, shards, workers * 2):
+                for label, row in sums.items():
+                    feature_counts[index[label]] += row
+
+    model = nb_from_counts(classes, feature_counts, [class_counts[label] for label in classes],
+                           estimator=estimator)
+    return vectorizer, model, class_counts
\ No newline at end of file
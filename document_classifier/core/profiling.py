@@ -0,0 +1,276 @@
+# core/profiling.py
+import cProfile
+import hmac
+import itertools
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+MODES = ('cprofile', 'sample')
+TOKEN_HEADER = b'x-profile-token'
+
+
+class StackSampler:
+    """Próbkujący profiler: co interval sekund zapisuje stosy wszystkich wątków (poza własnym).
+
+    Narzut nie zależy od liczby wywołań funkcji, a w odróżnieniu od cProfile widzi
+    też wątki puli (endpointy def w FastAPI). Wynik w formacie "collapsed stacks"
+    (ramka;ramka;ramka liczba) - wejście dla flamegraph.pl i speedscope.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """Profilowanie żądań na żądanie, sterowane przez administratora (token PROFILING_TOKEN).
+
+    start() włącza profilowanie następnych N żądań i/lub żądań przez T sekund,
+    z próbkowaniem sample_rate; pojedyncze żądanie z nagłówkiem X-Profile-Token
+    jest profilowane w całości (request_mode) niezależnie od przełącznika. Profile
+    trafiają do PROFILING_DIR (.prof dla pstats/snakeviz, .folded dla flamegraph).
+    Stan jest lokalny dla procesu. Bez tokenu middleware nie jest instalowany,
+    a wyłączony kosztuje jedno sprawdzenie flagi i przegląd nazw nagłówków.
+    """
+
+    def __init__(self, service='api', directory=None, token=None, keep=None, request_mode='cprofile'):
+        self.service = service
+        self.request_mode = request_mode  # tryb dla żądań z nagłówkiem X-Profile-Token
+        self.directory = directory or os.getenv('PROFILING_DIR', 'data/profiles')
+        self.token = os.getenv('PROFILING_TOKEN', '') if token is None else token
+        self.keep = keep or int(os.getenv('PROFILING_KEEP', '200'))
+        self.active = False  # jedyne, co sprawdza ścieżka żądania przy wyłączonym profilowaniu
+        self.mode = 'cprofile'
+        self.sample_rate = 1.0
+        self.remaining = None
+        self.until = None
+        self.written = 0
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()  # jeden profil naraz - profilery są globalne dla wątku
+        self._sequence = itertools.count(1)
+
+    @property
+    def enabled(self):
+        """Czy sterowanie profilowaniem jest skonfigurowane (jest token)"""
+        return bool(self.token)
+
+    def authorized(self, token):
+        return self.enabled and bool(token) and hmac.compare_digest(str(token), self.token)
+
+    def start(self, requests=None, seconds=None, sample_rate=1.0, mode='cprofile'):
+        """Profiluj następne requests żądań i/lub przez seconds sekund (co najmniej jedno z nich)"""
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode} (choose from {', '.join(MODES)})")
+        if not requests and not seconds:
+            raise ValueError("Give a number of requests, a duration in seconds, or both")
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError("sample_rate must be in (0, 1]")
+        with self._lock:
+            self.mode = mode
+            self.sample_rate = sample_rate
+            self.remaining = int(requests) if requests else None
+            self.until = time.monotonic() + float(seconds) if seconds else None
+            self.active = True
+        return self.status()
+
+    def stop(self):
+        with self._lock:
+            self.active = False
+            self.remaining = None
+            self.until = None
+        return self.status()
+
+    def status(self):
+        expired = self.until is not None and time.monotonic() >= self.until
+        return {
+            'service': self.service,
+            'pid': os.getpid(),
+            'active': self.active and not expired,
+            'mode': self.mode,
+            'sample_rate': self.sample_rate,
+            'remaining_requests': self.remaining,
+            'remaining_seconds': round(max(self.until - time.monotonic(), 0.0), 1) if self.until else None,
+            'profiles_written': self.written,
+            'directory': os.path.abspath(self.directory),
+        }
+
+    def claim(self):
+        """Czy bieżące żądanie ma być profilowane (zużywa jedno z N)"""
+        with self._lock:
+            if not self.active:
+                return False
+            if self.until is not None and time.monotonic() >= self.until:
+                self.active = False
+                return False
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return False
+            if self.remaining is not None:
+                self.remaining -= 1
+                if self.remaining <= 0:
+                    self.active = False
+            return True
+
+    def _path(self, method, path, elapsed, extension):
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', path).strip('_')[:60] or 'root'
+        name = (f"{time.strftime('%Y%m%d-%H%M%S')}-{self.service}-{os.getpid()}-"
+                f"{next(self._sequence)}-{method.lower()}-{slug}-{int(elapsed * 1000)}ms.{extension}")
+        return os.path.join(self.directory, name)
+
+    def save(self, collector, method, path, elapsed):
+        """Zapisuje profil (cProfile.Profile albo StackSampler); zwraca nazwę pliku"""
+        os.makedirs(self.directory, exist_ok=True)
+        if isinstance(collector, StackSampler):
+            target = self._path(method, path, elapsed, 'folded')
+            collector.dump(target)
+        else:
+            target = self._path(method, path, elapsed, 'prof')
+            collector.dump_stats(target)
+        with self._lock:
+            self.written += 1
+        self._prune()
+        return os.path.basename(target)
+
+    def _prune(self):
+        profiles = self.list_profiles(limit=None)
+        for entry in profiles[self.keep:]:
+            try:
+                os.remove(os.path.join(self.directory, entry['name']))
+            except OSError:
+                pass
+
+    def list_profiles(self, limit=50):
+        """Zapisane profile od najnowszych: [{name, bytes, modified}]"""
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith(('.prof', '.folded'))]
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append({'name': name, 'bytes': stat.st_size, 'modified': stat.st_mtime})
+        entries.sort(key=lambda entry: entry['modified'], reverse=True)
+        return entries[:limit] if limit else entries
+
+    def profile_path(self, name):
+        """Ścieżka zapisanego profilu albo None (bez wychodzenia poza katalog)"""
+        if os.path.basename(name) != name or not name.endswith(('.prof', '.folded')):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profilujące wybrane żądania; dodaje nagłówek X-Profile-Id z nazwą pliku.
+
+    cProfile widzi tylko wątek pętli zdarzeń (endpointy async def); dla
+    endpointów def, które działają w puli wątków, użyj trybu sample. Inne
+    żądania obsługiwane w tym czasie przez tę samą pętlę też trafiają do profilu.
+    """
+
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    def _requested(self, scope):
+        """Nagłówek X-Profile-Token z poprawnym tokenem - pełne profilowanie jednego żądania"""
+        for name, value in scope.get('headers', ()):
+            if name == TOKEN_HEADER:
+                return self.profiler.authorized(value.decode('latin-1'))
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        forced = self._requested(scope)
+        if not forced and not (self.profiler.active and self.profiler.claim()):
+            await self.app(scope, receive, send)
+            return
+        if not self.profiler._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)  # inny profil w toku
+            return
+
+        mode = self.profiler.request_mode if forced else self.profiler.mode
+        collector = cProfile.Profile() if mode == 'cprofile' else StackSampler()
+        state = {'start': None, 'name': None}
+        started = time.perf_counter()
+
+        def finish():
+            """Zatrzymuje profiler i zapisuje profil (raz)"""
+            if state['name'] is None:
+                if isinstance(collector, StackSampler):
+                    collector.stop()
+                else:
+                    collector.disable()
+                state['name'] = self.profiler.save(collector, scope['method'], scope['path'],
+                                                   time.perf_counter() - started)
+            return state['name']
+
+        async def send_with_id(message):
+            # Początek odpowiedzi czeka na pierwszą porcję treści: gdy jest jedyna,
+            # profil jest zapisywany przed wysłaniem i nagłówek X-Profile-Id wskazuje plik
+            if message['type'] == 'http.response.start':
+                state['start'] = message
+                return
+            if state['start'] is not None:
+                start, state['start'] = state['start'], None
+                if not message.get('more_body', False):
+                    name = finish().encode('latin-1')
+                    start = dict(start, headers=[*start.get('headers', []), (b'x-profile-id', name)])
+                await send(start)
+            await send(message)
+
+        try:
+            if isinstance(collector, StackSampler):
+                collector.start()
+            else:
+                collector.enable()
+            await self.app(scope, receive, send_with_id)
+        finally:
+            try:
+                finish()
+            finally:
+                self.profiler._busy.release()
+
+
+_profilers = {}
+
+
+def get_profiler(service, request_mode='cprofile'):
+    """Profiler procesu dla danej aplikacji (api, admin)"""
+    if service not in _profilers:
+        _profilers[service] = Profiler(service, request_mode=request_mode)
+    return _profilers[service]
\ No newline at end of file
@@ -0,0 +1,99 @@
+# core/runtime_settings.py
+import os
+import threading
+import time
+
+# Ustawienia zmieniane w locie; wartości w tabeli settings są tekstem
+DEFAULTS = {
+    'mode': 'learning',                 # learning | auto
+    'confidence_threshold': '0.7',      # domyślny próg, gdy klient go nie poda
+    'model_version_pin': '',            # pusty = zawsze najnowsza wersja modelu
+    'duplicate_policy': 'flag',         # off | flag | collapse - feedback bliski istniejącemu dokumentowi
+}
+
+VALIDATORS = {
+    'mode': lambda value: value in ('learning', 'auto'),
+    'confidence_threshold': lambda value: 0.0 <= float(value) <= 1.0,
+    'model_version_pin': lambda value: value == '' or int(value) > 0,
+    'duplicate_policy': lambda value: value in ('off', 'flag', 'collapse'),
+}
+
+
+class RuntimeSettings:
+    """Ustawienia wspólne dla wszystkich procesów, czytane przez lokalny cache z TTL.
+
+    Co najwyżej raz na ttl sekund odczytywany jest tylko licznik settings_version;
+    pełna tabela jest pobierana ponownie dopiero gdy licznik się zmieni.
+    """
+
+    def __init__(self, db, ttl=None):
+        self.db = db
+        if ttl is None:
+            ttl = float(os.getenv('SETTINGS_CACHE_TTL', '2'))
+        self.ttl = ttl
+        self._values = {}
+        self._version = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Zwraca wartość ustawienia (tekst) z lokalnego cache"""
+        self._maybe_refresh()
+        return self._values.get(key, DEFAULTS.get(key))
+
+    def get_float(self, key):
+        return float(self.get(key))
+
+    def get_int(self, key):
+        value = self.get(key)
+        return int(value) if value else None
+
+    def all(self):
+        """Wszystkie znane ustawienia (z wartościami domyślnymi)"""
+        self._maybe_refresh()
+        return {key: self._values.get(key, default) for key, default in DEFAULTS.items()}
+
+    @staticmethod
+    def is_valid(key, value):
+        """Czy ustawienie jest znane i ma poprawną wartość"""
+        validator = VALIDATORS.get(key)
+        try:
+            return validator is not None and validator('' if value is None else str(value))
+        except ValueError:
+            return False
+
+    def set(self, key, value):
+        """Zapisuje ustawienie w bazie; inne procesy zobaczą je najpóźniej po ttl"""
+        if not self.is_valid(key, value):
+            return False
+
+        self.db.set_setting(key, '' if value is None else str(value))
+        self.invalidate()  # własną zmianę widać od razu
+        return True
+
+    def invalidate(self):
+        """Następny odczyt sprawdzi licznik w bazie niezależnie od ttl"""
+        with self._lock:
+            self._checked_at = float('-inf')
+
+    def revision(self):
+        """Licznik settings_version, z którego pochodzą wartości w cache"""
+        self._maybe_refresh()
+        return self._version
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.ttl:
+            return
+        with self._lock:
+            if now - self._checked_at < self.ttl:
+                return
+            try:
+                version = self.db.get_settings_version()
+                if version != self._version:
+                    self._values = self.db.get_settings()
+                    self._version = version
+            except Exception as e:
+                # Baza chwilowo niedostępna - zostajemy przy ostatnich znanych wartościach
+                print(f"⚠️  Could not refresh settings: {e}")
+            self._checked_at = now
\ No newline at end of file
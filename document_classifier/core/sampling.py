@@ -0,0 +1,200 @@
+# core/sampling.py
+import heapq
+import itertools
+import math
+import os
+import random
+import time
+from datetime import date, datetime
+
+SECONDS_PER_DAY = 86400.0
+
+
+def parse_caps(value):
+    """'Daily Business=5000,Sport=2000' -> {'Daily Business': 5000, 'Sport': 2000}"""
+    caps = {}
+    for part in (value or '').split(','):
+        if not part.strip():
+            continue
+        area, separator, cap = part.rpartition('=')
+        if not separator or not area.strip():
+            raise ValueError(f"Invalid class cap: {part!r} (expected Area=N)")
+        caps[area.strip()] = int(cap)
+        if caps[area.strip()] < 1:
+            raise ValueError(f"Class cap must be positive: {part!r}")
+    return caps
+
+
+def _timestamp(value):
+    """Sekundy epoki z datetime/date/tekstu ISO (created_at z bazy) albo liczby; None = teraz"""
+    if value is None:
+        return time.time()
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day).timestamp()
+    raise TypeError(f"Unsupported timestamp: {value!r}")
+
+
+def _log_add(a, b):
+    """log(exp(a) + exp(b)) bez przepełnienia"""
+    if a == -math.inf:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+class ClassBalancedReservoir:
+    """Zbiór treningowy z limitem dokumentów per klasa - próbka rezerwuarowa ze strumienia.
+
+    Każda klasa trzyma najwyżej cap dokumentów (caps nadpisuje limit dla
+    wybranych klas), więc koszt retreningu i pamięć korpusu nie rosną z
+    czasem działania systemu. Bez half_life_days każdy dokument widziany w
+    klasie ma tę samą szansę trafić do próbki (klasyczny rezerwuar). Z
+    half_life_days waga dokumentu maleje o połowę co tyle dni wieku, a
+    próbka jest losowana proporcjonalnie do wag (Efraimidis-Spirakis:
+    klucz Exp(1)/waga, zostaje cap najmniejszych) - świeży feedback ma
+    przewagę, stary wciąż może się utrzymać. Klucze są w skali
+    logarytmicznej, więc wagi sprzed lat nie dają przepełnień.
+
+    Efektywna liczność klasy to liczba Kisha (suma wag)^2 / suma wag^2 po
+    wszystkich widzianych dokumentach - ile równoważnych dokumentów zostało
+    z historii po wygaszeniu; bez wygaszania równa liczbie widzianych.
+    """
+
+    def __init__(self, cap, caps=None, half_life_days=None, seed=0):
+        if cap < 1:
+            raise ValueError("cap must be positive")
+        if half_life_days is not None and half_life_days <= 0:
+            raise ValueError("half_life_days must be positive")
+        self.cap = int(cap)
+        self.caps = dict(caps or {})
+        self.half_life_days = half_life_days
+        self._rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Pusta próbka - przed treningiem od zera na nowym strumieniu"""
+        self._heaps = {}  # klasa -> kopiec (-klucz, numer, tekst): na wierzchu najgorszy klucz
+        self._seen = {}
+        self._log_weight = {}  # log sumy wag widzianych dokumentów klasy
+        self._log_weight_sq = {}  # log sumy kwadratów wag
+        self._sequence = itertools.count()
+
+    def cap_for(self, label):
+        return self.caps.get(label, self.cap)
+
+    def _log_weight_of(self, timestamp):
+        if self.half_life_days is None:
+            return 0.0
+        # Waga 2^(t / okres półtrwania) - ta sama skala dla wszystkich, liczy się tylko różnica wieku
+        return _timestamp(timestamp) / (self.half_life_days * SECONDS_PER_DAY) * math.log(2)
+
+    def offer(self, text, label, timestamp=None):
+        """Jeden dokument ze strumienia; True, jeśli trafił do próbki"""
+        log_weight = self._log_weight_of(timestamp)
+        self._seen[label] = self._seen.get(label, 0) + 1
+        self._log_weight[label] = _log_add(self._log_weight.get(label, -math.inf), log_weight)
+        self._log_weight_sq[label] = _log_add(self._log_weight_sq.get(label, -math.inf), 2 * log_weight)
+
+        key = math.log(max(self._rng.expovariate(1.0), 1e-300)) - log_weight
+        entry = (-key, next(self._sequence), text)
+        heap = self._heaps.setdefault(label, [])
+        if len(heap) < self.cap_for(label):
+            heapq.heappush(heap, entry)
+            return True
+        return heapq.heappushpop(heap, entry) is not entry
+
+    def extend(self, documents):
+        """Strumień (text, label) albo (text, label, timestamp); zwraca liczbę dokumentów"""
+        count = 0
+        for document in documents:
+            self.offer(*document)
+            count += 1
+        return count
+
+    def _entries(self):
+        # Stała kolejność (klasa, kolejność napływu) - próbka i klucze w export_state są wyrównane
+        for label in sorted(self._heaps, key=str):
+            for entry in sorted(self._heaps[label], key=lambda entry: entry[1]):
+                yield label, entry
+
+    def sample(self):
+        """(teksty, etykiety) bieżącej próbki"""
+        texts, labels = [], []
+        for label, (_, _, text) in self._entries():
+            texts.append(text)
+            labels.append(label)
+        return texts, labels
+
+    def __len__(self):
+        return sum(len(heap) for heap in self._heaps.values())
+
+    def report(self):
+        """Liczności per klasa: widziane, w próbce, limit i efektywna liczność historii"""
+        classes = {}
+        for label in sorted(self._seen, key=str):
+            effective = math.exp(2 * self._log_weight[label] - self._log_weight_sq[label])
+            classes[label] = {
+                'seen': self._seen[label],
+                'kept': len(self._heaps.get(label, ())),
+                'cap': self.cap_for(label),
+                'effective': round(min(effective, self._seen[label]), 1),
+            }
+        return {
+            'cap': self.cap,
+            'half_life_days': self.half_life_days,
+            'seen': sum(row['seen'] for row in classes.values()),
+            'kept': sum(row['kept'] for row in classes.values()),
+            'effective': round(sum(row['effective'] for row in classes.values()), 1),
+            'classes': classes,
+        }
+
+    def export_state(self):
+        """Stan bez tekstów - klucze w kolejności sample(); teksty trafiają do korpusu modelu osobno"""
+        return {
+            'cap': self.cap,
+            'caps': dict(self.caps),
+            'half_life_days': self.half_life_days,
+            'keys': [-entry[0] for _, entry in self._entries()],
+            'seen': dict(self._seen),
+            'log_weight': dict(self._log_weight),
+            'log_weight_sq': dict(self._log_weight_sq),
+        }
+
+    def restore(self, state, texts, labels):
+        """Wczytuje próbkę (teksty, etykiety w kolejności sample()) ze stanu export_state.
+
+        Limity zostają z bieżącej konfiguracji - po ich obniżeniu nadmiar wypada.
+        Bez stanu (korpus sprzed włączenia limitu) próbka jest losowana z texts.
+        """
+        self.reset()
+        if state is None:
+            self.extend(zip(texts, labels))
+            return self
+        for key, text, label in zip(state['keys'], texts, labels):
+            self._heaps.setdefault(label, []).append((-key, next(self._sequence), text))
+        for label, heap in self._heaps.items():
+            heapq.heapify(heap)
+            while len(heap) > self.cap_for(label):
+                heapq.heappop(heap)
+        self._seen = dict(state['seen'])
+        self._log_weight = dict(state['log_weight'])
+        self._log_weight_sq = dict(state['log_weight_sq'])
+        return self
+
+
+def training_sampler(cap=None, caps=None, half_life_days=None):
+    """Polityka zbioru treningowego z TRAINING_CLASS_CAP, TRAINING_CLASS_CAPS i
+    TRAINING_HALF_LIFE_DAYS (argumenty mają pierwszeństwo); None, gdy limitu brak."""
+    cap = cap if cap is not None else int(os.getenv('TRAINING_CLASS_CAP', '0'))
+    if not cap:
+        return None
+    caps = caps if caps is not None else parse_caps(os.getenv('TRAINING_CLASS_CAPS', ''))
+    if half_life_days is None:
+        half_life_days = float(os.getenv('TRAINING_HALF_LIFE_DAYS', '0')) or None
+    return ClassBalancedReservoir(cap, caps, half_life_days, seed=time.time_ns())
\ No newline at end of file
@@ -50,17 +50,19 @@ STARTER_EXAMPLES = [
     ("Sprint retrospective feedback team velocity and improvement areas", "Daily Business", "Retrospektywa"),
 ]
 
-def load_starter_data(db_manager, classifier):
-    """Ładuje przykładowe dane do systemu"""
+def load_starter_data(db_manager, classifier=None):
+    """Ładuje przykładowe dane do bazy (jedną paczką); z classifier - także douczanie w pamięci.
+
+    Serwis trenuje potem model na całej bazie (retrain_from_database) - model w
+    pamięci workera nie ma korpusu i publikacja nadpisałaby wcześniejszy feedback.
+    """
     print("Loading starter data...")
     
-    for text, area, subarea in STARTER_EXAMPLES:
-        # Zapisz do bazy
-        db_manager.save_document(text, area, subarea)
-        # Naucz klasyfikator
-        classifier.learn(text, area)
+    db_manager.save_documents(list(STARTER_EXAMPLES))
+    if classifier is not None:
+        for text, area, subarea in STARTER_EXAMPLES:
+            classifier.learn(text, area)
     
     print(f"✓ Loaded {len(STARTER_EXAMPLES)} starter examples")
-    print(f"✓ Categories: {len(classifier.categories)}")
     
     return True
\ No newline at end of file
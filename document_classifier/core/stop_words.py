@@ -0,0 +1,49 @@
+# core/stop_words.py
+
+# Najczęstsze polskie słowa funkcyjne (zaimki, spójniki, przyimki, partykuły, formy "być/mieć")
+POLISH_STOP_WORDS = frozenset("""
+a aby ach acz aczkolwiek aj albo ale ależ ani aż bardziej bardzo bez bo bowiem by byli bym
+bynajmniej być był była było były będzie będą cali cała cały ci cię ciebie co cokolwiek coś
+czasami czasem czemu czy czyli daleko dla dlaczego dlatego do dobrze dokąd dość dużo dwa dwaj
+dwie dwoje dziś dzisiaj gdy gdyby gdyż gdzie gdziekolwiek gdzieś go i ich ile im inna inne inny
+innych iż ja ją jak jakaś jakby jaki jakichś jakie jakiś jakiż jakkolwiek jako jakoś je jeden
+jedna jedno jednak jednakże jego jej jemu jest jestem jeszcze jeśli jeżeli już każdy kiedy
+kilka kimś kto ktokolwiek ktoś która które którego której który których którym którzy ku
+lecz lub ma mają mam mi mimo między mną mnie mogą moi moim moja moje może możliwe można mój mu
+musi my na nad nam nami nas nasi nasz nasza nasze naszego naszych natomiast natychmiast nawet
+nią nic nich nie niech niego niej niemu nigdy nim nimi niż no o obok od około on ona one oni
+ono oraz oto owszem pan pana pani po pod podczas pomimo ponad ponieważ powinien powinna powinni
+powinno poza prawie przecież przed przede przedtem przez przy również sam sama są się
+skąd sobie sobą sposób swoje ta tak taka taki takie także tam te tego tej temu ten teraz też
+to tobą tobie toteż trzeba tu tutaj twoi twoim twoja twoje twym twój ty tych tylko tym u w
+wam wami was wasz wasza wasze we według wiele wielu więc więcej wszyscy wszystkich wszystkie
+wszystkim wszystko wtedy wy właśnie z za zapewne zawsze ze znowu znów został żaden żadna żadne
+żadnych że żeby
+""".split())
+
+
+def _english_stop_words():
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+    return ENGLISH_STOP_WORDS
+
+
+# Nazwa listy -> funkcja zwracająca słowa (lista angielska z sklearn ładowana dopiero gdy potrzebna)
+STOP_WORD_LISTS = {
+    'english': _english_stop_words,
+    'polish': lambda: POLISH_STOP_WORDS,
+}
+
+
+def get_stop_words(spec):
+    """Lista stop words z opisu: 'english', 'polish', 'english,polish' albo 'none'"""
+    names = [name.strip().lower() for name in (spec or '').split(',') if name.strip()]
+    if not names or names == ['none']:
+        return None
+    unknown = [name for name in names if name not in STOP_WORD_LISTS]
+    if unknown:
+        raise ValueError(f"Unknown stop word list(s): {', '.join(unknown)} "
+                         f"(choose from {', '.join(STOP_WORD_LISTS)} or none)")
+    words = set()
+    for name in names:
+        words |= STOP_WORD_LISTS[name]()
+    return sorted(words)
\ No newline at end of file
@@ -0,0 +1,107 @@
+# core/tenant_models.py
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from .classifier import ClassificationEngine
+from .model_store import ModelStore
+
+SYSTEM_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$')
+
+
+class TenantModelRegistry:
+    """Osobne modele per system_id; w pamięci tylko max_resident ostatnio używanych (LRU)"""
+
+    def __init__(self, root=None, max_resident=None, check_interval=None):
+        self.root = root or os.path.join(os.getenv('MODEL_STORE_DIR', 'data/models'), 'tenants')
+        if max_resident is None:
+            max_resident = int(os.getenv('TENANT_MODELS_RESIDENT', '8'))
+        self.max_resident = max_resident
+        self.check_interval = check_interval
+        self._resident = OrderedDict()  # system_id -> (ModelStore, ClassificationEngine)
+        self._lock = threading.Lock()  # tylko słowniki - nigdy na czas odczytu z dysku
+        self._tenant_locks = {}  # system_id -> RLock ładowania i douczania
+
+    def _path(self, system_id):
+        if not SYSTEM_ID_PATTERN.match(system_id):
+            raise ValueError(f"Invalid system_id: {system_id!r}")
+        return os.path.join(self.root, system_id)
+
+    def _store(self, system_id):
+        return ModelStore(self._path(system_id), check_interval=self.check_interval)
+
+    def _tenant_lock(self, system_id):
+        """Blokada jednego systemu - wolne ładowanie z dysku nie wstrzymuje pozostałych"""
+        with self._lock:
+            return self._tenant_locks.setdefault(system_id, threading.RLock())
+
+    def _entry(self, system_id):
+        with self._lock:
+            entry = self._resident.get(system_id)
+            if entry is not None:
+                self._resident.move_to_end(system_id)
+            return entry
+
+    def get(self, system_id):
+        """Model systemu (ładowany leniwie przy pierwszym użyciu) albo None jeśli go nie ma"""
+        path = self._path(system_id)
+        entry = self._entry(system_id)
+        if entry is not None:
+            store, engine = entry
+            if store.poll(engine.model_version) is None:
+                return engine
+
+        with self._tenant_lock(system_id):
+            if entry is not None:
+                # Inny wątek mógł już przeładować model w czasie oczekiwania
+                current = self._entry(system_id)
+                if current is not None and current[1] is not engine:
+                    return current[1]
+                engine = store.load()
+                self._remember(system_id, store, engine)
+                return engine
+
+            entry = self._entry(system_id)
+            if entry is not None:
+                return entry[1]
+            # Nie twórz katalogów dla nieznanych systemów - brak artefaktu to fallback
+            if not os.path.isdir(path):
+                return None
+            store = self._store(system_id)
+            engine = store.load()
+            if engine is None:
+                return None
+            self._remember(system_id, store, engine)
+            return engine
+
+    def learn(self, system_id, text, area):
+        """Douczanie modelu systemu i publikacja nowej wersji jego artefaktu"""
+        self._path(system_id)
+        with self._tenant_lock(system_id):
+            entry = self._entry(system_id)
+            store = entry[0] if entry is not None else self._store(system_id)
+            with store.lock():
+                engine = store.load(with_corpus=True)
+                if engine is None:
+                    engine = ClassificationEngine()
+                revision = engine.revision
+                trained = engine.learn(text, area)
+                if engine.revision == revision:
+                    return trained  # odrzucony przez próbkę - model bez zmian, bez nowej wersji
+                version = store.publish(engine)
+            # W pamięci trzymamy tylko zmapowany model, korpus wraca na dysk
+            self._remember(system_id, store, store.load(version))
+            return trained
+
+    def resident(self):
+        """Lista systemów, których modele są aktualnie w pamięci (od najstarszego)"""
+        with self._lock:
+            return list(self._resident.keys())
+
+    def _remember(self, system_id, store, engine):
+        with self._lock:
+            self._resident[system_id] = (store, engine)
+            self._resident.move_to_end(system_id)
+            while len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
\ No newline at end of file
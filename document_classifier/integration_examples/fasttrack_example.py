@@ -4,61 +4,55 @@ FastTrack Integration Example
 Pokazuje jak FastTrack może używać Document Classifier
 """
 
-import requests
 import json
-from typing import Optional, Dict, Any
+import os
+import sys
+from typing import Optional, Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from client import ClassifierClient
 
 class DocumentClassifierClient:
-    """Client dla Document Classifier API"""
+    """Client dla Document Classifier API - cienka warstwa nad client.ClassifierClient
+    (pula połączeń keep-alive, ponowienia, limity czasu)"""
     
     def __init__(self, api_url: str = "http://localhost:8000"):
         self.api_url = api_url
         self.system_id = "fasttrack"
+        self.client = ClassifierClient(api_url, system_id=self.system_id)
     
     def classify_document(self, text: str, confidence_threshold: float = 0.7) -> Dict[str, Any]:
         """Klasyfikuj dokument"""
         
-        response = requests.post(f"{self.api_url}/v1/classify", json={
-            "text": text,
-            "system_id": self.system_id,
-            "confidence_threshold": confidence_threshold,
-            "context": {
-                "source": "fasttrack",
-                "user_agent": "FastTrack/1.0"
-            }
+        return self.client.classify(text, confidence_threshold=confidence_threshold, context={
+            "source": "fasttrack",
+            "user_agent": "FastTrack/1.0"
         })
+    
+    def classify_documents(self, texts: List[str], confidence_threshold: float = 0.7) -> List[Dict[str, Any]]:
+        """Klasyfikuj wiele dokumentów - paczki na /classify/batch zamiast żądania na dokument"""
         
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Classification failed: {response.text}")
+        return self.client.classify_many(texts, confidence_threshold=confidence_threshold)
     
     def send_feedback(self, text: str, correct_area: str, predicted_area: str = None, 
                      correct_subarea: str = None, user_id: str = None):
         """Wyślij feedback do systemu"""
         
-        response = requests.post(f"{self.api_url}/v1/feedback", json={
-            "text": text,
-            "correct_area": correct_area,
-            "correct_subarea": correct_subarea,
-            "predicted_area": predicted_area,
-            "system_id": self.system_id,
-            "user_id": user_id
-        })
-        
-        return response.json()
+        return self.client.feedback(text, correct_area, subarea=correct_subarea,
+                                    predicted_area=predicted_area, user_id=user_id)
     
     def get_categories(self) -> Dict[str, Any]:
         """Pobierz dostępne kategorie"""
         
-        response = requests.get(f"{self.api_url}/v1/categories")
-        return response.json()
+        return self.client.categories()
     
     def health_check(self) -> Dict[str, Any]:
         """Sprawdź status systemu"""
         
-        response = requests.get(f"{self.api_url}/v1/health")
-        return response.json()
+        return self.client.health()
+    
+    def close(self):
+        self.client.close()
 
 # Przykład użycia w FastTrack
 class FastTrackDocumentProcessor:
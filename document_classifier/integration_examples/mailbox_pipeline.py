@@ -0,0 +1,284 @@
+# integration_examples/mailbox_pipeline.py
+"""
+Mailbox Ingestion Pipeline
+Masowa klasyfikacja archiwów poczty (mbox i katalogi .eml): folder i tagi Outlook dla każdej wiadomości
+
+Wiadomości są czytane strumieniowo, temat i treść wyciągane w puli procesów,
+a klasyfikacja idzie paczkami - lokalnie przez opublikowany model (predict_batch,
+bez HTTP) albo przez API (/classify/batch). Postęp jest zapisywany po każdej
+paczce, więc przerwany backfill wznawia się od miejsca przerwania.
+
+    python integration_examples/mailbox_pipeline.py archive.mbox mail/ -o assignments.ndjson
+    python integration_examples/mailbox_pipeline.py archive.mbox --url http://localhost:8000 -o assignments.ndjson
+"""
+
+import argparse
+import html
+import json
+import mailbox
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from email import message_from_bytes
+from email.errors import HeaderParseError
+from email.header import decode_header, make_header
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from client import ClassifierError
+from outlook_example import map_to_outlook_folder, generate_outlook_tags
+
+MAX_TEXT = 10000  # limit tekstu w API - ten sam dla klasyfikacji lokalnej
+TAG_PATTERN = re.compile(r'<(script|style)\b.*?</\1>|<[^>]+>', re.IGNORECASE | re.DOTALL)
+
+def iter_sources(paths):
+    """[(rodzaj, ścieżka)] w stałej kolejności: pliki mbox oraz pliki .eml z drzew katalogów"""
+
+    sources = []
+    for path in paths:
+        if not os.path.exists(path):
+            raise ValueError(f"No such mailbox, EML file or directory: {path}")
+        if not os.path.isdir(path):
+            sources.append(('eml' if path.endswith('.eml') else 'mbox', path))
+            continue
+        for directory, subdirectories, files in os.walk(path):
+            subdirectories.sort()
+            for name in sorted(files):
+                if name.endswith(('.eml', '.mbox')):
+                    sources.append((name.rsplit('.', 1)[1], os.path.join(directory, name)))
+    return sources
+
+def iter_messages(sources, skip=0):
+    """Strumień (id, surowe bajty) - pierwsze skip wiadomości pomijane bez czytania treści"""
+
+    position = 0
+    for kind, path in sources:
+        if kind == 'eml':
+            position += 1
+            if position > skip:
+                with open(path, 'rb') as f:
+                    yield path, f.read()
+            continue
+        box = mailbox.mbox(path, create=False)
+        try:
+            for index, key in enumerate(box.iterkeys()):
+                position += 1
+                if position > skip:
+                    yield f"{path}#{index}", box.get_bytes(key)
+        finally:
+            box.close()
+
+def _header(message, name):
+    """Zdekodowany nagłówek (RFC 2047) - policy.default robi to samo kilkanaście razy wolniej"""
+
+    value = message.get(name)
+    if value is None:
+        return ''
+    try:
+        return ' '.join(str(make_header(decode_header(str(value)))).split())
+    except (HeaderParseError, LookupError, UnicodeError):  # uszkodzony albo nieznany charset
+        return ' '.join(str(value).split())
+
+def _body_text(message):
+    """Pierwsza część text/plain (albo text/html bez znaczników), nie licząc załączników"""
+
+    parts = {}
+    for part in message.walk():
+        subtype = part.get_content_subtype()
+        if (part.get_content_maintype() == 'text' and subtype in ('plain', 'html') and subtype not in parts
+                and not part.get_filename()):
+            parts[subtype] = part
+    part = parts.get('plain') or parts.get('html')
+    if part is None:
+        return ''
+    payload = part.get_payload(decode=True) or b''
+    try:
+        content = payload.decode(part.get_content_charset() or 'utf-8', errors='replace')
+    except LookupError:
+        content = payload.decode('utf-8', errors='replace')
+    if part.get_content_subtype() == 'html':
+        content = html.unescape(TAG_PATTERN.sub(' ', content))
+    return ' '.join(content.split())
+
+def extract_message(item):
+    """(id, bajty) -> nagłówki i tekst do klasyfikacji w formacie classify_email (temat + treść)"""
+
+    message_id, raw = item
+    message = message_from_bytes(raw)
+    subject = _header(message, 'subject')
+    return {
+        'id': message_id,
+        'message_id': _header(message, 'message-id'),
+        'subject': subject,
+        'sender': _header(message, 'from'),
+        'date': _header(message, 'date'),
+        'text': f"Subject: {subject}\n\n{_body_text(message)}"[:MAX_TEXT],
+    }
+
+def _extract_chunk(chunk):
+    return [extract_message(item) for item in chunk]
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def extract_batches(messages, workers=1, batch_size=256):
+    """Paczki wyciągniętych wiadomości w kolejności wejścia; przy workers > 1 parsowanie w puli
+    procesów, w locie najwyżej 2 x workers paczek - pamięć nie zależy od rozmiaru archiwum"""
+
+    chunks = _chunks(messages, batch_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield _extract_chunk(chunk)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_extract_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def local_predictor(model_dir=None, system_id=None, version=None):
+    """Klasyfikacja opublikowanym modelem w tym procesie: (predict(texts), wersja modelu)"""
+
+    from core.batch_classify import model_store_for
+
+    store = model_store_for(model_dir, system_id)
+    version = version or store.current_version()
+    if version is None:
+        raise ValueError(f"No published model in {store.root}")
+    engine = store.load(version)
+    if not engine.can_predict():
+        raise ValueError(f"Model version {version} cannot predict yet")
+    return engine.predict_batch, version
+
+def remote_predictor(url, system_id="outlook"):
+    """Klasyfikacja przez API (/classify/batch): (predict(texts), wersja modelu)"""
+
+    from client import ClassifierClient
+
+    client = ClassifierClient(url, system_id=system_id, batch_size=500)
+    # Próg 0 - API zwraca przewidzianą kategorię; o przeglądzie decydują tagi jak w classify_email
+    return (lambda texts: client.classify_many(texts, confidence_threshold=0.0)), None
+
+def assign(message, prediction, model_version=None):
+    """Wiersz wyniku: nagłówki, kategoria, folder i tagi Outlook"""
+
+    result = {'area': prediction['area'], 'confidence': round(prediction['confidence'], 6)}
+    return {
+        'id': message['id'],
+        'message_id': message['message_id'],
+        'subject': message['subject'],
+        'sender': message['sender'],
+        'date': message['date'],
+        'area': result['area'],
+        'confidence': result['confidence'],
+        'outlook_folder': map_to_outlook_folder(result['area']),
+        'tags': generate_outlook_tags(result),
+        'model_version': model_version,
+    }
+
+def _load_checkpoint(path, sources):
+    if not os.path.exists(path):
+        return {'sources': [source for _, source in sources], 'processed': 0, 'output_bytes': 0}
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint['sources'] != [source for _, source in sources]:
+        raise ValueError(f"Checkpoint {path} was written for different inputs; remove it to start over")
+    return checkpoint
+
+def _save_checkpoint(path, checkpoint):
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(temporary, path)  # atomowo - przerwanie nie zostawia połowy pliku
+
+def run_pipeline(paths, output, predict, model_version=None, workers=1, batch_size=256,
+                 checkpoint_path=None, limit=None):
+    """Klasyfikuje archiwa paths do output (NDJSON), wznawiając od checkpointu.
+
+    Checkpoint (domyślnie output + '.checkpoint') zapisuje liczbę obsłużonych
+    wiadomości i długość pliku wyników po każdej paczce; przy wznowieniu
+    niedokończony ogon wyników jest obcinany, a obsłużone wiadomości pomijane.
+    limit ogranicza liczbę wiadomości w tym uruchomieniu.
+    """
+
+    sources = iter_sources(paths)
+    checkpoint_path = checkpoint_path or output + '.checkpoint'
+    checkpoint = _load_checkpoint(checkpoint_path, sources)
+    resumed = checkpoint['processed']
+
+    messages = iter_messages(sources, skip=resumed)
+    if limit is not None:
+        messages = (item for _, item in zip(range(limit), messages))
+
+    folders = Counter()
+    started = time.perf_counter()
+    with open(output, 'a+b') as out:
+        out.truncate(checkpoint['output_bytes'])
+        out.seek(checkpoint['output_bytes'])
+        for batch in extract_batches(messages, workers, batch_size):
+            predictions = predict([message['text'] for message in batch])
+            for message, prediction in zip(batch, predictions):
+                row = assign(message, prediction, model_version)
+                folders[row['outlook_folder']] += 1
+                out.write((json.dumps(row, ensure_ascii=False) + '\n').encode('utf-8'))
+            out.flush()
+            checkpoint['processed'] += len(batch)
+            checkpoint['output_bytes'] = out.tell()
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+    return {
+        'processed': checkpoint['processed'] - resumed,
+        'resumed_from': resumed,
+        'total': checkpoint['processed'],
+        'seconds': round(time.perf_counter() - started, 3),
+        'folders': dict(folders),
+    }
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Classify mbox/EML archives into Outlook folders and tags")
+    parser.add_argument("paths", nargs="+", help="mbox files, .eml files or directories containing them")
+    parser.add_argument("-o", "--output", required=True, help="NDJSON file with one assignment per message")
+    parser.add_argument("--checkpoint", help="progress file (default: OUTPUT.checkpoint)")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="extraction processes (0 = all cores)")
+    parser.add_argument("--batch-size", type=int, default=256, help="messages per extraction/classification batch")
+    parser.add_argument("--limit", type=int, help="stop after this many messages (resume later)")
+    parser.add_argument("--url", help="classify through a running API instead of a local published model")
+    parser.add_argument("--model-dir", help="model store (default: $MODEL_STORE_DIR or data/models)")
+    parser.add_argument("--model-version", type=int, help="published model version (default: current)")
+    parser.add_argument("--system-id", default="outlook", help="integrating system; selects its own model")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    try:
+        if args.url:
+            predict, version = remote_predictor(args.url, args.system_id)
+        else:
+            predict, version = local_predictor(args.model_dir, args.system_id, args.model_version)
+        stats = run_pipeline(args.paths, args.output, predict, version, workers=workers,
+                             batch_size=args.batch_size, checkpoint_path=args.checkpoint, limit=args.limit)
+    except (ValueError, OSError, mailbox.Error, ClassifierError) as e:
+        print(f"mailbox_pipeline: {e}", file=sys.stderr)
+        return 2
+    rate = stats['processed'] / stats['seconds'] if stats['seconds'] else 0
+    print(f"Classified {stats['processed']} messages in {stats['seconds']:.2f}s ({rate:.0f} msg/s, "
+          f"{workers} workers); {stats['total']} done in total", file=sys.stderr)
+    print(json.dumps(stats['folders'], indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -4,17 +4,50 @@ Outlook/Email Integration Example
 Automatyczne tagowanie emaili
 """
 
-import requests
 import json
+import os
+import sys
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from client import ClassifierClient, ClassifierError
+
+FOLDER_MAPPING = {
+    "Finanse": "Invoices & Bills",
+    "Sluzbowe": "Work & HR", 
+    "Daily Business": "Projects",
+    "Prywatne": "Personal"
+}
+
+def map_to_outlook_folder(area: str) -> str:
+    """Mapuj kategorię na folder Outlook"""
+    
+    return FOLDER_MAPPING.get(area, "Uncategorized")
+
+def generate_outlook_tags(classification_result: dict) -> list:
+    """Generuj tagi dla Outlook"""
+    
+    tags = [classification_result['area']]
+    
+    if classification_result.get('subarea'):
+        tags.append(classification_result['subarea'])
+    
+    # Dodaj tag na podstawie confidence
+    if classification_result['confidence'] > 0.9:
+        tags.append("Auto-Classified")
+    elif classification_result['confidence'] < 0.7:
+        tags.append("Needs-Review")
+    
+    return tags
+
 class EmailClassifier:
     """Klasyfikator emaili"""
     
     def __init__(self, api_url: str = "http://localhost:8000"):
         self.api_url = api_url
         self.system_id = "outlook"
+        self.client = ClassifierClient(api_url, system_id=self.system_id)
     
     def classify_email(self, subject: str, body: str, sender: str = None):
         """Klasyfikuj email na podstawie tematu i treści"""
@@ -22,55 +55,42 @@ class EmailClassifier:
         # Połącz temat i treść
         full_text = f"Subject: {subject}\n\n{body}"
         
-        response = requests.post(f"{self.api_url}/v1/classify", json={
-            "text": full_text,
-            "system_id": self.system_id,
-            "context": {
+        try:
+            result = self.client.classify(full_text, context={
                 "email_sender": sender,
                 "has_subject": bool(subject),
                 "content_length": len(body)
-            }
-        })
+            })
+        except ClassifierError as e:
+            return {"error": str(e)}
+        return self.describe(result)
+    
+    def classify_emails(self, emails: list) -> list:
+        """Klasyfikuj wiele emaili (dict subject/body) - paczki na /classify/batch"""
         
-        if response.status_code == 200:
-            result = response.json()
-            return {
-                "category": result['area'],
-                "subcategory": result.get('subarea'),
-                "confidence": result['confidence'],
-                "outlook_folder": self.map_to_outlook_folder(result['area']),
-                "tags": self.generate_outlook_tags(result)
-            }
-        else:
-            return {"error": response.text}
+        texts = [f"Subject: {email.get('subject', '')}\n\n{email.get('body', '')}" for email in emails]
+        return [self.describe(result) for result in self.client.classify_many(texts)]
     
-    def map_to_outlook_folder(self, area: str) -> str:
-        """Mapuj kategorię na folder Outlook"""
+    def describe(self, result: dict) -> dict:
+        """Wynik API -> kategoria, folder Outlook i tagi"""
         
-        folder_mapping = {
-            "Finanse": "Invoices & Bills",
-            "Sluzbowe": "Work & HR", 
-            "Daily Business": "Projects",
-            "Prywatne": "Personal"
+        return {
+            "category": result['area'],
+            "subcategory": result.get('subarea'),
+            "confidence": result['confidence'],
+            "outlook_folder": self.map_to_outlook_folder(result['area']),
+            "tags": self.generate_outlook_tags(result)
         }
+    
+    def map_to_outlook_folder(self, area: str) -> str:
+        """Mapuj kategorię na folder Outlook"""
         
-        return folder_mapping.get(area, "Uncategorized")
+        return map_to_outlook_folder(area)
     
     def generate_outlook_tags(self, classification_result: dict) -> list:
         """Generuj tagi dla Outlook"""
         
-        tags = [classification_result['area']]
-        
-        if classification_result.get('subarea'):
-            tags.append(classification_result['subarea'])
-        
-        # Dodaj tag na podstawie confidence
-        if classification_result['confidence'] > 0.9:
-            tags.append("Auto-Classified")
-        elif classification_result['confidence'] < 0.7:
-            tags.append("Needs-Review")
-        
-        return tags
+        return generate_outlook_tags(classification_result)
 
 # Przykład Outlook Add-in JavaScript
 outlook_addin_js = """
@@ -91,7 +111,7 @@ function classifyCurrentEmail() {
                 const subject = Office.context.mailbox.item.subject;
                 
                 // Call Document Classifier API
-                fetch('http://localhost:8000/v1/classify', {
+                fetch('http://localhost:8000/api/v1/classify/', {
                     method: 'POST',
                     headers: {
                         'Content-Type': 'application/json',
@@ -0,0 +1,117 @@
+# test_active_learning.py
+import os
+import tempfile
+
+import numpy as np
+
+from core.active_learning import LabellingQueue, uncertainty_scores
+from core.classifier import ClassificationEngine
+from core.database import DatabaseManager
+from core.starter_data import STARTER_EXAMPLES
+
+
+def _trained_engine(version):
+    engine = ClassificationEngine()
+    engine.fit([text for text, _, _ in STARTER_EXAMPLES], [area for _, area, _ in STARTER_EXAMPLES])
+    engine.model_version = version
+    return engine
+
+
+def test_uncertainty_measures():
+    probabilities = np.array([
+        [0.98, 0.01, 0.01],  # pewny
+        [0.5, 0.49, 0.01],   # remis dwóch klas
+        [1 / 3, 1 / 3, 1 / 3],
+    ])
+    margin = uncertainty_scores(probabilities, 'margin')
+    entropy = uncertainty_scores(probabilities, 'entropy')
+    assert margin[0] < 0.1 and margin[1] > 0.95
+    assert np.isclose(entropy[2], 1.0) and entropy[0] < entropy[1] < entropy[2]
+    assert np.allclose(uncertainty_scores(probabilities, 'least_confidence'), 1 - probabilities.max(axis=1))
+
+
+def test_queue_ranks_by_uncertainty_and_rescores_only_stale():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        queue = LabellingQueue(db, strategy='margin', batch_size=4, refresh_budget=6)
+        pool = [text for text, _, _ in STARTER_EXAMPLES[:10]] + ["Weekend plans", "Lunch budget meeting"]
+        queue.add([(text, "test") for text in pool])
+
+        engine = _trained_engine(1)
+        # Budżet ogranicza pracę jednego wywołania; reszta czeka na kolejne
+        first = queue.next(engine, limit=3)
+        assert first['rescored'] == 6 and first['stale'] == len(pool) - 6
+        second = queue.next(engine, limit=len(pool))
+        assert second['rescored'] == len(pool) - 6 and second['stale'] == 0
+        assert queue.refresh(engine) == 0
+
+        scores = [doc['uncertainty'] for doc in second['documents']]
+        assert scores == sorted(scores, reverse=True)
+        assert all(doc['model_version'] == 1 for doc in second['documents'])
+
+        # Nowa wersja modelu - oceny nieaktualne, przeliczane ponownie
+        assert queue.refresh(_trained_engine(2), budget=100) == len(pool)
+
+        top = second['documents'][0]
+        assert db.set_unlabelled_status(top['id'], 'labelled')
+        assert not db.set_unlabelled_status(top['id'], 'labelled')
+        assert top['id'] not in [doc['id'] for doc in queue.next(engine, limit=len(pool))['documents']]
+
+
+def test_untrained_model_serves_oldest_first():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        queue = LabellingQueue(db)
+        queue.add([("first", None), ("second", None)])
+        result = queue.next(ClassificationEngine())
+        assert [doc['text'] for doc in result['documents']] == ["first", "second"]
+        assert result['rescored'] == 0
+
+
+def test_failed_save_returns_document_to_queue():
+    from core.document_service import DocumentService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = {name: os.environ.get(name) for name in ("MODEL_STORE_DIR", "NEAR_DUPLICATES_INDEX")}
+        os.environ.update(MODEL_STORE_DIR=os.path.join(tmp, "models"),
+                          NEAR_DUPLICATES_INDEX=os.path.join(tmp, "near_duplicates.db"))
+        try:
+            db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+            service = DocumentService(db=db)
+            service.labelling.add([("Invoice for the March office rent", None)])
+            doc_id = service.labelling_queue()['documents'][0]['id']
+
+            def broken_save(*args):
+                raise OSError("disk full")
+
+            service.db.save_document = broken_save
+            try:
+                service.label_queued(doc_id, "Finanse")
+                assert False, "expected OSError"
+            except OSError:
+                pass
+            assert db.get_unlabelled_document(doc_id)[3] == 'pending'  # wraca do kolejki
+
+            del service.db.save_document
+            assert service.label_queued(doc_id, "Finanse")["document_id"]
+            assert db.get_unlabelled_document(doc_id)[3] == 'labelled'
+            assert service.label_queued(doc_id, "Finanse") is None
+            service.start_duplicates_sync().join()  # zapis uruchomił synchronizację indeksu w tmp
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+if __name__ == "__main__":
+    print("--- Testing active-learning queue ---")
+    test_uncertainty_measures()
+    print("✓ Margin, entropy and least-confidence scores")
+    test_queue_ranks_by_uncertainty_and_rescores_only_stale()
+    print("✓ Queue ranked by uncertainty, rescored within budget and per model version")
+    test_untrained_model_serves_oldest_first()
+    print("✓ Untrained model: documents served oldest first")
+    test_failed_save_returns_document_to_queue()
+    print("✓ A label whose save fails leaves the document pending")
\ No newline at end of file
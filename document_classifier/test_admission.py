@@ -0,0 +1,170 @@
+# test_admission.py
+import asyncio
+import os
+import sys
+
+import httpx
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "api"))
+
+from middleware.admission import AdmissionControlMiddleware, ConcurrencyLimit, Rejected
+
+
+def _app(limits, **kwargs):
+    app = FastAPI()
+
+    @app.post("/api/v1/classify/")
+    async def classify(payload: dict):
+        await asyncio.sleep(0.2)
+        return {"echo": payload}
+
+    @app.get("/api/v1/health/live")
+    async def live():
+        return {"status": "alive"}
+
+    app.add_middleware(AdmissionControlMiddleware, limits=limits, **kwargs)
+    return app
+
+
+async def _burst(app, count, **request):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(*[
+            client.post("/api/v1/classify/", **request) for _ in range(count)
+        ])
+
+
+def test_overload_is_rejected_fast_with_retry_after():
+    app = _app({"classify": {"max_concurrency": 1, "max_queue": 1, "queue_timeout": 5}})
+    responses = asyncio.run(_burst(app, 4, json={"text": "x"}))
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [200, 200, 503, 503]
+    rejected = [r for r in responses if r.status_code == 503]
+    assert all(int(r.headers["retry-after"]) >= 1 for r in rejected)
+
+
+def test_queue_deadline():
+    app = _app({"classify": {"max_concurrency": 1, "max_queue": 10, "queue_timeout": 0.05}})
+    responses = asyncio.run(_burst(app, 2, json={"text": "x"}))
+    assert sorted(r.status_code for r in responses) == [200, 503]
+
+
+def test_deadline_racing_a_release_keeps_capacity():
+    async def scenario():
+        limit = ConcurrencyLimit("classify", max_concurrency=2, max_queue=100, queue_timeout=0.001)
+
+        async def request():
+            try:
+                await limit.acquire()
+            except Rejected:
+                return
+            await asyncio.sleep(0.001)  # zwolnienie w okolicy terminu kolejnych oczekujących
+            limit.release(0.001)
+
+        for _ in range(20):
+            await asyncio.gather(*(request() for _ in range(10)))
+
+        # Uprawnienie przyznane dokładnie przy terminie wraca do puli
+        granted = asyncio.ensure_future(limit._semaphore.acquire())
+        await granted
+        limit._abandon(granted)
+        await asyncio.sleep(0)
+        return limit._semaphore._value
+
+    assert asyncio.run(scenario()) == 2
+
+
+def test_rate_limit_by_system_id_in_body():
+    app = _app(
+        {"classify": {"max_concurrency": 10, "max_queue": 10, "queue_timeout": 5}},
+        rate_limit_per_second=0.01,
+        rate_limit_burst=2,
+    )
+    responses = asyncio.run(_burst(app, 3, json={"text": "x", "system_id": "outlook"}))
+    statuses = sorted(r.status_code for r in responses)
+    assert statuses == [200, 200, 429]
+    ok = [r for r in responses if r.status_code == 200]
+    assert ok[0].json()["echo"]["system_id"] == "outlook"  # body replayed intact
+
+
+def test_large_body_is_peeked_only_up_to_the_cap():
+    async def scenario(chunks):
+        received = []
+
+        async def app(scope, receive, send):
+            while True:
+                message = await receive()
+                received.append(message)
+                if message["type"] != "http.request" or not message.get("more_body", False):
+                    break
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = AdmissionControlMiddleware(
+            app,
+            {"classify": {"max_concurrency": 10, "max_queue": 10, "queue_timeout": 5}},
+            rate_limit_per_second=0.01,
+            rate_limit_burst=1,
+            max_peek_bytes=8,
+        )
+        pending = list(chunks)
+        statuses = []
+
+        async def receive():
+            return pending.pop(0)
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+
+        scope = {
+            "type": "http", "method": "POST", "path": "/api/v1/classify/",
+            "headers": [], "query_string": b"", "client": ("10.0.0.7", 1234),
+        }
+        await middleware(scope, receive, send)
+        return statuses, received, middleware
+
+    streamed = [
+        {"type": "http.request", "body": b'{"text": "', "more_body": True},
+        {"type": "http.request", "body": b'x" * 100', "more_body": True},
+        {"type": "http.request", "body": b', "system_id": "a"}', "more_body": False},
+    ]
+    statuses, received, middleware = asyncio.run(scenario(streamed))
+    assert statuses == [200]
+    assert received == streamed  # every chunk replayed in order, nothing lost
+    assert "10.0.0.7" in middleware.rate_limiter._buckets  # keyed by address past the cap
+
+    disconnected = [
+        {"type": "http.request", "body": b"{", "more_body": True},
+        {"type": "http.disconnect"},
+    ]
+    statuses, received, _ = asyncio.run(scenario(disconnected))
+    assert received == disconnected
+
+
+def test_unclassified_routes_are_never_shed():
+    app = _app({"classify": {"max_concurrency": 1, "max_queue": 0, "queue_timeout": 0}})
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/api/v1/health/live")
+
+    assert asyncio.run(scenario()).status_code == 200
+
+
+if __name__ == "__main__":
+    print("--- Testing AdmissionControlMiddleware ---")
+    test_overload_is_rejected_fast_with_retry_after()
+    print("✓ Overload rejected with 503 and Retry-After")
+    test_queue_deadline()
+    print("✓ Queued requests respect the deadline")
+    test_deadline_racing_a_release_keeps_capacity()
+    print("✓ Deadlines racing releases never leak permits")
+    test_rate_limit_by_system_id_in_body()
+    print("✓ Per-client rate limit by system_id")
+    test_large_body_is_peeked_only_up_to_the_cap()
+    print("✓ Body peek is capped and replayed intact")
+    test_unclassified_routes_are_never_shed()
+    print("✓ Health routes bypass admission control")
\ No newline at end of file
@@ -0,0 +1,76 @@
+# test_benchmarks.py
+import json
+import os
+import tempfile
+
+from benchmarks import suite
+from benchmarks.corpus import SyntheticCorpus, synthetic_corpus
+from core.starter_data import STARTER_EXAMPLES
+
+
+def test_synthetic_corpus_is_reproducible_and_perturbed():
+    first, second = synthetic_corpus(500, seed=3), synthetic_corpus(500, seed=3)
+    assert first == second
+    assert first != synthetic_corpus(500, seed=4)
+
+    templates = {text for text, _, _ in STARTER_EXAMPLES}
+    assert sum(text in templates for text, _, _ in first) < 10  # szablony prawie zawsze zmienione
+    assert {(area, subarea) for _, area, subarea in first} <= {(a, s) for _, a, s in STARTER_EXAMPLES}
+    # Długi ogon pseudo-słów - słownik rośnie z rozmiarem korpusu
+    vocabulary = lambda docs: {word for text, _, _ in docs for word in text.split()}
+    assert len(vocabulary(synthetic_corpus(5000))) > 2 * len(vocabulary(synthetic_corpus(500)))
+    # Generator nie buduje listy - strumień dowolnej długości
+    assert next(iter(SyntheticCorpus().generate(10 ** 9)))
+
+
+def test_suite_writes_comparable_json():
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "results.json")
+        assert suite.main(["--sizes", "400", "--predict-samples", "100", "--api-documents", "200",
+                           "--startup-repeat", "1", "--output", output]) == 0
+        with open(output) as f:
+            report = json.load(f)
+
+        assert report["meta"]["engine"] and "sklearn" in report["meta"]["packages"]
+        result = report["results"][0]
+        assert result["size"] == 400
+        for name in ("generate", "fit", "learn", "predict", "predict_batch", "db", "api"):
+            assert name in result, name
+        assert result["db"]["insert"]["docs_per_second"] > 0
+        assert result["predict"]["sklearn_p50_ms"] > 0 and result["predict"]["kernel_speedup"] > 0
+        assert result["api"]["classify"]["p99_ms"] >= result["api"]["classify"]["p50_ms"] > 0
+
+        # Dwa razy wolniej = regresja; opisowe liczniki (count, size) nie są porównywane
+        slower = json.loads(json.dumps(report))
+        slower["results"][0]["predict"]["p50_ms"] *= 2
+        rows = {metric: regression for metric, _, _, _, regression in suite.compare(report, slower)}
+        assert rows["400:predict.p50_ms"] and not rows["400:fit.seconds"]
+        assert "400:predict.count" not in rows
+        assert "startup:cli.wall_ms" in rows
+
+        # Przebieg spoza repozytorium git (commit = None) też da się porównać z CLI
+        slower["meta"]["commit"] = None
+        slower_path = os.path.join(tmp, "slower.json")
+        with open(slower_path, "w") as f:
+            json.dump(slower, f)
+        assert suite.main(["--compare", output, slower_path]) == 1
+
+
+def test_cold_start_defers_heavy_imports():
+    with tempfile.TemporaryDirectory() as tmp:
+        startup = suite.bench_startup(tmp, repeat=1)
+    assert set(startup) == set(suite.STARTUP_TARGETS)
+    # Import serwisu, CLI i budowa menedżerów baz nie ładują sklearn/scipy/psycopg2 ani nie łączą się z bazą
+    for name, result in startup.items():
+        assert result["heavy_modules"] == [], (name, result)
+        assert 0 < result["import_ms"] < result["wall_ms"]
+
+
+if __name__ == "__main__":
+    print("--- Testing benchmark suite ---")
+    test_synthetic_corpus_is_reproducible_and_perturbed()
+    print("✓ Synthetic corpus reproducible, perturbed and streamable")
+    test_suite_writes_comparable_json()
+    print("✓ Suite emits JSON results that compare between runs")
+    test_cold_start_defers_heavy_imports()
+    print("✓ Cold start: heavy imports and connections wait for first use")
\ No newline at end of file
@@ -0,0 +1,104 @@
+# test_cli.py
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+
+import cli
+from core.classifier import ClassificationEngine
+from core.database import DatabaseManager
+from core.model_store import ModelStore
+from core.starter_data import STARTER_EXAMPLES
+
+
+def _publish_model(root):
+    engine = ClassificationEngine()
+    engine.fit([text for text, _, _ in STARTER_EXAMPLES], [area for _, area, _ in STARTER_EXAMPLES])
+    ModelStore(root).publish(engine)
+    return engine
+
+
+def _tree(root, examples):
+    """Dokumenty w podkatalogach, plus plik spoza wzorca"""
+    for i, (text, _, _) in enumerate(examples):
+        directory = os.path.join(root, f"batch{i % 3}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"doc{i:03d}.txt"), "w") as f:
+            f.write(text)
+    with open(os.path.join(root, "notes.md"), "w") as f:
+        f.write("not a document")
+
+
+def test_classify_directory_tree_batched_and_in_pool():
+    with tempfile.TemporaryDirectory() as tmp:
+        models, documents = os.path.join(tmp, "models"), os.path.join(tmp, "documents")
+        engine = _publish_model(models)
+        examples = STARTER_EXAMPLES[:20]
+        _tree(documents, examples)
+
+        outputs = {}
+        for workers in ("1", "2"):
+            output = os.path.join(tmp, f"results{workers}.ndjson")
+            assert cli.main(["classify", documents, "--pattern", "*.txt", "--model-dir", models,
+                             "--workers", workers, "--batch-size", "3", "-o", output]) == 0
+            with open(output) as f:
+                outputs[workers] = [json.loads(line) for line in f]
+
+        assert outputs["1"] == outputs["2"]
+        rows = outputs["1"]
+        assert len(rows) == len(examples) and all(row["model_version"] == 1 for row in rows)
+        by_path = {os.path.basename(row["id"]): row for row in rows}
+        for i, (text, _, _) in enumerate(examples):
+            assert by_path[f"doc{i:03d}.txt"]["area"] == engine.predict(text)["area"]
+
+
+def test_classify_stdin_lines_to_csv():
+    with tempfile.TemporaryDirectory() as tmp:
+        models = os.path.join(tmp, "models")
+        _publish_model(models)
+        output = os.path.join(tmp, "results.csv")
+        stdin = sys.stdin
+        sys.stdin = io.StringIO("Invoice for office chairs\n\nFootball match tickets\n")
+        try:
+            assert cli.main(["classify", "--model-dir", models, "-f", "csv", "-o", output]) == 0
+        finally:
+            sys.stdin = stdin
+        with open(output, newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert [row["id"] for row in rows] == ["stdin:1", "stdin:3"]
+        assert all(row["area"] and 0 < float(row["confidence"]) <= 1 for row in rows)
+
+        # Bez opublikowanego modelu - czytelny błąd zamiast wyjątku
+        assert cli.main(["classify", "--model-dir", os.path.join(tmp, "empty"), os.devnull]) == 2
+
+
+def test_import_labels_csv_and_ndjson():
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "classifier.db")
+        labels_csv = os.path.join(tmp, "labels.csv")
+        with open(labels_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Text", "Area", "Subarea"])
+            writer.writerows(STARTER_EXAMPLES[:10])
+            writer.writerow(["", "Sport", ""])
+        labels_ndjson = os.path.join(tmp, "labels.ndjson")
+        with open(labels_ndjson, "w") as f:
+            for text, area, subarea in STARTER_EXAMPLES[10:15]:
+                f.write(json.dumps({"text": text, "area": area, "subarea": subarea}) + "\n")
+            f.write("{broken\n")
+
+        assert cli.main(["--sqlite", database, "import-labels", labels_csv, "--batch-size", "4"]) == 0
+        assert cli.main(["--sqlite", database, "import-labels", labels_ndjson]) == 0
+        assert DatabaseManager(database).count_documents() == 15
+
+
+if __name__ == "__main__":
+    print("--- Testing command line tools ---")
+    test_classify_directory_tree_batched_and_in_pool()
+    print("✓ Directory tree classified in batches and in a process pool, same results")
+    test_classify_stdin_lines_to_csv()
+    print("✓ stdin lines classified to CSV; missing model reported")
+    test_import_labels_csv_and_ndjson()
+    print("✓ Labels imported from CSV and NDJSON")
\ No newline at end of file
@@ -0,0 +1,230 @@
+# test_client.py
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from benchmarks.corpus import SyntheticCorpus
+from client import AsyncClassifierClient, ClassifierClient, ClassifierError, RetryPolicy
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Zastępczy serwer API: liczy połączenia i paczki, na życzenie odrzuca albo się spóźnia"""
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body, headers=()):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._reply(200, {"status": "healthy"} if self.path.endswith("/health/") else {"areas": ["Finanse"]})
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        server.paths.append(self.path)
+        if server.reject:
+            server.reject -= 1
+            return self._reply(503, {"detail": "Server busy, retry later"}, [("Retry-After", "0")])
+        if server.delay:
+            time.sleep(server.delay)
+        if self.path == "/api/v1/classify/batch":
+            server.batches.append(len(payload["texts"]))
+            if "invalid" in payload["texts"]:  # walidacja API odrzuca całą paczkę
+                return self._reply(422, {"detail": [{"msg": "invalid text"}]})
+            if server.learning:  # tryb learning odrzuca każdą klasyfikację
+                return self._reply(400, {"detail": "System is in learning mode"})
+            return self._reply(200, {"results": [{"area": text.upper(), "confidence": 0.9, "suggestions": [],
+                                                  "metadata": {}} for text in payload["texts"]],
+                                     "mode": "auto", "model_version": "1", "model": "default",
+                                     "count": len(payload["texts"])})
+        if self.path == "/api/v1/classify/feedback":
+            return self._reply(200, {"success": True, "message": "ok", "model_updated": True})
+        if self.path == "/api/v1/classify/":
+            return self._reply(200, {"area": payload["text"].upper(), "confidence": 0.9, "mode": "auto"})
+        self._reply(404, {"detail": "Not Found"})
+
+
+class _Server:
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+        self.httpd.daemon_threads = True
+        self.httpd.connections, self.httpd.reject, self.httpd.delay, self.httpd.learning = 0, 0, 0, False
+        self.httpd.paths, self.httpd.batches = [], []
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self.httpd
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_sync_client_pools_batches_and_retries():
+    with _Server() as server:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with ClassifierClient(url, batch_size=4, retry=RetryPolicy(attempts=3, backoff=0.01)) as client:
+            assert client.health()["status"] == "healthy"
+            for i in range(10):
+                assert client.classify(f"doc {i}")["area"] == f"DOC {i}"
+            assert server.connections == 1  # keep-alive: jedno połączenie na wszystkie wywołania
+
+            texts = [f"text {i}" for i in range(10)]
+            assert [r["area"] for r in client.classify_many(texts)] == [t.upper() for t in texts]
+            assert server.batches == [4, 4, 2]
+
+            server.reject = 2  # admission control: 503 z Retry-After, potem sukces
+            assert client.classify("busy")["area"] == "BUSY"
+            server.reject = 1
+            assert client.feedback("text", "Finanse")["success"]  # odrzucony feedback można ponowić
+
+            server.reject = 5
+            try:
+                client.classify("still busy")
+                assert False, "expected ClassifierError"
+            except ClassifierError as e:
+                assert e.status_code == 503 and "Server busy" in str(e)
+            server.reject = 0
+
+            assert client.categories()["areas"] == ["Finanse"]
+            try:
+                client._call("POST", "/missing", {})
+                assert False, "expected ClassifierError"
+            except ClassifierError as e:
+                assert e.status_code == 404
+
+
+def test_timeouts_are_retried_only_when_idempotent():
+    policy = RetryPolicy(attempts=3, backoff=0.0)
+    assert policy.should_retry(0, None, idempotent=True)
+    assert not policy.should_retry(0, None, idempotent=False)
+    assert policy.should_retry(0, None, idempotent=False, connect_error=True)
+    assert not policy.should_retry(0, 502, idempotent=False) and policy.should_retry(0, 429, idempotent=False)
+    assert not policy.should_retry(2, 503)
+    assert policy.delay(0, retry_after="120") == policy.max_backoff
+
+    with _Server() as server:
+        server.delay = 0.5
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with ClassifierClient(url, timeout=0.1, retry=policy) as client:
+            started = time.perf_counter()
+            try:
+                client.classify("slow")
+                assert False, "expected ClassifierError"
+            except ClassifierError as e:
+                assert e.status_code is None and "ReadTimeout" in str(e)
+            assert time.perf_counter() - started < 1.0
+            assert server.paths.count("/api/v1/classify/") == 3
+
+            server.paths.clear()
+            try:
+                client.feedback("slow", "Finanse")  # mógł zostać zapisany - bez ponowień
+                assert False, "expected ClassifierError"
+            except ClassifierError:
+                pass
+            assert server.paths == ["/api/v1/classify/feedback"]
+
+
+def test_async_client_coalesces_concurrent_calls():
+    async def run(url):
+        async with AsyncClassifierClient(url, batch_size=16, max_delay=0.02) as client:
+            results = await asyncio.gather(*(client.classify(f"doc {i}") for i in range(40)))
+            assert [r["area"] for r in results] == [f"DOC {i}" for i in range(40)]
+            # Z kontekstem klasyfikacja idzie pojedynczo na /classify/
+            single = await client.classify("one", context={"source": "test"})
+            many = await client.classify_many([f"m {i}" for i in range(20)])
+            return single, many
+
+    with _Server() as server:
+        single, many = asyncio.run(run(f"http://127.0.0.1:{server.server_address[1]}"))
+        assert server.batches[:3] == [16, 16, 8]
+        assert sorted(server.batches[3:]) == [4, 16]
+        assert single["area"] == "ONE" and len(many) == 20
+        assert server.paths.count("/api/v1/classify/") == 1
+
+
+def test_invalid_text_fails_only_its_own_call():
+    async def run(url):
+        async with AsyncClassifierClient(url, batch_size=16, max_delay=0.02) as client:
+            try:
+                await client.classify("x" * 10001)  # odrzucone przed dołączeniem do paczki
+                assert False, "expected ClassifierError"
+            except ClassifierError as e:
+                assert e.status_code == 422
+            return await asyncio.gather(client.classify("doc 1"), client.classify("invalid"),
+                                        client.classify("doc 2"), return_exceptions=True)
+
+    async def run_many(url):
+        async with AsyncClassifierClient(url, batch_size=16, max_delay=0.02) as client:
+            return await asyncio.gather(*(client.classify(f"doc {i}") for i in range(5)), return_exceptions=True)
+
+    with _Server() as server:
+        first, invalid, second = asyncio.run(run(f"http://127.0.0.1:{server.server_address[1]}"))
+        assert first["area"] == "DOC 1" and second["area"] == "DOC 2"
+        assert isinstance(invalid, ClassifierError) and invalid.status_code == 422
+        assert server.batches == [3, 1, 1, 1]  # odrzucona paczka powtórzona tekst po tekście
+
+        # 400 dotyczy wszystkich tekstów - błąd dla każdego wywołania, bez rozbijania paczki
+        server.batches.clear()
+        server.learning = True
+        results = asyncio.run(run_many(f"http://127.0.0.1:{server.server_address[1]}"))
+        assert all(isinstance(r, ClassifierError) and r.status_code == 400 for r in results)
+        assert server.batches == [5]
+
+
+def test_batch_endpoint_matches_single_classify():
+    from benchmarks.suite import in_process_api
+
+    documents = list(SyntheticCorpus(0).generate(300))
+    texts = [text for text, _, _ in documents[:25]]
+
+    async def run(app, prefix):
+        transport = httpx.ASGITransport(app=app)
+        async with AsyncClassifierClient("http://api", api_prefix=prefix, transport=transport) as client:
+            batched = await asyncio.gather(*(client.classify(text, confidence_threshold=0.0) for text in texts))
+            single = [await client._call("POST", "/classify/", {"text": text, "confidence_threshold": 0.0})
+                      for text in texts]
+            unknown = await client.classify_many(texts[:3], confidence_threshold=1.0)
+            try:
+                await client.classify_many([""])
+                assert False, "expected ClassifierError"
+            except ClassifierError as e:
+                assert e.status_code == 422
+            return batched, single, unknown
+
+    with tempfile.TemporaryDirectory() as directory:
+        with in_process_api(documents, directory) as (app, prefix):
+            batched, single, unknown = asyncio.run(run(app, prefix))
+    assert [r["area"] for r in batched] == [r["area"] for r in single]
+    assert all(abs(b["confidence"] - s["confidence"]) < 1e-6 for b, s in zip(batched, single))
+    assert all(r["area"] == "Unknown" and r["suggestions"] for r in unknown)
+
+
+if __name__ == "__main__":
+    print("--- Testing classifier client ---")
+    test_sync_client_pools_batches_and_retries()
+    print("✓ Sync client reuses one connection, batches and retries rejected requests")
+    test_timeouts_are_retried_only_when_idempotent()
+    print("✓ Timeouts retried for classify, not for feedback")
+    test_async_client_coalesces_concurrent_calls()
+    print("✓ Async client coalesces concurrent classify calls into batches")
+    test_invalid_text_fails_only_its_own_call()
+    print("✓ An invalid text fails only the call that submitted it")
+    test_batch_endpoint_matches_single_classify()
+    print("✓ /classify/batch matches /classify/ through the async client")
\ No newline at end of file
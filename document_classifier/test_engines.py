@@ -0,0 +1,87 @@
+# test_engines.py
+import random
+
+import numpy as np
+
+from benchmarks.engines import compare_engines
+from core.classifier import ClassificationEngine
+from core.engines import ENGINES
+from core.features import vectorizer_config
+from core.starter_data import STARTER_EXAMPLES
+
+CONFIGS = [
+    vectorizer_config(vectorizer="tfidf", dtype="float32"),
+    vectorizer_config(vectorizer="hashing", max_features=2 ** 12, dtype="float64"),
+]
+
+
+def _corpus(size=400, seed=0, areas=None):
+    rng = random.Random(seed)
+    examples = [example for example in STARTER_EXAMPLES if areas is None or example[1] in areas]
+    words = sorted({word for text, _, _ in examples for word in text.lower().split()})
+    texts, labels = [], []
+    for _ in range(size):
+        text, area, _ = rng.choice(examples)
+        texts.append(text + " " + " ".join(rng.choice(words) for _ in range(rng.randint(0, 8))))
+        labels.append(area)
+    return texts, labels
+
+
+def test_every_engine_trains_and_kernel_matches_sklearn():
+    queries = _corpus(100, seed=1)[0] + ["", "zzz unknown tokens only"]
+    two_areas = sorted({area for _, area, _ in STARTER_EXAMPLES})[:2]
+    for config in CONFIGS:
+        for name in ENGINES:
+            # Dwie klasy - binarny wariant SGD (jeden wiersz wag)
+            for texts, labels in (_corpus(), _corpus(areas=two_areas)):
+                engine = ClassificationEngine(config, engine=name)
+                assert engine.fit(texts, labels), name
+                kernel = engine.kernel()
+                assert kernel is not None, name
+                for text in queries:
+                    X = engine.vectorizer.transform([text])
+                    assert kernel.predict(text)[0] == engine.model.predict(X)[0], (name, text)
+                    np.testing.assert_allclose(np.exp(kernel.predict_log_proba(text)),
+                                               engine.model.predict_proba(X)[0], rtol=1e-6, atol=1e-9)
+
+
+def test_engine_is_persisted_and_counts_engines_train_in_parallel():
+    texts, labels = _corpus()
+    engine = ClassificationEngine(CONFIGS[0], engine="complement_nb")
+    engine.fit(texts, labels)
+    restored = ClassificationEngine.from_state(engine.export_state())
+    assert restored.engine == "complement_nb"
+    assert restored.predict(texts[0]) == engine.predict(texts[0])
+
+    parallel = ClassificationEngine(CONFIGS[1], engine="complement_nb")
+    assert parallel.fit_parallel(zip(texts, labels), workers=1, chunk_size=150)
+    assert type(parallel.model).__name__ == "ComplementNB"
+    assert parallel.learn("Invoice for the spring football tournament tickets", "Sport")
+    assert "Sport" in parallel.model.classes_ and type(parallel.model).__name__ == "ComplementNB"
+
+    sgd = ClassificationEngine(CONFIGS[1], engine="sgd")
+    try:
+        sgd.fit_parallel(zip(texts, labels), workers=1)
+        assert False, "sgd cannot be trained from counts"
+    except ValueError:
+        pass
+
+
+def test_benchmark_harness_reports_every_engine():
+    texts, labels = _corpus(300)
+    results = compare_engines(texts, labels, features=CONFIGS[0], latency_samples=50)
+    assert [row["engine"] for row in results] == list(ENGINES)
+    for row in results:
+        assert row["train_documents"] == 240 and row["test_documents"] == 60
+        assert 0 < row["predict_p50_ms"] <= row["predict_p99_ms"]
+        assert row["batch_docs_per_second"] > 0 and 0 <= row["accuracy"] <= 1
+
+
+if __name__ == "__main__":
+    print("--- Testing classifier engines ---")
+    test_every_engine_trains_and_kernel_matches_sklearn()
+    print("✓ nb, complement_nb and sgd train; inference kernel matches sklearn for each")
+    test_engine_is_persisted_and_counts_engines_train_in_parallel()
+    print("✓ Engine persisted with the model; complement_nb trains from summed counts")
+    test_benchmark_harness_reports_every_engine()
+    print("✓ Benchmark harness reports every engine on one split")
\ No newline at end of file
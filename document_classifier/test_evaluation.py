@@ -0,0 +1,84 @@
+# test_evaluation.py
+import os
+import tempfile
+import time
+
+from core.classifier import ClassificationEngine
+from core.evaluation import ModelEvaluator, evaluate
+from core.features import vectorizer_config
+from core.model_store import ModelStore
+from core.starter_data import STARTER_EXAMPLES
+
+TEXTS = [text for text, _, _ in STARTER_EXAMPLES]
+LABELS = [area for _, area, _ in STARTER_EXAMPLES]
+
+
+def test_kfold_metrics():
+    result = evaluate(TEXTS, LABELS, folds=5, max_workers=2)
+    assert result["folds"] == 5
+    assert result["evaluated_documents"] == len(TEXTS)
+    assert 0 <= result["accuracy"] <= 100
+    assert set(result["per_class"]) == set(LABELS)
+    matrix = result["confusion_matrix"]["matrix"]
+    assert sum(map(sum, matrix)) == len(TEXTS)
+    assert sum(c["support"] for c in result["per_class"].values()) == len(TEXTS)
+
+
+def test_evaluator_caches_per_model_version():
+    with tempfile.TemporaryDirectory() as root:
+        store = ModelStore(root)
+        engine = ClassificationEngine()
+        engine.fit(TEXTS, LABELS)
+        version = store.publish(engine)
+
+        evaluator = ModelEvaluator(store, folds=3, max_workers=1)
+        assert evaluator.get(version) is None  # liczone w tle, bez blokowania
+        deadline = time.time() + 30
+        while evaluator.get(version) is None and time.time() < deadline:
+            time.sleep(0.05)
+        result = evaluator.get(version)
+        assert result["model_version"] == version
+
+        # Inny proces czyta gotowy wynik z dysku
+        assert ModelEvaluator(store).get(version)["accuracy"] == result["accuracy"]
+
+
+def test_folds_use_model_config_and_failures_are_cached():
+    with tempfile.TemporaryDirectory() as root:
+        store = ModelStore(root)
+        engine = ClassificationEngine(vectorizer_config(vectorizer='hashing'), 'complement_nb')
+        engine.fit(TEXTS, LABELS)
+        version = store.publish(engine)
+
+        # Ustawienia procesu nie mogą podmienić silnika ocenianego modelu
+        os.environ['CLASSIFIER_ENGINE'] = 'unknown'
+        try:
+            result = evaluate(TEXTS, LABELS, folds=3, max_workers=1,
+                              features=engine.features, engine=engine.engine)
+            assert result["folds"] == 3
+        finally:
+            del os.environ['CLASSIFIER_ENGINE']
+
+        loads = []
+
+        def broken_load(version, with_corpus=False):
+            loads.append(version)
+            raise OSError("disk gone")
+
+        store.load = broken_load
+        evaluator = ModelEvaluator(store, folds=3, max_workers=1)
+        deadline = time.time() + 10
+        while evaluator.get(version) is None and time.time() < deadline:
+            time.sleep(0.05)
+        assert "disk gone" in evaluator.get(version)["error"]
+        assert loads == [version]  # odpytywanie nie zleca obliczeń ponownie
+
+
+if __name__ == "__main__":
+    print("--- Testing model evaluation ---")
+    test_kfold_metrics()
+    print("✓ K-fold metrics with per-class scores and confusion matrix")
+    test_evaluator_caches_per_model_version()
+    print("✓ Evaluation runs in background and is cached per model version")
+    test_folds_use_model_config_and_failures_are_cached()
+    print("✓ Folds use the evaluated model's engine; a failed evaluation is reported, not retried")
@@ -0,0 +1,73 @@
+# test_export.py
+import csv
+import io
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import date
+
+from core.csv_import import import_csv
+from core.database import DatabaseManager
+from core.export import available_formats, export_documents
+
+
+def _database(tmp):
+    db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+    db.save_documents([
+        (f"Invoice number {i}, net \"30\" days", "Finanse" if i % 2 else "Sluzbowe", "Faktury" if i % 3 else None)
+        for i in range(3000)
+    ])
+    with sqlite3.connect(db.db_path) as conn:
+        conn.execute("UPDATE documents SET created_at = '2025-01-15 10:00:00' WHERE id <= 100")
+    return db
+
+
+def test_csv_export_round_trips_through_import():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _database(tmp)
+        chunks = list(export_documents(db, "csv", batch_size=500))
+        assert len(chunks) == 6  # strumień paczek, nie jeden bufor
+
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+        assert len(rows) == 3000
+        assert rows[1]["text"] == 'Invoice number 1, net "30" days'
+
+        copy = DatabaseManager(os.path.join(tmp, "copy.db"))
+        result = import_csv(io.BytesIO(b"".join(chunks)), copy)
+        assert result["imported_rows"] == 3000
+        assert set(copy.get_category_counts()) == set(db.get_category_counts())
+
+
+def test_filters():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _database(tmp)
+        lines = b"".join(export_documents(db, "ndjson", area="Finanse", subarea="Faktury")).splitlines()
+        docs = [json.loads(line) for line in lines]
+        assert len(docs) == 1000
+        assert {(d["area"], d["subarea"]) for d in docs} == {("Finanse", "Faktury")}
+
+        january = list(db.iter_documents(date_from=date(2025, 1, 1), date_to=date(2025, 1, 15)))
+        assert [doc[0] for doc in january] == list(range(1, 101))
+
+
+def test_parquet_export():
+    if "parquet" not in available_formats():
+        return  # pyarrow nie jest zainstalowany
+    import pyarrow.parquet as pq
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = _database(tmp)
+        table = pq.read_table(io.BytesIO(b"".join(export_documents(db, "parquet"))))
+        assert table.num_rows == 3000
+        assert table.column_names == ["id", "text", "area", "subarea", "created_at"]
+
+
+if __name__ == "__main__":
+    print("--- Testing corpus export ---")
+    test_csv_export_round_trips_through_import()
+    print("✓ CSV export streams in chunks and re-imports cleanly")
+    test_filters()
+    print("✓ Area, subarea and date filters applied in the query")
+    test_parquet_export()
+    print("✓ Parquet export readable by pyarrow")
\ No newline at end of file
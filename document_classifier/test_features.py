@@ -0,0 +1,61 @@
+# test_features.py
+import numpy as np
+
+from core.classifier import ClassificationEngine
+from core.features import build_vectorizer, vectorizer_config
+from core.starter_data import STARTER_EXAMPLES
+
+
+def _corpus():
+    texts = [text for text, _, _ in STARTER_EXAMPLES]
+    labels = [area for _, area, _ in STARTER_EXAMPLES]
+    return texts, labels
+
+
+def test_default_matches_previous_vectorizer_in_float32():
+    config = vectorizer_config(vectorizer="tfidf", max_features=None, ngram_max=1,
+                               stop_words="english", dtype="float32")
+    assert config["max_features"] == 1000
+    X = build_vectorizer(config).fit_transform(_corpus()[0])
+    assert X.dtype == np.float32
+
+
+def test_hashing_engine_has_no_vocabulary():
+    texts, labels = _corpus()
+    engine = ClassificationEngine(vectorizer_config(vectorizer="hashing", max_features=2 ** 12,
+                                                    ngram_max=2, stop_words="english,polish",
+                                                    dtype="float32"))
+    engine.fit(texts, labels)
+    assert engine.can_predict()
+    assert not hasattr(engine.vectorizer.named_steps["hashing"], "vocabulary_")
+    assert engine.vectorizer.transform(texts[:1]).dtype == np.float32
+    assert engine.predict(texts[0])["area"] == labels[0]
+
+
+def test_polish_stop_words():
+    config = vectorizer_config(vectorizer="tfidf", stop_words="polish")
+    vectorizer = build_vectorizer(config).fit(["faktura dla firmy oraz rachunek", "spotkanie z zespołem w biurze"])
+    assert "dla" not in vectorizer.vocabulary_
+    assert "oraz" not in vectorizer.vocabulary_
+    assert "faktura" in vectorizer.vocabulary_
+
+
+def test_invalid_config():
+    for overrides in ({"vectorizer": "bert"}, {"dtype": "float16"}, {"stop_words": "klingon"}):
+        try:
+            build_vectorizer(vectorizer_config(**overrides))
+        except ValueError:
+            continue
+        raise AssertionError(f"{overrides} accepted")
+
+
+if __name__ == "__main__":
+    print("--- Testing feature extraction config ---")
+    test_default_matches_previous_vectorizer_in_float32()
+    print("✓ Default TF-IDF produces float32 features")
+    test_hashing_engine_has_no_vocabulary()
+    print("✓ Hashing vectorizer trains and predicts without a vocabulary")
+    test_polish_stop_words()
+    print("✓ Polish stop words removed")
+    test_invalid_config()
+    print("✓ Invalid configuration rejected")
\ No newline at end of file
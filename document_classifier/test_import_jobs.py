@@ -0,0 +1,102 @@
+# test_import_jobs.py
+import io
+import json
+import os
+import tempfile
+import time
+
+from core.csv_import import import_csv
+from core.database import DatabaseManager
+from core.import_jobs import ImportJobManager
+
+
+def _csv(rows):
+    lines = ["text,area,subarea"]
+    for i in range(rows):
+        area = "Finanse" if i % 2 else "Sluzbowe"
+        lines.append(f"Document number {i} about {area.lower()} matters,{area},")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _wait(manager, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job["status"] not in ("queued", "running") and job["retrain"] != "pending":
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_background_import_triggers_one_retrain():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        retrains = []
+        manager = ImportJobManager(db, on_complete=lambda: retrains.append(1) or {"message": "trained"},
+                                   root=os.path.join(tmp, "imports"), batch_size=100)
+
+        job = manager.submit(io.BytesIO(_csv(1000)), "docs.csv")
+        job = _wait(manager, job["job_id"])
+
+        assert job["status"] == "completed"
+        assert job["rows_parsed"] == 1000
+        assert job["imported_rows"] == 1000
+        assert job["retrain"] == "trained"
+        assert retrains == [1]
+        assert len(db.get_all_documents()) == 1000
+
+
+def test_resume_from_checkpoint_after_crash():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        root = os.path.join(tmp, "imports")
+        manager = ImportJobManager(db, root=root)
+
+        # Symulacja awarii: zadanie "running" z checkpointem po 600 wierszach
+        db.save_documents([(f"Document number {i} already stored", "Finanse", None) for i in range(600)])
+        job_id = "0" * 32
+        with open(os.path.join(root, f"{job_id}.csv"), "wb") as f:
+            f.write(_csv(1000))
+        with open(os.path.join(root, f"{job_id}.json"), "w") as f:
+            json.dump({
+                "job_id": job_id, "filename": "docs.csv", "status": "running",
+                "created_at": "2026-01-01T00:00:00", "started_at": "2026-01-01T00:00:01",
+                "finished_at": None, "rows_parsed": 600, "imported_rows": 600,
+                "rejected_rows": 0, "rows_checkpoint": 600, "elapsed_seconds": 1.0,
+                "errors": [], "message": "Importing", "retrain": None,
+            }, f)
+
+        assert manager.resume_incomplete() == [job_id]
+        job = _wait(manager, job_id)
+        assert job["status"] == "completed"
+        assert job["imported_rows"] == 1000
+        assert len(db.get_all_documents()) == 1000
+
+        # Awaria po ostatniej paczce: wznowienie nic nie dopisuje, ale zadanie jest udane
+        job_id = "1" * 32
+        with open(os.path.join(root, f"{job_id}.csv"), "wb") as f:
+            f.write(_csv(1000))
+        with open(os.path.join(root, f"{job_id}.json"), "w") as f:
+            json.dump(dict(job, job_id=job_id, status="running", rows_checkpoint=1000, finished_at=None), f)
+        assert manager.resume_incomplete() == [job_id]
+        job = _wait(manager, job_id)
+        assert job["status"] == "completed" and job["imported_rows"] == 1000
+        assert len(db.get_all_documents()) == 1000
+
+
+def test_import_csv_skips_checkpointed_rows():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        result = import_csv(io.BytesIO(_csv(100)), db, skip_rows=60)
+        assert result["total_rows"] == 100
+        assert result["imported_rows"] == 40
+
+
+if __name__ == "__main__":
+    print("--- Testing ImportJobManager ---")
+    test_background_import_triggers_one_retrain()
+    print("✓ Background import finishes with a single retrain")
+    test_resume_from_checkpoint_after_crash()
+    print("✓ Interrupted import resumes from its checkpoint")
+    test_import_csv_skips_checkpointed_rows()
+    print("✓ CSV import resumes from a row offset")
\ No newline at end of file
@@ -0,0 +1,55 @@
+# test_inference.py
+import random
+
+import numpy as np
+
+from core.classifier import ClassificationEngine
+from core.features import vectorizer_config
+from core.starter_data import STARTER_EXAMPLES
+
+CONFIGS = [
+    {"vectorizer": "tfidf", "dtype": "float32"},
+    {"vectorizer": "tfidf", "dtype": "float64", "ngram_max": 2, "stop_words": "none"},
+    {"vectorizer": "hashing", "dtype": "float32", "max_features": 2 ** 12, "stop_words": "english,polish"},
+]
+
+
+def _corpus(size=400, seed=0):
+    rng = random.Random(seed)
+    words = sorted({word for text, _, _ in STARTER_EXAMPLES for word in text.lower().split()})
+    texts, labels = [], []
+    for _ in range(size):
+        text, area, _ = rng.choice(STARTER_EXAMPLES)
+        texts.append(text + " " + " ".join(rng.choice(words) for _ in range(rng.randint(0, 8))))
+        labels.append(area)
+    return texts, labels
+
+
+def _sklearn_predict(engine, text):
+    X = engine.vectorizer.transform([text])
+    return engine.model.predict(X)[0], engine.model.predict_proba(X)[0]
+
+
+def test_kernel_matches_sklearn():
+    texts, labels = _corpus()
+    queries = _corpus(200, seed=1)[0] + ["", "zzz unknown tokens only", "Invoice INVOICE invoice!!"]
+    for config in CONFIGS:
+        engine = ClassificationEngine(vectorizer_config(**config))
+        engine.fit(texts, labels)
+        kernel = engine.kernel()
+        assert kernel is not None, config
+
+        for text in queries:
+            label, proba = _sklearn_predict(engine, text)
+            assert kernel.predict(text)[0] == label, (config, text)
+            np.testing.assert_allclose(np.exp(kernel.predict_log_proba(text)), proba, rtol=1e-6, atol=1e-9)
+            assert engine.predict(text)["area"] == label
+
+        batch = engine.predict_batch(queries)
+        assert [result["area"] for result in batch] == [engine.predict(text)["area"] for text in queries]
+
+
+if __name__ == "__main__":
+    print("--- Testing inference kernel ---")
+    test_kernel_matches_sklearn()
+    print("✓ Kernel predictions match sklearn for tfidf and hashing vectorizers")
\ No newline at end of file
@@ -0,0 +1,51 @@
+# test_loadgen.py
+import json
+import os
+import tempfile
+
+from benchmarks import loadgen
+
+
+def test_mix_parsing():
+    assert loadgen.parse_mix("classify=8,feedback=1,categories") == {"classify": 8.0, "feedback": 1.0,
+                                                                      "categories": 1.0}
+    for bad in ("classify=1,upload=2", "classify=0"):
+        try:
+            loadgen.parse_mix(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+
+def test_stats_separate_errors_from_admission_rejections():
+    stats = loadgen.LoadStats()
+    for status in (200, 200, 200, 429, 503, 500, "ConnectTimeout"):
+        stats.record("classify", 0.01, status)
+    total = stats.summary(elapsed=1.0)["total"]
+    assert (total["requests"], total["ok"], total["rejected"], total["errors"]) == (7, 3, 2, 2)
+    assert total["error_rate"] == round(4 / 7, 4) and total["throughput"] == 7.0
+
+
+def test_in_process_ramp():
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "load.json")
+        assert loadgen.main(["--in-process", "--ramp", "1,4", "--requests", "40", "--duration", "30",
+                             "--documents", "300", "--mix", "classify=4,categories=1,feedback=1",
+                             "--json", output]) == 0
+        with open(output) as f:
+            steps = json.load(f)
+        assert [step["concurrency"] for step in steps] == [1, 4]
+        for step in steps:
+            assert step["total"]["requests"] == 40 and step["total"]["errors"] == 0
+            assert set(step["endpoints"]) <= set(loadgen.ENDPOINTS)
+            assert step["total"]["p50_ms"] <= step["total"]["p99_ms"]
+
+
+if __name__ == "__main__":
+    print("--- Testing load generator ---")
+    test_mix_parsing()
+    print("✓ Endpoint mix parsed and validated")
+    test_stats_separate_errors_from_admission_rejections()
+    print("✓ Errors and admission rejections counted separately")
+    test_in_process_ramp()
+    print("✓ In-process ramp completes without errors")
\ No newline at end of file
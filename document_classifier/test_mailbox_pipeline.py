@@ -0,0 +1,126 @@
+# test_mailbox_pipeline.py
+import json
+import mailbox
+import os
+import sys
+import tempfile
+from email.message import EmailMessage
+
+from core.classifier import ClassificationEngine
+from core.model_store import ModelStore
+from core.starter_data import STARTER_EXAMPLES
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "integration_examples"))
+
+import mailbox_pipeline
+from outlook_example import generate_outlook_tags, map_to_outlook_folder
+
+
+def _message(number, subject, body, subtype="plain"):
+    message = EmailMessage()
+    message["Subject"] = subject
+    message["From"] = f"sender{number}@example.com"
+    message["Message-ID"] = f"<{number}@example.com>"
+    message.set_content(body, subtype=subtype)
+    return message
+
+
+def _archive(root, examples):
+    """Plik mbox z większością przykładów i katalog .eml z resztą (plus wiadomość HTML)"""
+    box = mailbox.mbox(os.path.join(root, "archive.mbox"))
+    for i, (text, _, _) in enumerate(examples[:-4]):
+        box.add(_message(i, f"Message {i}", text))
+    box.close()
+    directory = os.path.join(root, "eml")
+    os.makedirs(directory)
+    for i, (text, _, _) in enumerate(examples[-4:], len(examples) - 4):
+        with open(os.path.join(directory, f"{i:03d}.eml"), "wb") as f:
+            f.write(bytes(_message(i, f"Message {i}", text)))
+    with open(os.path.join(directory, "999.eml"), "wb") as f:
+        f.write(bytes(_message(999, "Newsletter", "<html><style>p {}</style><p>Quarterly &amp; annual "
+                                                  "invoice</p></html>", subtype="html")))
+    return [os.path.join(root, "archive.mbox"), directory]
+
+
+def _rows(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_pipeline_assigns_folders_and_tags_in_order():
+    with tempfile.TemporaryDirectory() as tmp:
+        models = os.path.join(tmp, "models")
+        engine = ClassificationEngine()
+        engine.fit([text for text, _, _ in STARTER_EXAMPLES], [area for _, area, _ in STARTER_EXAMPLES])
+        ModelStore(models).publish(engine)
+        examples = STARTER_EXAMPLES[:15]
+        paths = _archive(tmp, examples)
+
+        outputs = {}
+        for workers in (1, 2):
+            output = os.path.join(tmp, f"assignments{workers}.ndjson")
+            predict, version = mailbox_pipeline.local_predictor(models)
+            stats = mailbox_pipeline.run_pipeline(paths, output, predict, version, workers=workers, batch_size=4)
+            assert stats["processed"] == stats["total"] == len(examples) + 1
+            outputs[workers] = _rows(output)
+        assert outputs[1] == outputs[2]
+
+        rows = outputs[1]
+        assert [row["subject"] for row in rows[:-1]] == [f"Message {i}" for i in range(len(examples))]
+        for row, (text, _, _) in zip(rows, examples):
+            prediction = engine.predict(f"Subject: {row['subject']}\n\n{text}")
+            assert row["area"] == prediction["area"] and row["model_version"] == 1
+            assert row["outlook_folder"] == map_to_outlook_folder(row["area"])
+            assert row["tags"] == generate_outlook_tags(row)
+        assert rows[0]["id"].endswith("archive.mbox#0") and rows[0]["message_id"] == "<0@example.com>"
+
+        html = mailbox_pipeline.extract_message(("news", open(os.path.join(paths[1], "999.eml"), "rb").read()))
+        assert html["text"] == "Subject: Newsletter\n\nQuarterly & annual invoice"
+
+        encoded = (b"Subject: =?utf-8?q?Faktura_za_pr=C4=85d?=\r\nContent-Type: text/plain; charset=iso-8859-2\r\n"
+                   b"Content-Transfer-Encoding: quoted-printable\r\n\r\nOp=B3ata za energi=EA\r\n")
+        assert mailbox_pipeline.extract_message(("pl", encoded))["text"] == "Subject: Faktura za prąd\n\nOpłata za energię"
+
+
+def test_checkpoint_resumes_without_duplicates():
+    with tempfile.TemporaryDirectory() as tmp:
+        models = os.path.join(tmp, "models")
+        engine = ClassificationEngine()
+        engine.fit([text for text, _, _ in STARTER_EXAMPLES], [area for _, area, _ in STARTER_EXAMPLES])
+        ModelStore(models).publish(engine)
+        paths = _archive(tmp, STARTER_EXAMPLES[:15])
+        predict, version = mailbox_pipeline.local_predictor(models)
+
+        complete = os.path.join(tmp, "complete.ndjson")
+        mailbox_pipeline.run_pipeline(paths, complete, predict, version, batch_size=4)
+
+        output = os.path.join(tmp, "resumed.ndjson")
+        first = mailbox_pipeline.run_pipeline(paths, output, predict, version, batch_size=4, limit=6)
+        assert first["processed"] == 6
+        with open(output, "ab") as f:
+            f.write(b'{"id": "half-written')  # przerwanie w trakcie zapisu paczki
+        second = mailbox_pipeline.run_pipeline(paths, output, predict, version, batch_size=4)
+        assert second["resumed_from"] == 6 and second["processed"] == 10
+        assert _rows(output) == _rows(complete)
+
+        # Checkpoint innego zestawu archiwów nie jest używany
+        try:
+            mailbox_pipeline.run_pipeline(paths[:1], output, predict, version)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            assert "different inputs" in str(e)
+        assert mailbox_pipeline.main([paths[0], "-o", output, "--model-dir", models]) == 2
+
+        # Brakujące archiwum to błąd wejścia (kod 2), a nie traceback z mailbox
+        missing = os.path.join(tmp, "missing.mbox")
+        fresh = os.path.join(tmp, "fresh.ndjson")
+        assert mailbox_pipeline.main([missing, "-o", fresh, "--model-dir", models]) == 2
+        assert not os.path.exists(fresh)
+
+
+if __name__ == "__main__":
+    print("--- Testing mailbox pipeline ---")
+    test_pipeline_assigns_folders_and_tags_in_order()
+    print("✓ mbox and EML messages get Outlook folders and tags, same with a process pool")
+    test_checkpoint_resumes_without_duplicates()
+    print("✓ Interrupted runs resume from the checkpoint without duplicates")
\ No newline at end of file
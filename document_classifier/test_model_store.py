@@ -0,0 +1,85 @@
+# test_model_store.py
+import tempfile
+
+import numpy as np
+
+from core.classifier import ClassificationEngine
+from core.model_store import ModelStore
+from core.starter_data import STARTER_EXAMPLES
+
+
+def _trained_engine():
+    engine = ClassificationEngine()
+    engine.training_texts = [text for text, _, _ in STARTER_EXAMPLES]
+    engine.training_labels = [area for _, area, _ in STARTER_EXAMPLES]
+    engine.categories = set(engine.training_labels)
+    engine._retrain_model()
+    engine.is_trained = True
+    return engine
+
+
+def test_publish_and_mmap_load():
+    with tempfile.TemporaryDirectory() as root:
+        publisher = ModelStore(root, check_interval=0)
+        worker = ModelStore(root, check_interval=0)
+        engine = _trained_engine()
+
+        version = publisher.publish(engine)
+        assert version == 1
+        assert worker.poll(None) == 1
+
+        loaded = worker.load()
+        assert loaded.model_version == 1
+        assert loaded.training_texts == []  # korpus tylko na żądanie
+        assert isinstance(loaded.model.feature_log_prob_, np.memmap)
+        assert not loaded.model.feature_log_prob_.flags.writeable
+
+        text = "Invoice for office supplies"
+        assert loaded.predict(text)['area'] == engine.predict(text)['area']
+
+
+def test_poll_sees_new_version_from_other_process():
+    with tempfile.TemporaryDirectory() as root:
+        publisher = ModelStore(root, check_interval=0)
+        worker = ModelStore(root, check_interval=0)
+        engine = _trained_engine()
+
+        publisher.publish(engine)
+        assert worker.poll(1) is None
+        publisher.publish(engine)
+        assert worker.poll(1) == 2
+
+        with_corpus = worker.load(2, with_corpus=True)
+        assert len(with_corpus.training_texts) == len(STARTER_EXAMPLES)
+
+
+def test_load_latest_survives_cleanup_race():
+    with tempfile.TemporaryDirectory() as root:
+        publisher = ModelStore(root, check_interval=0, keep_versions=3)
+        worker = ModelStore(root, check_interval=0)
+        engine = _trained_engine()
+        publisher.publish(engine)
+
+        # Worker odczytał CURRENT=1, zanim trzy kolejne publikacje usunęły v000001
+        for _ in range(3):
+            publisher.publish(engine)
+        pointers = iter([1])
+        read_pointer = worker.current_version
+        worker.current_version = lambda: next(pointers, None) or read_pointer()
+        assert worker.load().model_version == 4
+
+        try:
+            worker.load(1)
+            assert False, "expected FileNotFoundError"
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    print("--- Testing ModelStore ---")
+    test_publish_and_mmap_load()
+    print("✓ Published model is memory-mapped read-only by workers")
+    test_poll_sees_new_version_from_other_process()
+    print("✓ Workers see new versions published by another process")
+    test_load_latest_survives_cleanup_race()
+    print("✓ Loading the latest version retries when cleanup removed it mid-read")
\ No newline at end of file
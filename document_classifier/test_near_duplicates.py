@@ -0,0 +1,124 @@
+# test_near_duplicates.py
+import os
+import tempfile
+
+from core.database import DatabaseManager
+from core.near_duplicates import NearDuplicateIndex
+from core.starter_data import STARTER_EXAMPLES
+
+TEMPLATE = ("Invoice {number} from ABC Company Ltd for office supplies delivered to the Warsaw office. "
+            "Payment due within 30 days to account PL61 1090 1014 0000 0712 1981 2874. "
+            "Thank you for your business, accounting department")
+
+
+def test_templated_documents_found_incrementally_and_persisted():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        index_path = os.path.join(tmp, "near_duplicates.db")
+        index = NearDuplicateIndex(index_path)
+        db.insert_listeners.append(index.add_documents)
+
+        db.save_documents(STARTER_EXAMPLES)
+        invoice_id = db.save_document(TEMPLATE.format(number="FV/2025/001"), "Finanse", "Faktury")
+        assert index.count() == len(STARTER_EXAMPLES) + 1
+
+        matches = index.query(TEMPLATE.format(number="FV/2025/002"))
+        assert [match["id"] for match in matches] == [invoice_id]
+        assert matches[0]["area"] == "Finanse" and matches[0]["similarity"] >= 0.8
+        assert index.query("Grocery list for the weekend barbecue party with neighbours") == []
+
+        # Po ponownym otwarciu indeks jest na dysku - nic nie trzeba przeliczać
+        reopened = NearDuplicateIndex(index_path)
+        assert [match["id"] for match in reopened.query(TEMPLATE.format(number="FV/2025/003"))] == [invoice_id]
+
+
+def test_sync_backfills_existing_documents_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        db.save_documents(STARTER_EXAMPLES)
+        db.save_documents([(TEMPLATE.format(number=i), "Finanse", "Faktury") for i in range(300)])
+
+        index = NearDuplicateIndex(os.path.join(tmp, "near_duplicates.db"), max_candidates=50)
+        assert index.sync(db, batch_size=100) == len(STARTER_EXAMPLES) + 300
+        assert index.sync(db) == 0
+
+        db.save_document("Team offsite agenda for the spring planning workshop in Gdansk", "Sluzbowe")
+        assert index.sync(db) == 1
+
+        # Kubełki szablonu mają setki dokumentów - czytana jest tylko ograniczona liczba kandydatów
+        matches = index.query(TEMPLATE.format(number="new"), limit=100)
+        assert 0 < len(matches) <= 100
+        assert all(match["area"] == "Finanse" for match in matches)
+
+
+def test_listener_advances_watermark_without_skipping_gaps():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        index = NearDuplicateIndex(os.path.join(tmp, "near_duplicates.db"))
+        notified = []
+        db.insert_listeners.append(notified.extend)
+        db.insert_listeners.append(index.add_documents)
+
+        db.save_documents(STARTER_EXAMPLES)
+        stored = [(doc[0], doc[1], doc[2], doc[3]) for doc in db.iter_documents()]
+        assert notified == stored  # id z paczki zgadzają się z bazą
+        assert index.sync(db) == 0  # zapisy przez listener przesunęły znacznik
+
+        # Zapis z innego procesu (bez listenera) zostawia lukę - kolejne zapisy jej nie przeskakują
+        db.insert_listeners.clear()
+        db.save_document("Quarterly budget review for the marketing department", "Finanse")
+        db.insert_listeners.append(index.add_documents)
+        db.save_document("Team offsite agenda for the spring planning workshop in Gdansk", "Sluzbowe")
+        assert index.sync(db) == 2
+        assert index.sync(db) == 0
+        assert index.count() == len(STARTER_EXAMPLES) + 2
+
+
+def test_documents_from_other_workers_are_found():
+    from core.document_service import DocumentService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = {name: os.environ.get(name) for name in ("MODEL_STORE_DIR", "NEAR_DUPLICATES_INDEX")}
+        os.environ.update(MODEL_STORE_DIR=os.path.join(tmp, "models"),
+                          NEAR_DUPLICATES_INDEX=os.path.join(tmp, "near_duplicates.db"))
+        try:
+            path = os.path.join(tmp, "classifier.db")
+            service = DocumentService(db=DatabaseManager(path))
+            service.db.save_document("Team offsite agenda for the spring planning workshop", "Sluzbowe")
+            service.start_duplicates_sync().join()
+
+            # Inny worker zapisuje przez własny DatabaseManager - bez listenera tego procesu
+            other = DatabaseManager(path)
+            other.save_documents([("Quarterly budget review for the marketing department", "Finanse", None)] * 3)
+            invoice_id = other.save_document(TEMPLATE.format(number="FV/2025/001"), "Finanse", "Faktury")
+            matches = service.find_duplicates(TEMPLATE.format(number="FV/2025/002"))
+            assert [match["id"] for match in matches] == [invoice_id]
+
+            # Po nadrobieniu luki znacznik znów przesuwają zapisy tego procesu
+            service.db.save_document("Minutes of the board meeting in Poznan", "Sluzbowe")
+            assert service.duplicates.sync(service.db) == 0
+
+            # Duża zaległość: część od razu, reszta w tle
+            service.DUPLICATES_CATCH_UP = 2
+            other.save_documents([(TEMPLATE.format(number=i), "Finanse", "Faktury") for i in range(10)])
+            service.find_duplicates("anything")
+            service.start_duplicates_sync().join()
+            assert service.duplicates.count() == 16
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+if __name__ == "__main__":
+    print("--- Testing near-duplicate index ---")
+    test_templated_documents_found_incrementally_and_persisted()
+    print("✓ Templated documents found through the incrementally updated, persisted index")
+    test_sync_backfills_existing_documents_once()
+    print("✓ Existing documents backfilled once; buckets capped for templates")
+    test_listener_advances_watermark_without_skipping_gaps()
+    print("✓ Indexed inserts advance the sync watermark, gaps are left for sync()")
+    test_documents_from_other_workers_are_found()
+    print("✓ Documents saved by other workers are indexed before duplicate queries")
\ No newline at end of file
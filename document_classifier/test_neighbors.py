@@ -0,0 +1,79 @@
+# test_neighbors.py
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from core.classifier import ClassificationEngine
+from core.features import vectorizer_config
+from core.model_store import ModelStore
+from core.starter_data import STARTER_EXAMPLES
+
+
+def _brute_force(engine, text, k):
+    X = engine.vectorizer.transform(engine.training_texts)
+    q = engine.vectorizer.transform([text])
+    scores = (X @ q.T).toarray().ravel()
+    return sorted(scores[scores > 0], reverse=True)[:k]
+
+
+def test_nearest_examples_match_brute_force():
+    for config in ({"vectorizer": "tfidf"}, {"vectorizer": "hashing", "max_features": 2 ** 12}):
+        engine = ClassificationEngine(vectorizer_config(**config))
+        engine.fit([text for text, _, _ in STARTER_EXAMPLES], [area for _, area, _ in STARTER_EXAMPLES])
+
+        query = "Invoice for office supplies and the monthly bank statement"
+        neighbors = engine.nearest(query, k=3)
+        assert neighbors  # tylko dokumenty z co najmniej jedną wspólną cechą
+        np.testing.assert_allclose([n["similarity"] for n in neighbors], _brute_force(engine, query, 3), atol=1e-4)
+        assert neighbors[0]["area"] == "Finanse"
+        assert engine.nearest("and the of", k=3) == []  # same stop words - brak cech
+
+
+def test_index_published_and_memory_mapped():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ModelStore(tmp)
+        engine = ClassificationEngine()
+        engine.fit([text for text, _, _ in STARTER_EXAMPLES], [area for _, area, _ in STARTER_EXAMPLES])
+        store.publish(engine)
+
+        assert engine._training_matrix is None  # zwolniona po zbudowaniu indeksu
+
+        loaded = store.load()
+        assert loaded.training_texts == []  # bez korpusu - indeks przychodzi z pliku
+        assert isinstance(loaded.neighbors.data, np.memmap)
+        query = "Meeting notes from the quarterly planning session"
+        assert loaded.nearest(query, k=5) == engine.nearest(query, k=5)
+
+        # Feedback zmienia słownik - indeks jest przebudowywany z nowej macierzy i publikowany z modelem
+        text = "Reimbursement request for the client dinner in Krakow"
+        engine.learn(text, "Finanse")
+        version = store.publish(engine)
+        assert engine._training_matrix is None
+        assert os.path.exists(os.path.join(store.version_path(version), ModelStore.NEIGHBORS_FILE))
+        assert store.load(version).nearest(text, k=1)[0]["text"] == text
+
+
+def test_query_touches_only_postings():
+    rng = random.Random(0)
+    texts = [f"common filler doc{i} token{rng.randint(0, 50000)}" for i in range(50000)]
+    texts.append("quarterly invoice ledger reconciliation")
+    labels = ["A" if i % 2 else "B" for i in range(len(texts))]
+    engine = ClassificationEngine(vectorizer_config(vectorizer="hashing", max_features=2 ** 16, stop_words="none"))
+    engine.fit(texts, labels)
+
+    neighbors = engine.nearest("invoice ledger reconciliation", k=3)
+    assert neighbors[0]["text"] == "quarterly invoice ledger reconciliation"
+    # Wypełniacze trafiają tu tylko przez kolizje haszy - z niższym podobieństwem
+    assert all(n["similarity"] < neighbors[0]["similarity"] for n in neighbors[1:])
+
+
+if __name__ == "__main__":
+    print("--- Testing nearest labelled examples ---")
+    test_nearest_examples_match_brute_force()
+    print("✓ Inverted-index scores match brute-force cosine similarity")
+    test_index_published_and_memory_mapped()
+    print("✓ Index published with the model and memory-mapped on load")
+    test_query_touches_only_postings()
+    print("✓ Query scores only documents sharing the query's postings")
\ No newline at end of file
@@ -0,0 +1,77 @@
+# test_parallel_training.py
+import os
+import random
+import tempfile
+
+import numpy as np
+
+from core.classifier import ClassificationEngine
+from core.database import DatabaseManager
+from core.features import vectorizer_config
+from core.starter_data import STARTER_EXAMPLES
+
+CONFIG = vectorizer_config(vectorizer="hashing", max_features=2 ** 12, ngram_max=2,
+                           stop_words="english", dtype="float32")
+
+
+def _documents(size=3000, seed=0):
+    rng = random.Random(seed)
+    words = sorted({word for text, _, _ in STARTER_EXAMPLES for word in text.lower().split()})
+    documents = []
+    for _ in range(size):
+        text, area, subarea = rng.choice(STARTER_EXAMPLES)
+        documents.append((text + " " + " ".join(rng.choice(words) for _ in range(6)), area, subarea))
+    return documents
+
+
+def test_sharded_counts_match_single_process_fit():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        documents = _documents()
+        db.save_documents(documents)
+
+        reference = ClassificationEngine(CONFIG)
+        reference.fit([text for text, _, _ in documents], [area for _, area, _ in documents])
+
+        engine = ClassificationEngine(CONFIG)
+        stream = ((doc[1], doc[2]) for doc in db.iter_documents(batch_size=500))
+        assert engine.fit_parallel(stream, workers=2, chunk_size=700)
+
+        assert engine.document_count == len(documents)
+        assert list(engine.model.classes_) == list(reference.model.classes_)
+        np.testing.assert_allclose(engine.vectorizer.named_steps["tfidf"].idf_,
+                                   reference.vectorizer.named_steps["tfidf"].idf_, rtol=1e-6)
+        np.testing.assert_allclose(engine.model.feature_count_, reference.model.feature_count_, rtol=1e-6, atol=1e-9)
+        np.testing.assert_allclose(engine.model.feature_log_prob_, reference.model.feature_log_prob_, rtol=1e-9)
+        np.testing.assert_array_equal(engine.model.class_count_, reference.model.class_count_)
+
+        queries = [text for text, _, _ in _documents(200, seed=1)]
+        assert [r["area"] for r in engine.predict_batch(queries)] == [r["area"] for r in reference.predict_batch(queries)]
+
+
+def test_incremental_learning_after_parallel_fit():
+    documents = _documents(600)
+    engine = ClassificationEngine(CONFIG)
+    engine.fit_parallel(((text, area) for text, area, _ in documents), workers=1, chunk_size=250)
+    # Zmapowane z dysku tablice są tylko do odczytu - learn() nie może ich modyfikować w miejscu
+    engine.model.feature_count_.setflags(write=False)
+
+    counts = dict(zip(engine.model.classes_, engine.model.class_count_))
+    assert engine.learn("Quarterly tax declaration for the accounting office", "Finanse")
+    assert dict(zip(engine.model.classes_, engine.model.class_count_))["Finanse"] == counts["Finanse"] + 1
+
+    assert engine.learn("Reserve a court for Sunday tennis with friends", "Sport")
+    assert "Sport" in engine.model.classes_
+    assert list(engine.model.classes_) == sorted(engine.model.classes_)
+    assert "Sport" in engine.kernel().classes
+    assert engine.model.feature_count_[list(engine.model.classes_).index("Sport")].sum() > 0
+    assert engine.training_texts == []
+    assert engine.document_count == 602
+
+
+if __name__ == "__main__":
+    print("--- Testing parallel training ---")
+    test_sharded_counts_match_single_process_fit()
+    print("✓ Counts summed from shards equal a single-process fit")
+    test_incremental_learning_after_parallel_fit()
+    print("✓ Parallel-trained model keeps learning incrementally")
\ No newline at end of file
@@ -0,0 +1,121 @@
+# test_profiling.py
+import os
+import sys
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "api"))
+
+from core import profiling
+from core.profiling import Profiler, ProfilingMiddleware
+
+
+def _app(profiler):
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"total": sum(i * i for i in range(20000))}
+
+    @app.get("/blocking")
+    def blocking():
+        time.sleep(0.05)
+        return {"ok": True}
+
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+    return app
+
+
+def test_next_requests_window_and_sample_rate():
+    profiler = Profiler(token="secret", directory=tempfile.gettempdir())
+    assert not profiler.claim()
+    profiler.start(requests=2)
+    assert profiler.claim() and profiler.claim() and not profiler.claim()
+    assert not profiler.status()["active"]
+
+    profiler.start(seconds=0.05)
+    assert profiler.claim()
+    time.sleep(0.06)
+    assert not profiler.claim() and not profiler.active
+
+    profiler.start(requests=1000, sample_rate=0.2)
+    claimed = sum(profiler.claim() for _ in range(1000))
+    assert 100 < claimed < 300
+    for bad in ({}, {"requests": 1, "mode": "perf"}, {"requests": 1, "sample_rate": 0}):
+        try:
+            profiler.start(**bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+
+def test_token_header_profiles_single_request():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = Profiler(token="secret", directory=tmp)
+        client = TestClient(_app(profiler))
+
+        assert "x-profile-id" not in client.get("/work").headers
+        assert "x-profile-id" not in client.get("/work", headers={"X-Profile-Token": "wrong"}).headers
+        assert profiler.list_profiles() == []
+
+        response = client.get("/work", headers={"X-Profile-Token": "secret"})
+        assert response.status_code == 200 and response.json()["total"] > 0
+        name = response.headers["x-profile-id"]
+        assert name.endswith(".prof") and "get-work" in name
+        assert profiler.profile_path(name) and profiler.profile_path("../" + name) is None
+
+
+def test_enabled_window_profiles_requests_in_sample_mode():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = Profiler(token="secret", directory=tmp, keep=2)
+        client = TestClient(_app(profiler))
+        profiler.start(requests=3, mode="sample")
+        names = [client.get("/blocking").headers["x-profile-id"] for _ in range(3)]
+        assert "x-profile-id" not in client.get("/blocking").headers
+        assert all(name.endswith(".folded") for name in names)
+        # Wątek puli widoczny w próbkach; najstarszy profil usunięty (keep=2)
+        with open(profiler.profile_path(names[-1])) as f:
+            assert "blocking" in f.read()
+        assert len(profiler.list_profiles()) == 2
+        assert profiler.status()["profiles_written"] == 3
+
+
+def test_admin_endpoints_require_token():
+    from routers import profiling as router
+
+    app = FastAPI()
+    app.include_router(router.router)
+    client = TestClient(app)
+    previous = profiling._profilers.pop("api", None)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            profiling._profilers["api"] = Profiler("api", directory=tmp, token="")
+            assert client.get("/admin/profiling").status_code == 404
+
+            profiling._profilers["api"] = Profiler("api", directory=tmp, token="secret")
+            assert client.get("/admin/profiling", headers={"X-Admin-Token": "nope"}).status_code == 403
+            headers = {"X-Admin-Token": "secret"}
+            assert client.post("/admin/profiling", json={"mode": "sample"}, headers=headers).status_code == 400
+            started = client.post("/admin/profiling", json={"requests": 5}, headers=headers).json()
+            assert started["active"] and started["remaining_requests"] == 5
+            assert not client.delete("/admin/profiling", headers=headers).json()["active"]
+            assert client.get("/admin/profiling/profiles/missing.prof", headers=headers).status_code == 404
+    finally:
+        profiling._profilers.pop("api", None)
+        if previous is not None:
+            profiling._profilers["api"] = previous
+
+
+if __name__ == "__main__":
+    print("--- Testing on-demand profiling ---")
+    test_next_requests_window_and_sample_rate()
+    print("✓ Next N requests, time window and sample rate")
+    test_token_header_profiles_single_request()
+    print("✓ X-Profile-Token profiles one request and returns X-Profile-Id")
+    test_enabled_window_profiles_requests_in_sample_mode()
+    print("✓ Sample mode sees thread-pool endpoints; old profiles pruned")
+    test_admin_endpoints_require_token()
+    print("✓ Control endpoints hidden without PROFILING_TOKEN, 403 on a wrong token")
\ No newline at end of file
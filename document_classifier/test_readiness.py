@@ -0,0 +1,92 @@
+# test_readiness.py
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "api"))
+
+from services.readiness import ReadinessProbe
+
+
+class FakeDatabase:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.pings = 0
+        self.lock = threading.Lock()
+
+    def ping(self, timeout=1.0):
+        with self.lock:
+            self.pings += 1
+        time.sleep(self.delay)
+        return True
+
+
+class FakeClassifier:
+    model_version = 3
+
+    def can_predict(self):
+        return True
+
+
+class FakeModelStore:
+    def current_version(self):
+        return 4
+
+
+class FakeService:
+    def __init__(self, db):
+        self.db = db
+        self.classifier = FakeClassifier()
+        self.model_store = FakeModelStore()
+
+    def get_mode(self):
+        return "auto"
+
+    def refresh_model(self):
+        raise AssertionError("the probe must not reload the serving model")
+
+
+def test_ready_and_cached():
+    async def scenario():
+        db = FakeDatabase()
+        probe = ReadinessProbe(cache_ttl=60, timeout=1.0)
+        first = await probe.check(FakeService(db))
+        second = await probe.check(FakeService(db))
+        return db, first, second
+
+    db, first, second = asyncio.run(scenario())
+    assert first["status"] == "ready"
+    assert first["checks"]["model"]["model_version"] == 3
+    assert first["checks"]["model"]["published_version"] == 4
+    assert not first["cached"] and second["cached"]
+    assert db.pings == 1
+
+
+def test_slow_database_times_out_without_pile_up():
+    async def scenario():
+        db = FakeDatabase(delay=0.5)
+        probe = ReadinessProbe(cache_ttl=0, timeout=0.05)
+        results = [await probe.check(FakeService(db)) for _ in range(3)]
+        return db, results
+
+    db, results = asyncio.run(scenario())
+    assert all(r["status"] == "not_ready" for r in results)
+    assert results[0]["checks"]["database"]["status"] == "timeout"
+    assert db.pings == 1  # kolejne sondy czekają na to samo zapytanie
+
+
+def test_not_ready_before_service_is_built():
+    result = asyncio.run(ReadinessProbe().check(None))
+    assert result["status"] == "not_ready"
+
+
+if __name__ == "__main__":
+    print("--- Testing ReadinessProbe ---")
+    test_ready_and_cached()
+    print("✓ Probe result is cached")
+    test_slow_database_times_out_without_pile_up()
+    print("✓ Slow database times out without piling up checks")
+    test_not_ready_before_service_is_built()
+    print("✓ Not ready until the service exists")
\ No newline at end of file
@@ -0,0 +1,115 @@
+# test_runtime_settings.py
+import os
+import tempfile
+
+from core.database import DatabaseManager
+from core.runtime_settings import RuntimeSettings
+
+
+class CountingDatabase(DatabaseManager):
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.full_reads = 0
+
+    def get_settings(self):
+        self.full_reads += 1
+        return super().get_settings()
+
+
+def test_settings_shared_between_processes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "classifier.db")
+        api = RuntimeSettings(CountingDatabase(path), ttl=0)
+        admin = RuntimeSettings(CountingDatabase(path), ttl=0)
+
+        assert api.get('mode') == 'learning'
+        assert admin.set('mode', 'auto')
+        assert admin.set('confidence_threshold', 0.55)
+        assert api.get('mode') == 'auto'
+        assert api.get_float('confidence_threshold') == 0.55
+        assert api.get_int('model_version_pin') is None
+
+
+def test_cache_reads_table_only_when_version_changes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CountingDatabase(os.path.join(tmp, "classifier.db"))
+        settings = RuntimeSettings(db, ttl=0)
+        for _ in range(5):
+            settings.get('mode')
+        assert db.full_reads == 1
+
+        settings.set('mode', 'auto')
+        settings.get('mode')
+        assert db.full_reads == 2
+
+
+def test_ttl_serves_cached_values():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "classifier.db")
+        reader = RuntimeSettings(DatabaseManager(path), ttl=60)
+        writer = RuntimeSettings(DatabaseManager(path), ttl=0)
+        assert reader.get('mode') == 'learning'
+        writer.set('mode', 'auto')
+        assert reader.get('mode') == 'learning'  # do wygaśnięcia TTL
+
+
+def test_invalid_values_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        settings = RuntimeSettings(DatabaseManager(os.path.join(tmp, "classifier.db")))
+        assert not settings.set('mode', 'turbo')
+        assert not settings.set('confidence_threshold', 'high')
+        assert not settings.set('settings_version', '99')
+
+
+def test_pinned_version_survives_cleanup_and_missing_pin_is_cached():
+    from core.document_service import DocumentService
+    from core.starter_data import STARTER_EXAMPLES
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = os.environ.get("MODEL_STORE_DIR")
+        os.environ["MODEL_STORE_DIR"] = os.path.join(tmp, "models")
+        try:
+            path = os.path.join(tmp, "classifier.db")
+            api, admin = DocumentService(db=DatabaseManager(path)), DocumentService(db=DatabaseManager(path))
+            api.settings.ttl = 0
+            admin.classifier.fit([text for text, _, _ in STARTER_EXAMPLES],
+                                 [area for _, area, _ in STARTER_EXAMPLES])
+            admin.publish_model()
+            assert admin.settings.set('model_version_pin', 1)
+
+            # Panel nigdy nie wołał refresh_model, a i tak nie usuwa przypiętej wersji
+            for _ in range(4):
+                admin.publish_model()
+            assert os.path.isdir(admin.model_store.version_path(1))
+            assert api.refresh_model() == 1 and api.classifier.model_version == 1
+
+            loads = []
+            load = api.model_store.load
+            api.model_store.load = lambda *args, **kwargs: loads.append(args) or load(*args, **kwargs)
+            admin.settings.set('model_version_pin', 99)
+            for _ in range(3):
+                assert api.refresh_model() == 5
+            assert loads.count((99,)) == 1  # brak pinu sprawdzony raz, do zmiany ustawień
+
+            admin.settings.set('model_version_pin', 99)  # nowy settings_version - sprawdzamy ponownie
+            api.refresh_model()
+            assert loads.count((99,)) == 2
+        finally:
+            if saved is None:
+                os.environ.pop("MODEL_STORE_DIR", None)
+            else:
+                os.environ["MODEL_STORE_DIR"] = saved
+
+
+if __name__ == "__main__":
+    print("--- Testing RuntimeSettings ---")
+    test_settings_shared_between_processes()
+    print("✓ Settings are shared through the settings table")
+    test_cache_reads_table_only_when_version_changes()
+    print("✓ Full reload only when settings_version changes")
+    test_ttl_serves_cached_values()
+    print("✓ Cached values served within TTL")
+    test_invalid_values_rejected()
+    print("✓ Invalid settings rejected")
+    test_pinned_version_survives_cleanup_and_missing_pin_is_cached()
+    print("✓ Pinned version kept by every process; a missing pin is not reloaded per request")
\ No newline at end of file
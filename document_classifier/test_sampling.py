@@ -0,0 +1,161 @@
+# test_sampling.py
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+from core.classifier import ClassificationEngine
+from core.sampling import ClassBalancedReservoir, parse_caps, training_sampler
+from core.starter_data import STARTER_EXAMPLES
+
+
+def test_caps_bound_each_class_and_sample_uniformly():
+    reservoir = ClassBalancedReservoir(cap=50, caps={"rare": 5}, seed=1)
+    documents = [(f"big {i}", "big") for i in range(5000)] + [(f"rare {i}", "rare") for i in range(20)]
+    assert reservoir.extend(documents) == 5020
+
+    texts, labels = reservoir.sample()
+    assert Counter(labels) == {"big": 50, "rare": 5} and len(reservoir) == 55
+    report = reservoir.report()
+    assert report["classes"]["big"] == {"seen": 5000, "kept": 50, "cap": 50, "effective": 5000}
+    assert report["seen"] == 5020 and report["kept"] == 55
+
+    # Bez wygaszania każdy dokument ma tę samą szansę: średnio 1/100 próbki z każdej setki
+    kept = Counter()
+    for seed in range(200):
+        sample = ClassBalancedReservoir(cap=10, seed=seed)
+        sample.extend((i, "big") for i in range(1000))
+        kept.update(text // 100 for text in sample.sample()[0])
+    assert all(150 < kept[block] < 250 for block in range(10)), kept
+
+
+def test_time_decay_prefers_recent_feedback():
+    now = datetime(2025, 6, 1)
+    documents = [(f"doc {day}", "big", now - timedelta(days=day)) for day in range(365)]
+    recent = Counter()
+    for seed in range(50):
+        reservoir = ClassBalancedReservoir(cap=20, half_life_days=30, seed=seed)
+        reservoir.extend(documents)
+        recent.update(int(text.split()[1]) < 90 for text in reservoir.sample()[0])
+    assert recent[True] > 4 * recent[False]
+
+    # Efektywna liczność: historia wygaszona do ~ kilkudziesięciu równoważnych dokumentów
+    effective = reservoir.report()["classes"]["big"]["effective"]
+    assert 50 < effective < 120
+
+
+def test_engine_learn_and_fit_stay_within_caps():
+    reservoir = ClassBalancedReservoir(cap=8, seed=0)
+    engine = ClassificationEngine()
+    engine.sampler = reservoir
+    assert engine.fit([text for text, _, _ in STARTER_EXAMPLES] * 3, [area for _, area, _ in STARTER_EXAMPLES] * 3)
+    counts = Counter(engine.training_labels)
+    assert max(counts.values()) <= 8 and engine.document_count == 3 * len(STARTER_EXAMPLES)
+
+    for i in range(50):
+        engine.learn(f"Budget review meeting number {i}", "Daily Business")
+    assert Counter(engine.training_labels)["Daily Business"] == 8
+    assert engine.sampling_report()["classes"]["Daily Business"]["seen"] > 50
+
+    # Próbka i klucze wracają z korpusu opublikowanego modelu
+    os.environ["TRAINING_CLASS_CAP"] = "8"
+    try:
+        restored = ClassificationEngine.from_state(engine.export_state(), engine.export_corpus())
+    finally:
+        del os.environ["TRAINING_CLASS_CAP"]
+    assert sorted(restored.training_texts) == sorted(engine.training_texts)
+    assert restored.sampling_report() == engine.sampling_report()
+
+
+def test_configuration_from_environment():
+    assert training_sampler() is None
+    assert parse_caps("Daily Business=5000, Sport=20") == {"Daily Business": 5000, "Sport": 20}
+    for bad in ("Sport", "Sport=0"):
+        try:
+            parse_caps(bad)
+            assert False, bad
+        except ValueError:
+            pass
+    sampler = training_sampler(cap=100, caps={"Sport": 10}, half_life_days=14)
+    assert sampler.cap_for("Sport") == 10 and sampler.cap_for("Other") == 100
+
+
+def test_retrain_from_database_reports_effective_sizes():
+    from core.database import DatabaseManager
+    from core.document_service import DocumentService
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = {name: os.environ.get(name) for name in ("MODEL_STORE_DIR", "NEAR_DUPLICATES_INDEX",
+                                                          "TRAINING_CLASS_CAP")}
+        os.environ.update(MODEL_STORE_DIR=os.path.join(tmp, "models"),
+                          NEAR_DUPLICATES_INDEX=os.path.join(tmp, "near_duplicates.db"),
+                          TRAINING_CLASS_CAP="3")
+        try:
+            db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+            db.save_documents(list(STARTER_EXAMPLES) * 2)
+            service = DocumentService(db=db)
+            result = service.retrain_from_database()
+            assert result["success"] and result["sampling"]["cap"] == 3
+            assert all(row["kept"] <= 3 for row in result["sampling"]["classes"].values())
+            assert result["sampling"]["seen"] == 2 * len(STARTER_EXAMPLES)
+            assert result["trained_documents"] == result["sampling"]["kept"]
+
+            # Dokument odrzucony przez próbkę nie publikuje nowej wersji
+            published = []
+            for i in range(40):
+                version, revision = service.model_store.current_version(), service.classifier.revision
+                updated = service.learn(f"Quarterly budget review number {i}", "Finanse")
+                changed = service.classifier.revision != revision
+                published.append(changed)
+                assert updated == changed
+                assert (service.model_store.current_version() != version) == changed
+            assert not all(published)
+
+            # Bez zapisów i warm_up serwis nie uruchomił synchronizacji indeksu w katalogu tymczasowym
+            assert service._sync_thread is None
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def test_feedback_reports_whether_the_model_changed():
+    from fastapi.testclient import TestClient
+
+    from benchmarks.suite import in_process_api
+
+    os.environ["TRAINING_CLASS_CAP"] = "3"
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            with in_process_api(list(STARTER_EXAMPLES), tmp) as (app, prefix):
+                client = TestClient(app)
+                responses = [client.post(f"{prefix}/classify/feedback",
+                                         json={"text": f"Quarterly budget review number {i} for team {i * 7}",
+                                               "area": "Finanse"}).json()
+                             for i in range(30)]
+                import dependencies
+                # Zapis feedbacku uruchomił synchronizację indeksu w tmp - czekamy na nią przed sprzątaniem
+                app.dependency_overrides[dependencies.get_document_service]().start_duplicates_sync().join()
+    finally:
+        del os.environ["TRAINING_CLASS_CAP"]
+    assert all(response["success"] for response in responses)
+    unchanged = [response for response in responses if not response["model_updated"]]
+    assert unchanged and all("model unchanged" in response["message"] for response in unchanged)
+
+
+if __name__ == "__main__":
+    print("--- Testing training-set sampling ---")
+    test_caps_bound_each_class_and_sample_uniformly()
+    print("✓ Per-class caps bound the sample; reservoir is uniform without decay")
+    test_time_decay_prefers_recent_feedback()
+    print("✓ Time decay favours recent feedback; effective size reported")
+    test_engine_learn_and_fit_stay_within_caps()
+    print("✓ fit and learn keep the training corpus within caps; sample survives publish")
+    test_configuration_from_environment()
+    print("✓ Caps and half-life configured from the environment")
+    test_retrain_from_database_reports_effective_sizes()
+    print("✓ Retrain from the database streams through the reservoir and reports sizes")
+    test_feedback_reports_whether_the_model_changed()
+    print("✓ Feedback rejected by the reservoir reports an unchanged model")
\ No newline at end of file
@@ -0,0 +1,63 @@
+# test_stats.py
+import os
+import sqlite3
+import tempfile
+
+from core.database import DatabaseManager
+
+
+def test_counters_follow_inserts():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "classifier.db"))
+        db.save_document("Invoice from ABC Company", "Finanse", "Faktury")
+        db.save_documents([
+            ("Bank statement for March", "Finanse", "Wyciagi"),
+            ("Another invoice for supplies", "Finanse", "Faktury"),
+            ("Meeting notes", "Sluzbowe", None),
+        ])
+
+        assert db.count_documents() == 4
+        assert sorted(db.get_category_counts()) == [
+            ("Finanse", "Faktury", 2),
+            ("Finanse", "Wyciagi", 1),
+            ("Sluzbowe", None, 1),
+        ]
+        assert sorted(db.get_categories()) == sorted([
+            ("Finanse", "Faktury"), ("Finanse", "Wyciagi"), ("Sluzbowe", None)
+        ])
+        assert db.get_daily_counts(7)[-1][1] == 4
+        assert [doc[1] for doc in db.get_recent_documents(2)] == [
+            "Meeting notes", "Another invoice for supplies"
+        ]
+
+
+def test_backfill_for_existing_database():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "classifier.db")
+        # Baza sprzed liczników: same dokumenty
+        with sqlite3.connect(path) as conn:
+            conn.execute("""
+                CREATE TABLE documents (id INTEGER PRIMARY KEY, text TEXT NOT NULL,
+                area TEXT NOT NULL, subarea TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)
+            """)
+            conn.executemany("INSERT INTO documents (text, area, subarea, created_at) VALUES (?, ?, ?, ?)", [
+                ("a", "Finanse", "Faktury", "2025-01-01 10:00:00"),
+                ("b", "Finanse", None, "2025-01-01 11:00:00"),
+                ("c", "Prywatne", None, "2025-01-02 09:00:00"),
+            ])
+
+        db = DatabaseManager(path)
+        assert db.count_documents() == 3
+        assert dict(((a, s), c) for a, s, c in db.get_category_counts())[("Finanse", None)] == 1
+        with sqlite3.connect(path) as conn:
+            assert dict(conn.execute("SELECT day, count FROM stats_daily")) == {
+                "2025-01-01": 2, "2025-01-02": 1
+            }
+
+
+if __name__ == "__main__":
+    print("--- Testing incremental statistics ---")
+    test_counters_follow_inserts()
+    print("✓ Counters updated on every insert")
+    test_backfill_for_existing_database()
+    print("✓ Counters backfilled for an existing database")
@@ -0,0 +1,79 @@
+# test_tenant_models.py
+import tempfile
+import threading
+
+from core.tenant_models import TenantModelRegistry
+
+
+def _teach(registry, system_id):
+    registry.learn(system_id, "Invoice payment due for office supplies", "Finanse")
+    registry.learn(system_id, "Meeting notes from planning session", "Sluzbowe")
+
+
+def test_lazy_load_and_lru_eviction():
+    with tempfile.TemporaryDirectory() as root:
+        registry = TenantModelRegistry(root, max_resident=1, check_interval=0)
+        assert registry.get("outlook") is None  # brak artefaktu -> fallback
+
+        _teach(registry, "outlook")
+        _teach(registry, "fasttrack")
+        assert registry.resident() == ["fasttrack"]
+
+        # Wyrzucony z pamięci model wraca z dysku przy pierwszym użyciu
+        engine = registry.get("outlook")
+        assert engine.can_predict()
+        assert engine.training_texts == []  # korpus zostaje na dysku
+        assert registry.resident() == ["outlook"]
+
+        fresh = TenantModelRegistry(root, max_resident=2, check_interval=0)
+        assert fresh.get("fasttrack").predict("invoice payment")['area'] == "Finanse"
+
+
+def test_slow_load_does_not_block_other_tenants():
+    with tempfile.TemporaryDirectory() as root:
+        registry = TenantModelRegistry(root, check_interval=0)
+        _teach(registry, "slow")
+        _teach(registry, "fast")
+
+        fresh = TenantModelRegistry(root, check_interval=0)
+        loading, gate = threading.Event(), threading.Event()
+        make_store = fresh._store
+
+        def store(system_id):
+            created = make_store(system_id)
+            if system_id == "slow":
+                load = created.load
+                created.load = lambda *args, **kwargs: (loading.set(), gate.wait(5), load(*args, **kwargs))[2]
+            return created
+
+        fresh._store = store
+        slow = threading.Thread(target=fresh.get, args=("slow",))
+        slow.start()
+        try:
+            assert loading.wait(5)
+            assert fresh.get("fast").can_predict()
+            assert slow.is_alive()  # "fast" nie czekał na ładowanie "slow"
+        finally:
+            gate.set()
+            slow.join()
+        assert fresh.get("slow").can_predict()
+
+
+def test_invalid_system_id_rejected():
+    with tempfile.TemporaryDirectory() as root:
+        registry = TenantModelRegistry(root)
+        try:
+            registry.get("../etc")
+        except ValueError:
+            return
+        raise AssertionError("path-like system_id must be rejected")
+
+
+if __name__ == "__main__":
+    print("--- Testing TenantModelRegistry ---")
+    test_lazy_load_and_lru_eviction()
+    print("✓ Tenant models load lazily and are evicted LRU")
+    test_slow_load_does_not_block_other_tenants()
+    print("✓ A slow tenant load does not block other tenants")
+    test_invalid_system_id_rejected()
+    print("✓ Invalid system_id rejected")
\ No newline at end of file